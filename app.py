@@ -1,8 +1,32 @@
+import os
+import subprocess
+import sys
 from backend import create_app
 from backend.extensions import socketio
 
 app = create_app()
 
 
+def run_workers(count, base_port):
+    env = dict(os.environ, WORKERS="1", LUMORA_WORKER="1")
+    env.setdefault("SOCKETIO_MESSAGE_QUEUE", "sqlite://")
+    ports = [base_port + i for i in range(count)]
+    print(f"Starting {count} workers on ports {ports} with message queue {env['SOCKETIO_MESSAGE_QUEUE']}")
+    print("Route clients through a load balancer with sticky sessions (e.g. nginx ip_hash) when polling is enabled.")
+    workers = [subprocess.Popen([sys.executable, __file__], env=dict(env, PORT=str(port))) for port in ports]
+    try:
+        for worker in workers:
+            worker.wait()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
 if __name__ == "__main__":
-    socketio.run(app, host='0.0.0.0', debug=True, port=5000)
+    workers = int(os.environ.get("WORKERS", "1"))
+    port = int(os.environ.get("PORT", "5000"))
+    if workers > 1:
+        run_workers(workers, port)
+    else:
+        debug = not os.environ.get("LUMORA_WORKER")
+        socketio.run(app, host='0.0.0.0', debug=debug, use_reloader=debug, port=port)
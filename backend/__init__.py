@@ -1,8 +1,17 @@
+import json
 import os
-from flask import Flask
+from flask import Flask, request
+from werkzeug.exceptions import HTTPException
 from .extensions import socketio
 from .database import init_db
 from .routes import register_routes
+from .state import configure_state_store
+from .cache import configure_cache
+from .message_queue import create_client_manager
+from .socket_events import flush_request_family_sync
+from .scheduler import start_scheduler
+from .metrics import init_metrics, record_exception
+from .static_assets import load_static_manifest
 
 
 def create_app():
@@ -11,21 +20,49 @@ def create_app():
                 static_folder = '/app/static'
 
         app = Flask(__name__, static_folder=static_folder)
+        load_static_manifest(static_folder)
         app.secret_key = os.environ.get('SECRET_KEY', 'supersecretkey')
         app.config['SESSION_COOKIE_HTTPONLY'] = True
         app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
         app.config['PERMANENT_SESSION_LIFETIME'] = 86400
         app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-        socketio.init_app(app)
+        app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+        shared = bool(app.config['SOCKETIO_MESSAGE_QUEUE'])
+        app.config['STATE_STORE'] = os.environ.get('STATE_STORE', 'sqlite' if shared else 'local')
+        app.config['CACHE_BACKEND'] = os.environ.get('CACHE_BACKEND', 'sqlite' if shared else 'local')
+        app.config['CACHE_TTL'] = float(os.environ.get('CACHE_TTL', '30'))
+        app.config['CACHE_MAX_ENTRIES'] = int(os.environ.get('CACHE_MAX_ENTRIES', '10000'))
+        app.config['SCHEDULER_ENABLED'] = os.environ.get('SCHEDULER_ENABLED', '1') == '1'
+        app.config['SCHEDULER_INTERVAL'] = float(os.environ.get('SCHEDULER_INTERVAL', '60'))
+
+        configure_state_store(app.config['STATE_STORE'])
+        configure_cache(app.config['CACHE_BACKEND'], app.config['CACHE_TTL'], app.config['CACHE_MAX_ENTRIES'])
+        client_manager = create_client_manager(app.config['SOCKETIO_MESSAGE_QUEUE'])
+        if client_manager:
+                socketio.init_app(app, client_manager=client_manager)
+        elif shared:
+                socketio.init_app(app, message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'])
+        else:
+                socketio.init_app(app)
+        init_metrics(app)
+        app.teardown_request(flush_request_family_sync)
 
         with app.app_context():
                 init_db()
 
         register_routes(app)
+        start_scheduler(app)
 
         @app.errorhandler(Exception)
         def handle_exception(e):
+                if isinstance(e, HTTPException):
+                        response = e.get_response()
+                        response.data = json.dumps({"error": e.description})
+                        response.content_type = "application/json"
+                        return response
+                record_exception(e)
+                app.logger.exception("Unhandled exception on %s %s", request.method, request.path)
                 return {"error": str(e)}, 500
 
         return app
@@ -0,0 +1,71 @@
+import atexit
+import os
+import sqlite3
+from collections import deque
+from .extensions import socketio, ACTIVITY_BUFFER
+from .database import query_db, unit_of_work
+
+ACTIVITY_BUFFER_SIZE = int(os.environ.get("ACTIVITY_BUFFER_SIZE", "50"))
+ACTIVITY_FLUSH_INTERVAL = float(os.environ.get("ACTIVITY_FLUSH_INTERVAL", "2"))
+ACTIVITY_FLUSH_BATCH = 100
+ACTIVITY_COLUMNS = ("family_id", "ts", "title", "detail", "category", "user_name", "user_role")
+
+_pending = []
+_flush_scheduled = False
+
+
+def family_activity(family_id) -> deque:
+    events = ACTIVITY_BUFFER.get(family_id)
+    if events is None:
+        events = deque(reversed(load_activity(family_id, limit=ACTIVITY_BUFFER_SIZE)), maxlen=ACTIVITY_BUFFER_SIZE)
+        ACTIVITY_BUFFER[family_id] = events
+    return events
+
+
+def record_activity(event: dict) -> None:
+    global _flush_scheduled
+    family_activity(event["family_id"]).append(event)
+    _pending.append(event)
+    if len(_pending) >= ACTIVITY_FLUSH_BATCH:
+        flush_activity()
+    elif not _flush_scheduled:
+        _flush_scheduled = True
+        socketio.start_background_task(_flush_later)
+
+
+def _flush_later():
+    global _flush_scheduled
+    socketio.sleep(ACTIVITY_FLUSH_INTERVAL)
+    _flush_scheduled = False
+    flush_activity()
+
+
+def flush_activity() -> None:
+    global _pending
+    if not _pending:
+        return
+    batch, _pending = _pending, []
+    placeholders = ", ".join("?" for _ in ACTIVITY_COLUMNS)
+    try:
+        with unit_of_work() as conn:
+            conn.executemany(
+                f"INSERT INTO activity_log ({', '.join(ACTIVITY_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(event.get(col) for col in ACTIVITY_COLUMNS) for event in batch],
+            )
+    except sqlite3.Error as e:
+        print(f"Activity flush error: {e}")
+        _pending[:0] = batch
+
+
+def load_activity(family_id, before=None, limit=ACTIVITY_BUFFER_SIZE) -> list:
+    query = f"SELECT {', '.join(ACTIVITY_COLUMNS)} FROM activity_log WHERE family_id = ?"
+    args = [family_id]
+    if before is not None:
+        query += " AND ts < ?"
+        args.append(before)
+    query += " ORDER BY ts DESC, id DESC LIMIT ?"
+    args.append(limit)
+    return [dict(row) for row in query_db(query, tuple(args))]
+
+
+atexit.register(flush_activity)
@@ -0,0 +1,172 @@
+import sqlite3
+from datetime import date, timedelta
+from .rollups import period_bucket_sql
+
+ANALYTICS_PERIODS = ("daily", "weekly", "monthly")
+ANALYTICS_PERIODS_SQL = " UNION ALL ".join(f"SELECT '{p}' AS period" for p in ANALYTICS_PERIODS)
+
+ROLLUP_SELECT_SQL = f"""
+    SELECT t.family_id, p.period, {period_bucket_sql("p.period", "t.date")} AS bucket,
+        CASE WHEN t.type = 'income' THEN 'income' ELSE 'expense' END AS kind,
+        COALESCE(t.category_id, 0) AS category_id, t.user_id, {{amount}}, {{count}}
+    FROM transactions t, ({ANALYTICS_PERIODS_SQL}) p
+"""
+
+ROLLUP_UPSERT_SQL = """
+    ON CONFLICT(family_id, period, bucket, type, category_id, user_id)
+    DO UPDATE SET amount = amount + excluded.amount, count = count + excluded.count
+"""
+
+RECORD_ANALYTICS_SQL = f"""
+    INSERT INTO transaction_rollup (family_id, period, bucket, type, category_id, user_id, amount, count)
+    {ROLLUP_SELECT_SQL.format(amount="t.amount * ?", count="?")}
+    WHERE t.id = ? {ROLLUP_UPSERT_SQL}
+"""
+
+RECORD_ANALYTICS_RANGE_SQL = f"""
+    INSERT INTO transaction_rollup (family_id, period, bucket, type, category_id, user_id, amount, count)
+    {ROLLUP_SELECT_SQL.format(amount="SUM(t.amount)", count="COUNT(*)")}
+    WHERE t.family_id = ? AND t.id > ?
+    GROUP BY t.family_id, p.period, bucket, kind, category_id, t.user_id {ROLLUP_UPSERT_SQL}
+"""
+
+REBUILD_ANALYTICS_SQL = f"""
+    INSERT INTO transaction_rollup (family_id, period, bucket, type, category_id, user_id, amount, count)
+    {ROLLUP_SELECT_SQL.format(amount="SUM(t.amount)", count="COUNT(*)")}
+    {{scope}}
+    GROUP BY t.family_id, p.period, bucket, kind, category_id, t.user_id
+"""
+
+CATEGORY_FILTER_SQL = """category_id IN
+    (SELECT id FROM categories WHERE family_id = transaction_rollup.family_id AND name = ? COLLATE NOCASE)"""
+
+
+def record_analytics(conn: sqlite3.Connection, transaction_id: int, sign: int = 1) -> None:
+    conn.execute(RECORD_ANALYTICS_SQL, (sign, sign, transaction_id))
+    if sign < 0:
+        conn.execute(
+            "DELETE FROM transaction_rollup WHERE family_id = (SELECT family_id FROM transactions WHERE id = ?) AND count <= 0",
+            (transaction_id,),
+        )
+
+
+def record_analytics_since(conn: sqlite3.Connection, family_id: int, after_id: int) -> None:
+    conn.execute(RECORD_ANALYTICS_RANGE_SQL, (family_id, after_id))
+
+
+def rebuild_analytics(conn: sqlite3.Connection, family_id: int) -> None:
+    conn.execute("DELETE FROM transaction_rollup WHERE family_id = ?", (family_id,))
+    conn.execute(REBUILD_ANALYTICS_SQL.format(scope="WHERE t.family_id = ?"), (family_id,))
+
+
+def rebuild_all_analytics(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM transaction_rollup")
+    conn.execute(REBUILD_ANALYTICS_SQL.format(scope=""))
+
+
+def bucket_key(period: str, day: date) -> str:
+    if period == "daily":
+        return day.isoformat()
+    if period == "weekly":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    return day.strftime("%Y-%m")
+
+
+def summary_period(start: date = None, end: date = None) -> str:
+    starts_month = start is None or start.day == 1
+    ends_month = end is None or (end + timedelta(days=1)).day == 1
+    return "monthly" if starts_month and ends_month else "daily"
+
+
+def bucket_filters(period: str, start: date = None, end: date = None):
+    where, args = ["family_id = ?", "period = ?"], [period]
+    if start:
+        where.append("bucket >= ?")
+        args.append(bucket_key(period, start))
+    if end:
+        where.append("bucket <= ?")
+        args.append(bucket_key(period, end))
+    return where, args
+
+
+def analytics_summary(conn: sqlite3.Connection, family_id: int, start: date = None, end: date = None) -> dict:
+    period = summary_period(start, end)
+    where, args = bucket_filters(period, start, end)
+    rows = conn.execute(
+        f"""SELECT category_id, type, user_id, SUM(amount) AS amount, SUM(count) AS count
+        FROM transaction_rollup WHERE {" AND ".join(where)}
+        GROUP BY category_id, type, user_id""",
+        (family_id, *args),
+    ).fetchall()
+
+    members = {}
+    user_ids = {row["user_id"] for row in rows}
+    if user_ids:
+        placeholders = ", ".join("?" for _ in user_ids)
+        for user in conn.execute(
+            f"SELECT id, first_name, last_name, role FROM users WHERE id IN ({placeholders})", tuple(user_ids)
+        ):
+            members[user["id"]] = dict(user)
+
+    categories = {}
+    category_ids = {row["category_id"] for row in rows}
+    if category_ids:
+        placeholders = ", ".join("?" for _ in category_ids)
+        for category in conn.execute(f"SELECT id, name FROM categories WHERE id IN ({placeholders})", tuple(category_ids)):
+            categories[category["id"]] = category["name"]
+
+    totals = {"income": 0, "expense": 0, "count": 0}
+    by_category, by_member, by_role = {}, {}, {}
+    for row in rows:
+        amount, count = round(row["amount"], 2), row["count"]
+        if not count:
+            continue
+        totals[row["type"]] += amount
+        totals["count"] += count
+
+        member = members.get(row["user_id"], {"first_name": None, "last_name": None, "role": None})
+        role = (member["role"] or "unknown").lower()
+        category = categories.get(row["category_id"], "Others")
+        for groups, key, fields in (
+            (by_category, (category, row["type"]), {"category": category}),
+            (by_member, (row["user_id"], row["type"]), {"user_id": row["user_id"], "first_name": member["first_name"], "last_name": member["last_name"], "role": role}),
+            (by_role, (role, row["type"]), {"role": role}),
+        ):
+            group = groups.setdefault(key, {**fields, "type": row["type"], "amount": 0, "count": 0})
+            group["amount"] += amount
+            group["count"] += count
+
+    ordered = lambda groups: sorted(groups.values(), key=lambda g: g["amount"], reverse=True)
+    totals = {key: round(value, 2) for key, value in totals.items()}
+    totals["balance"] = round(totals["income"] - totals["expense"], 2)
+    return {
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None,
+        "period": period,
+        "totals": totals,
+        "by_category": ordered(by_category),
+        "by_member": ordered(by_member),
+        "by_role": ordered(by_role),
+    }
+
+
+def analytics_timeseries(conn: sqlite3.Connection, family_id: int, period: str, start: date = None,
+                         end: date = None, tx_type: str = None, category: str = None, user_id: int = None) -> list:
+    where, args = bucket_filters(period, start, end)
+    for clause, value in (("type = ?", tx_type), (CATEGORY_FILTER_SQL, category), ("user_id = ?", user_id)):
+        if value is not None:
+            where.append(clause)
+            args.append(value)
+    rows = conn.execute(
+        f"""SELECT bucket,
+            SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) AS income,
+            SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) AS expense,
+            SUM(count) AS count
+        FROM transaction_rollup WHERE {" AND ".join(where)}
+        GROUP BY bucket HAVING SUM(count) > 0 ORDER BY bucket""",
+        (family_id, *args),
+    )
+    return [
+        {"bucket": row["bucket"], "income": round(row["income"], 2), "expense": round(row["expense"], 2), "count": row["count"]}
+        for row in rows
+    ]
@@ -0,0 +1,159 @@
+import json
+import time
+from collections import OrderedDict
+from .extensions import CACHE_STATS
+from .database import unit_of_work, query_db, try_write
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 10000
+SQLITE_PRUNE_EVERY = 200
+
+
+class LocalCache:
+    name = "local"
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_STATS["evictions"] += 1
+
+    def delete(self, *keys):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def size(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    name = "sqlite"
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def get(self, key):
+        row = query_db("SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time()), one=True)
+        return json.loads(row["value"]) if row else None
+
+    def set(self, key, value, ttl):
+        self._writes += 1
+        try_write(self._fill, key, json.dumps(value), time.time() + ttl, self._writes % SQLITE_PRUNE_EVERY == 0)
+
+    def _fill(self, conn, key, value, expires_at, prune):
+        conn.execute("INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at))
+        if prune:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            evicted = conn.execute(
+                """DELETE FROM cache_entries WHERE key IN
+                (SELECT key FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)""",
+                (self.max_entries,),
+            ).rowcount
+            CACHE_STATS["evictions"] += max(evicted, 0)
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        with unit_of_work() as conn:
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+
+    def size(self):
+        row = query_db("SELECT COUNT(*) AS n FROM cache_entries", one=True)
+        return row["n"] if row else 0
+
+
+class RedisCache:
+    name = "redis"
+
+    def __init__(self, url, max_entries=DEFAULT_MAX_ENTRIES, prefix="lumora:cache:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.max_entries = max_entries
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def size(self):
+        return sum(1 for _ in self.client.scan_iter(self.prefix + "*"))
+
+
+CACHE_BACKENDS = {"local": LocalCache, "sqlite": SQLiteCache}
+cache = LocalCache()
+cache_ttl = DEFAULT_TTL
+
+
+def configure_cache(name, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+    global cache, cache_ttl
+    if name.startswith(("redis://", "rediss://")):
+        cache = RedisCache(name, max_entries=max_entries)
+    elif name in CACHE_BACKENDS:
+        cache = CACHE_BACKENDS[name](max_entries=max_entries)
+    else:
+        raise ValueError(f"Unknown cache backend '{name}'")
+    cache_ttl = ttl
+    return cache
+
+
+def get_cache():
+    return cache
+
+
+def _count(namespace, result):
+    counts = CACHE_STATS["namespaces"].setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+    counts[result] += 1
+
+
+def cached(namespace, key, loader):
+    if cache_ttl <= 0:
+        return loader()
+    cache_key = f"{namespace}:{key}"
+    value = cache.get(cache_key)
+    if value is not None:
+        _count(namespace, "hits")
+        return value
+    _count(namespace, "misses")
+    value = loader()
+    if value is not None:
+        cache.set(cache_key, value, cache_ttl)
+    return value
+
+
+def invalidate(namespace, *keys):
+    for _ in keys:
+        _count(namespace, "invalidations")
+    cache.delete(*(f"{namespace}:{key}" for key in keys))
+
+
+def cache_stats():
+    hit_ratio = {}
+    for name, counts in CACHE_STATS["namespaces"].items():
+        lookups = counts["hits"] + counts["misses"]
+        hit_ratio[name] = round(counts["hits"] / lookups, 4) if lookups else 0.0
+    return {"backend": cache.name, "ttl_seconds": cache_ttl, "entries": cache.size(), "hit_ratio_by_namespace": hit_ratio}
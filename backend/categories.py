@@ -0,0 +1,29 @@
+import sqlite3
+
+FALLBACK_CATEGORY = "Others"
+CATEGORY_COLORS = {"income": "#4CAF50", "expense": "#FF5722"}
+
+
+def find_category(conn: sqlite3.Connection, family_id: int, name: str):
+    return conn.execute(
+        "SELECT id, name, type FROM categories WHERE family_id = ? AND name = ? COLLATE NOCASE",
+        (family_id, name),
+    ).fetchone()
+
+
+def ensure_category(conn: sqlite3.Connection, family_id: int, name: str, cat_type: str = "expense"):
+    row = find_category(conn, family_id, name)
+    if row:
+        return row, False
+    conn.execute(
+        "INSERT INTO categories (family_id, name, type, is_default, color) VALUES (?, ?, ?, 0, ?)",
+        (family_id, name, cat_type, CATEGORY_COLORS.get(cat_type, CATEGORY_COLORS["expense"])),
+    )
+    return find_category(conn, family_id, name), True
+
+
+def category_ids(conn: sqlite3.Connection, family_id: int) -> dict:
+    return {
+        row["name"].lower(): row["id"]
+        for row in conn.execute("SELECT id, name FROM categories WHERE family_id = ?", (family_id,))
+    }
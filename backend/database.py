@@ -1,44 +1,148 @@
 import sqlite3
 import os
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from .db_executor import DBExecutor, ExecutorConnection
+from .migrations import apply_migrations
+from .metrics import record_db_error
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, "users.db")
+DB_PATH = os.environ.get("DATABASE_PATH", os.path.join(BASE_DIR, "users.db"))
 
+DB_READERS = int(os.environ.get("DB_READERS", "4"))
+BUSY_TIMEOUT_MS = 10000
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+)
 
-def get_db() -> sqlite3.Connection:
+
+def open_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, timeout=10.0, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+executor = DBExecutor(open_db, readers=DB_READERS)
+
+
+def get_db() -> ExecutorConnection:
+    return executor.writer if executor.owns_writer() else executor.reader
+
+
+def _begin(conn: sqlite3.Connection) -> None:
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    conn.commit()
+
+
+def _rollback(conn: sqlite3.Connection) -> None:
+    conn.rollback()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[ExecutorConnection]:
+    if executor.owns_writer():
+        yield executor.writer
+        return
+
+    with executor.hold_writer() as conn:
+        executor.write(_begin)
+        try:
+            yield conn
+        except BaseException:
+            executor.write(_rollback)
+            raise
+        else:
+            executor.write(_commit)
+
+
+def _snapshot(conn: sqlite3.Connection, func, args: tuple) -> Any:
+    if conn.in_transaction:
+        conn.rollback()
+    conn.execute("BEGIN")
     try:
-        conn = sqlite3.connect(DB_PATH, timeout=10.0)
-        conn.row_factory = sqlite3.Row
-        return conn
-    except sqlite3.Error as e:
-        print(f"Database connection error: {e}")
-        raise
+        return func(conn, *args)
+    finally:
+        conn.rollback()
+
+
+def _try_write(conn: sqlite3.Connection, func, args: tuple) -> Any:
+    conn.execute("PRAGMA busy_timeout = 0")
+    try:
+        with conn:
+            return func(conn, *args)
+    finally:
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+
+
+def _query(conn: sqlite3.Connection, query: str, args: tuple) -> list:
+    return conn.execute(query, args).fetchall()
+
+
+def _execute(conn: sqlite3.Connection, query: str, args: tuple) -> int:
+    with conn:
+        return conn.execute(query, args).lastrowid
 
 
 def query_db(query: str, args: tuple = (), one: bool = False) -> Optional[Any]:
     try:
-        with get_db() as conn:
-            cur = conn.execute(query, args)
-            rv = cur.fetchall()
+        rv = executor.run_sql(executor.owns_writer(), _query, query, args)
         if one:
             return rv[0] if rv else None
         return rv
     except sqlite3.Error as e:
+        record_db_error(e)
         print(f"Database query error: {e}")
         return None if one else []
 
 
+def read_snapshot(func, *args) -> Any:
+    if executor.owns_writer():
+        return executor.submit(True, func, *args)
+    return executor.submit(False, _snapshot, func, args)
+
+
+def try_write(func, *args) -> Any:
+    try:
+        return executor.submit(False, _try_write, func, args)
+    except sqlite3.Error:
+        return None
+
+
+def stream_db(query: str, args: tuple = (), size: int = 500) -> Iterator[list]:
+    try:
+        yield from executor.stream(query, args, size)
+    except sqlite3.Error as e:
+        record_db_error(e)
+        print(f"Database stream error: {e}")
+        raise
+
+
 def execute_db(query: str, args: tuple = ()) -> int:
     try:
-        with get_db() as conn:
-            cur = conn.execute(query, args)
-            conn.commit()
-            return cur.lastrowid if cur.lastrowid else 0
+        if executor.owns_writer():
+            lastrowid = executor.writer.execute(query, args).lastrowid
+        else:
+            with executor.hold_writer():
+                lastrowid = executor.run_sql(True, _execute, query, args)
+        return lastrowid if lastrowid else 0
     except sqlite3.IntegrityError as e:
+        record_db_error(e)
         print(f"Database integrity error: {e}")
         raise
     except sqlite3.Error as e:
+        record_db_error(e)
         print(f"Database execution error: {e}")
         return 0
 
@@ -95,9 +199,12 @@ def init_db():
               UNIQUE(family_id, name))""",
     }
 
-    with get_db() as conn:
-        for create_sql in schema.values():
-            conn.execute(create_sql)
-        
-        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_families_invite_code ON families(invite_code)")
-        conn.commit()
+    def create_schema(conn: sqlite3.Connection) -> None:
+        with conn:
+            for create_sql in schema.values():
+                conn.execute(create_sql)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_families_invite_code ON families(invite_code)")
+        apply_migrations(conn)
+
+    executor.reset()
+    executor.write(create_schema)
@@ -0,0 +1,217 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from concurrent.futures import Future
+import eventlet
+from eventlet import greenio
+from eventlet.event import Event
+from eventlet.patcher import original
+from eventlet.semaphore import Semaphore
+from greenlet import getcurrent
+from .extensions import socketio, DB_EXECUTOR_STATS
+from .metrics import record_query
+
+socket = original("socket")
+threading = original("threading")
+queue = original("queue")
+
+
+class Result:
+    def __init__(self, rows, lastrowid=None, rowcount=-1):
+        self.rows = rows
+        self.lastrowid = lastrowid
+        self.rowcount = rowcount
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def _execute(conn: sqlite3.Connection, sql: str, args=()) -> Result:
+    cur = conn.execute(sql, args)
+    return Result(cur.fetchall(), cur.lastrowid, cur.rowcount)
+
+
+def _executemany(conn: sqlite3.Connection, sql: str, seq) -> Result:
+    cur = conn.executemany(sql, seq)
+    return Result([], cur.lastrowid, cur.rowcount)
+
+
+def _open_cursor(conn: sqlite3.Connection, connect, sql: str, args=()):
+    stream_conn = connect()
+    stream_conn.execute("PRAGMA query_only = ON")
+    return stream_conn, stream_conn.execute(sql, args)
+
+
+def _fetchmany(conn: sqlite3.Connection, cursor: sqlite3.Cursor, size: int) -> list:
+    return cursor.fetchmany(size)
+
+
+def _close(conn: sqlite3.Connection, stream_conn: sqlite3.Connection) -> None:
+    stream_conn.close()
+
+
+class ExecutorConnection:
+    def __init__(self, executor, write: bool):
+        self._executor = executor
+        self._write = write
+
+    def execute(self, sql: str, args=()) -> Result:
+        return self._executor.run_sql(self._write, _execute, sql, args)
+
+    def executemany(self, sql: str, seq) -> Result:
+        return self._executor.run_sql(self._write, _executemany, sql, list(seq))
+
+
+class _Waker:
+    def __init__(self):
+        self._done = queue.SimpleQueue()
+        self._rsock = self._wsock = None
+
+    def _start(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.connect(listener.getsockname())
+        self._wsock, _ = listener.accept()
+        self._wsock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        listener.close()
+        self._rsock = greenio.GreenSocket(client)
+        eventlet.spawn_n(self._dispatch)
+
+    def _dispatch(self):
+        while self._rsock.recv(4096):
+            while True:
+                try:
+                    event = self._done.get_nowait()
+                except queue.Empty:
+                    break
+                event.send()
+
+    def _notify(self, event):
+        self._done.put(event)
+        self._wsock.sendall(b" ")
+
+    def wait(self, future: Future):
+        if self._rsock is None:
+            self._start()
+        event = Event()
+        future.add_done_callback(lambda f: self._notify(event))
+        event.wait()
+        return future.result()
+
+
+class DBExecutor:
+    def __init__(self, connect, readers: int = 4):
+        self.connect = connect
+        self.readers = readers
+        self._reads = queue.Queue()
+        self._writes = queue.Queue()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._waker = _Waker()
+        self._write_lock = Semaphore(1)
+        self._writer_owner = None
+        self._generation = 0
+        self.reader = ExecutorConnection(self, write=False)
+        self.writer = ExecutorConnection(self, write=True)
+
+    def _start(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.readers):
+                self._spawn(self._reads, f"db-reader-{i}")
+            self._spawn(self._writes, "db-writer")
+
+    def _spawn(self, jobs, name):
+        thread = threading.Thread(target=self._work, args=(jobs,), name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _work(self, jobs):
+        conn, generation = None, None
+        while True:
+            future, func, args = jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if generation != self._generation:
+                    if conn is not None:
+                        conn.close()
+                    conn, generation = self.connect(), self._generation
+                future.set_result(func(conn, *args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, write: bool, func, *args):
+        if not self._threads:
+            self._start()
+        future = Future()
+        (self._writes if write else self._reads).put((future, func, args))
+        started = time.perf_counter()
+        try:
+            if socketio.async_mode == "eventlet":
+                return self._waker.wait(future)
+            return future.result()
+        finally:
+            DB_EXECUTOR_STATS["writes" if write else "reads"] += 1
+            DB_EXECUTOR_STATS["seconds"] += time.perf_counter() - started
+
+    def run_sql(self, write: bool, func, sql: str, args):
+        started = time.perf_counter()
+        try:
+            return self.submit(write, func, sql, args)
+        finally:
+            record_query(sql, args, time.perf_counter() - started)
+
+    def stream(self, sql: str, args=(), size: int = 500):
+        started = time.perf_counter()
+        stream_conn, cursor = self.submit(False, _open_cursor, self.connect, sql, args)
+        record_query(sql, args, time.perf_counter() - started)
+        try:
+            while True:
+                rows = self.submit(False, _fetchmany, cursor, size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            self.submit(False, _close, stream_conn)
+
+    def reset(self) -> None:
+        self._generation += 1
+
+    def owns_writer(self) -> bool:
+        return self._writer_owner is getcurrent()
+
+    @contextmanager
+    def hold_writer(self):
+        if not self._write_lock.acquire(blocking=False):
+            DB_EXECUTOR_STATS["write_waits"] += 1
+            self._write_lock.acquire()
+        self._writer_owner = getcurrent()
+        try:
+            yield self.writer
+        finally:
+            self._writer_owner = None
+            self._write_lock.release()
+
+    def write(self, func, *args):
+        if self.owns_writer():
+            return self.submit(True, func, *args)
+        with self.hold_writer():
+            return self.submit(True, func, *args)
+
+    def stats(self) -> dict:
+        return {
+            **DB_EXECUTOR_STATS,
+            "readers": self.readers,
+            "queued_reads": self._reads.qsize(),
+            "queued_writes": self._writes.qsize(),
+        }
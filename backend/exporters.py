@@ -0,0 +1,35 @@
+import csv
+import io
+import json
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+EXPORT_COLUMNS = ("id", "date", "type", "amount", "category", "description", "member", "role", "recurrence")
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([csv_cell(row[column]) for column in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(batches):
+    for rows in batches:
+        yield "".join(json.dumps({column: row[column] for column in EXPORT_COLUMNS}) + "\n" for row in rows)
+
+
+def export_chunks(batches, fmt: str):
+    return csv_chunks(batches) if fmt == "csv" else ndjson_chunks(batches)
@@ -6,3 +6,8 @@ socketio = SocketIO(
 )
 
 ACTIVITY_BUFFER = {}
+FAMILY_REVISIONS = {}
+FAMILY_SYNC_STATS = {"emits": 0, "messages": 0, "deduplicated": 0}
+PASSWORD_HASH_STATS = {"active": 0, "waiting": 0, "max_waiting": 0, "completed": 0, "rehashed": 0, "seconds": 0.0}
+DB_EXECUTOR_STATS = {"reads": 0, "writes": 0, "write_waits": 0, "seconds": 0.0}
+CACHE_STATS = {"evictions": 0, "namespaces": {}}
@@ -0,0 +1,89 @@
+import sqlite3
+from .rollups import period_bucket_sql
+
+GOAL_PERIODS = ("daily", "weekly", "monthly", "yearly")
+
+ADJUST_GOAL_SQL = """
+    UPDATE goals SET current_amount = MAX(0, MIN(COALESCE(current_amount, 0) + ?, target_amount))
+    WHERE id = ? AND family_id = ?
+    RETURNING *
+"""
+
+RECORD_CONTRIBUTION_SQL = """
+    INSERT INTO goal_contributions (goal_id, family_id, user_id, requested, applied, balance)
+    VALUES (?, ?, ?, ?, ? - COALESCE((SELECT balance FROM goal_contributions WHERE goal_id = ? ORDER BY id DESC LIMIT 1), 0), ?)
+    RETURNING applied
+"""
+
+CONTRIBUTIONS_SQL = """
+    SELECT g.id, g.user_id, u.first_name, u.role, g.requested, g.applied, g.balance, g.created_at
+    FROM goal_contributions g
+    LEFT JOIN users u ON u.id = g.user_id
+    WHERE {where}
+    ORDER BY g.id DESC
+    LIMIT ?
+"""
+
+GOAL_PROGRESS_SQL = f"""
+    SELECT p.bucket, p.added, p.withdrawn, c.balance
+    FROM (
+        SELECT {period_bucket_sql("?", "created_at")} AS bucket,
+            SUM(MAX(applied, 0)) AS added, SUM(MAX(-applied, 0)) AS withdrawn, MAX(id) AS last_id
+        FROM goal_contributions
+        WHERE goal_id = ?
+        GROUP BY bucket
+    ) p
+    JOIN goal_contributions c ON c.id = p.last_id
+    ORDER BY p.bucket
+"""
+
+GOAL_MEMBERS_SQL = """
+    SELECT g.user_id, u.first_name, u.last_name, u.role,
+        SUM(MAX(g.applied, 0)) AS added, SUM(MAX(-g.applied, 0)) AS withdrawn, SUM(g.applied) AS net, COUNT(*) AS count
+    FROM goal_contributions g
+    LEFT JOIN users u ON u.id = g.user_id
+    WHERE g.goal_id = ?
+    GROUP BY g.user_id
+    ORDER BY net DESC
+"""
+
+
+def adjust_goal_amount(conn: sqlite3.Connection, goal_id: int, family_id: int, user_id: int, delta: float):
+    goal = conn.execute(ADJUST_GOAL_SQL, (delta, goal_id, family_id)).fetchone()
+    if goal is None:
+        return None, 0
+    balance = goal["current_amount"]
+    applied = conn.execute(
+        RECORD_CONTRIBUTION_SQL, (goal_id, family_id, user_id, delta, balance, goal_id, balance)
+    ).fetchone()["applied"]
+    return goal, applied
+
+
+def record_opening_balance(conn: sqlite3.Connection, goal, user_id: int) -> None:
+    if goal["current_amount"]:
+        conn.execute(
+            "INSERT INTO goal_contributions (goal_id, family_id, user_id, requested, applied, balance) VALUES (?, ?, ?, ?, ?, ?)",
+            (goal["id"], goal["family_id"], user_id, goal["current_amount"], goal["current_amount"], goal["current_amount"]),
+        )
+
+
+def goal_contributions(conn: sqlite3.Connection, goal_id: int, limit: int, before: int = None, user_id: int = None) -> list:
+    where, args = ["g.goal_id = ?"], [goal_id]
+    for clause, value in (("g.id < ?", before), ("g.user_id = ?", user_id)):
+        if value is not None:
+            where.append(clause)
+            args.append(value)
+    return [dict(row) for row in conn.execute(CONTRIBUTIONS_SQL.format(where=" AND ".join(where)), (*args, limit))]
+
+
+def goal_progress(conn: sqlite3.Connection, goal_id: int, period: str) -> dict:
+    points = [
+        {"bucket": row["bucket"], "added": round(row["added"], 2), "withdrawn": round(row["withdrawn"], 2),
+         "balance": round(row["balance"], 2)}
+        for row in conn.execute(GOAL_PROGRESS_SQL, (period, goal_id))
+    ]
+    members = [
+        {**dict(row), "added": round(row["added"], 2), "withdrawn": round(row["withdrawn"], 2), "net": round(row["net"], 2)}
+        for row in conn.execute(GOAL_MEMBERS_SQL, (goal_id,))
+    ]
+    return {"period": period, "points": points, "by_member": members}
@@ -0,0 +1,135 @@
+import csv
+import io
+import math
+import re
+from datetime import datetime
+
+IMPORT_FORMATS = ("csv", "ofx", "qif")
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%m/%d/%Y", "%d.%m.%Y", "%m/%d/%y", "%Y%m%d%H%M%S", "%Y%m%d")
+CSV_ALIASES = {
+    "date": ("date", "posted", "transaction date"),
+    "description": ("description", "name", "payee", "memo"),
+    "amount": ("amount", "value"),
+    "type": ("type",),
+    "category": ("category",),
+}
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+def detect_format(filename: str, declared: str = None) -> str:
+    if declared:
+        return declared.lower()
+    ext = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    return ext if ext in IMPORT_FORMATS else "csv"
+
+
+def parse_date(value: str) -> str:
+    value = (value or "").strip()
+    value = re.sub(r"^(\d{8,14})(\.\d+)?(\[.*\])?$", r"\1", value).replace("'", "/")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+    raise ImportRowError(f"Unrecognised date '{value}'")
+
+
+def normalise_row(raw: dict) -> dict:
+    try:
+        amount = float(str(raw.get("amount", "")).replace(",", "").replace("$", "").strip())
+    except ValueError:
+        raise ImportRowError(f"Invalid amount '{raw.get('amount')}'")
+
+    tx_type = (raw.get("type") or "").strip().lower()
+    if tx_type not in ["income", "expense"]:
+        tx_type = "income" if amount > 0 else "expense"
+    amount = abs(amount)
+    if not math.isfinite(amount) or amount <= 0 or amount > 999999999:
+        raise ImportRowError("Amount must be between 0 and 999,999,999")
+
+    description = (raw.get("description") or "").strip()[:500] or "Imported transaction"
+    category = (raw.get("category") or "").strip()[:100] or "Others"
+    return {
+        "date": parse_date(raw.get("date")),
+        "description": description,
+        "amount": amount,
+        "type": tx_type,
+        "category": category,
+    }
+
+
+def iter_csv(stream):
+    reader = csv.reader(stream)
+    header = [h.strip().lower() for h in next(reader, [])]
+    columns = {}
+    for field, aliases in CSV_ALIASES.items():
+        for alias in aliases:
+            if alias in header:
+                columns[field] = header.index(alias)
+                break
+    if "amount" not in columns or "date" not in columns:
+        raise ImportRowError("CSV header must include 'date' and 'amount' columns")
+    for values in reader:
+        if not any(v.strip() for v in values):
+            continue
+        yield {field: values[idx] if idx < len(values) else "" for field, idx in columns.items()}
+
+
+def iter_ofx(stream):
+    record = None
+    for line in stream:
+        for tag, value in re.findall(r"<([A-Z0-9.]+)>([^<\r\n]*)", line, re.IGNORECASE):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                record = {}
+            elif record is not None and tag in ("DTPOSTED", "TRNAMT", "NAME", "MEMO", "TRNTYPE"):
+                record[tag] = value.strip()
+        if record is not None and "</STMTTRN>" in line.upper():
+            yield {
+                "date": record.get("DTPOSTED", ""),
+                "amount": record.get("TRNAMT", ""),
+                "description": record.get("NAME") or record.get("MEMO", ""),
+            }
+            record = None
+
+
+def iter_qif(stream):
+    record = {}
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        code, value = line[0], line[1:].strip()
+        if code == "^":
+            if record:
+                yield record
+            record = {}
+        elif code == "D":
+            record["date"] = value
+        elif code in ("T", "U"):
+            record["amount"] = value
+        elif code == "P":
+            record["description"] = value
+        elif code == "M":
+            record.setdefault("description", value)
+        elif code == "L":
+            record["category"] = value.split(":")[0]
+    if record:
+        yield record
+
+
+PARSERS = {"csv": iter_csv, "ofx": iter_ofx, "qif": iter_qif}
+
+
+def iter_import_rows(binary_stream, fmt: str):
+    if fmt not in PARSERS:
+        raise ImportRowError(f"Unsupported import format '{fmt}'")
+    text = io.TextIOWrapper(binary_stream, encoding="utf-8-sig", errors="replace", newline="")
+    for row_no, raw in enumerate(PARSERS[fmt](text), start=1):
+        try:
+            yield row_no, normalise_row(raw), None
+        except ImportRowError as e:
+            yield row_no, None, str(e)
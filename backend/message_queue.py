@@ -0,0 +1,58 @@
+import json
+import os
+import sqlite3
+import time
+from socketio import PubSubManager
+from .database import BASE_DIR
+
+DEFAULT_QUEUE_PATH = os.path.join(BASE_DIR, "socketio_queue.db")
+
+
+class SQLiteQueueManager(PubSubManager):
+    name = "sqlite"
+
+    def __init__(self, url="sqlite://", channel="flask-socketio", write_only=False, logger=None,
+                 json=None, poll_interval=0.05, retention=60):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.path = url[len("sqlite://"):] or DEFAULT_QUEUE_PATH
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.published = 0
+        self.conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS socket_messages
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  channel TEXT NOT NULL,
+                  created REAL NOT NULL,
+                  payload TEXT NOT NULL)"""
+        )
+        row = self.conn.execute("SELECT MAX(id) FROM socket_messages").fetchone()
+        self.last_id = row[0] or 0
+
+    def _publish(self, data):
+        self.conn.execute(
+            "INSERT INTO socket_messages (channel, created, payload) VALUES (?, ?, ?)",
+            (self.channel, time.time(), self.json.dumps(data)),
+        )
+        self.published += 1
+        if self.published % 500 == 0:
+            self.conn.execute("DELETE FROM socket_messages WHERE created < ?", (time.time() - self.retention,))
+
+    def _listen(self):
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, payload FROM socket_messages WHERE channel = ? AND id > ? ORDER BY id",
+                (self.channel, self.last_id),
+            ).fetchall()
+            for message_id, payload in rows:
+                self.last_id = message_id
+                yield json.loads(payload)
+            self.server.sleep(self.poll_interval)
+
+
+def create_client_manager(url, channel="flask-socketio"):
+    if url and url.startswith("sqlite://"):
+        return SQLiteQueueManager(url, channel=channel)
+    return None
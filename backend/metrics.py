@@ -0,0 +1,187 @@
+import os
+import re
+import time
+from bisect import bisect_left
+from flask import request, g, has_app_context
+from .extensions import socketio, CACHE_STATS
+
+METRICS_PREFIX = "lumora"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+SLOW_QUERY_SECONDS = float(os.environ.get("SLOW_QUERY_SECONDS", "0.1"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+FANOUT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+
+HISTOGRAMS = {}
+COUNTERS = {}
+HELP = {
+    "http_request_duration_seconds": ("histogram", "Request latency by blueprint and route."),
+    "http_request_queries": ("histogram", "SQL statements issued per request."),
+    "http_request_sql_seconds": ("histogram", "Time a request spent waiting on SQL."),
+    "socket_fanout_recipients": ("histogram", "Local clients in the room an event was emitted to."),
+    "db_slow_queries_total": ("counter", "Statements slower than SLOW_QUERY_SECONDS, by normalised SQL."),
+    "db_errors_total": ("counter", "SQLite errors raised by query helpers."),
+    "unhandled_exceptions_total": ("counter", "Exceptions turned into 500 responses."),
+    "socket_emits_total": ("counter", "Socket.IO emits by event name."),
+    "cache_requests_total": ("counter", "Read-through cache lookups by namespace and result."),
+    "cache_invalidations_total": ("counter", "Cache entries invalidated by namespace."),
+    "cache_evictions_total": ("counter", "Cache entries evicted to stay under CACHE_MAX_ENTRIES."),
+}
+
+
+def _labels(**labels) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def observe(name: str, buckets: tuple, value: float, **labels) -> None:
+    key = (name, _labels(**labels))
+    series = HISTOGRAMS.get(key)
+    if series is None:
+        series = HISTOGRAMS[key] = {"buckets": buckets, "counts": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+    series["counts"][bisect_left(buckets, value)] += 1
+    series["sum"] += value
+    series["count"] += 1
+
+
+def increment(name: str, amount: float = 1, **labels) -> None:
+    key = (name, _labels(**labels))
+    COUNTERS[key] = COUNTERS.get(key, 0) + amount
+
+
+def normalise_sql(sql: str) -> str:
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", sql)
+    return " ".join(sql.split())
+
+
+def param_shape(params) -> str:
+    if isinstance(params, list):
+        first = param_shape(params[0]) if params else "()"
+        return f"{len(params)} x {first}"
+    return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+
+
+def record_query(sql: str, params, seconds: float) -> None:
+    if has_app_context() and "query_count" in g:
+        g.query_count += 1
+        g.sql_seconds += seconds
+    if seconds >= SLOW_QUERY_SECONDS:
+        statement = normalise_sql(sql)
+        increment("db_slow_queries_total", statement=statement)
+        print(f"Slow query ({seconds * 1000:.1f} ms): {statement} params={param_shape(params)}")
+
+
+def record_db_error(error: Exception) -> None:
+    increment("db_errors_total", error=type(error).__name__)
+
+
+def record_exception(error: Exception) -> None:
+    rule = request.url_rule.rule if request.url_rule else "unmatched"
+    increment("unhandled_exceptions_total", route=rule, exception=type(error).__name__)
+
+
+def record_emit(event: str, room=None, namespace: str = "/") -> None:
+    increment("socket_emits_total", event=event)
+    if room is not None and socketio.server is not None:
+        recipients = sum(1 for _ in socketio.server.manager.get_participants(namespace, room))
+        observe("socket_fanout_recipients", FANOUT_BUCKETS, recipients, event=event)
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.query_count = 0
+    g.sql_seconds = 0.0
+
+
+def _finish_request(response):
+    started = g.get("request_started")
+    if started is None or request.blueprint == "metrics":
+        return response
+    elapsed = time.perf_counter() - started
+    blueprint = request.blueprint or "app"
+    rule = request.url_rule.rule if request.url_rule else "unmatched"
+    observe("http_request_duration_seconds", LATENCY_BUCKETS, elapsed,
+            blueprint=blueprint, route=rule, method=request.method, status=response.status_code)
+    observe("http_request_queries", QUERY_COUNT_BUCKETS, g.query_count, blueprint=blueprint, route=rule)
+    observe("http_request_sql_seconds", LATENCY_BUCKETS, g.sql_seconds, blueprint=blueprint, route=rule)
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={g.sql_seconds * 1000:.1f};desc="{g.query_count} queries", app;dur={elapsed * 1000:.1f}',
+    )
+    return response
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics(stats_sources=()) -> str:
+    lines, described = [], set()
+
+    def describe(name):
+        if name in described:
+            return
+        described.add(name)
+        kind, text = HELP.get(name, ("gauge", name.replace("_", " ")))
+        lines.append(f"# HELP {METRICS_PREFIX}_{name} {text}")
+        lines.append(f"# TYPE {METRICS_PREFIX}_{name} {kind}")
+
+    for (name, labels), series in sorted(HISTOGRAMS.items()):
+        describe(name)
+        cumulative = 0
+        for bound, count in zip(series["buckets"] + ("+Inf",), series["counts"]):
+            cumulative += count
+            lines.append(f"{METRICS_PREFIX}_{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {cumulative}")
+        lines.append(f"{METRICS_PREFIX}_{name}_sum{_format_labels(labels)} {_format_value(series['sum'])}")
+        lines.append(f"{METRICS_PREFIX}_{name}_count{_format_labels(labels)} {series['count']}")
+
+    for (name, labels), value in sorted(COUNTERS.items()):
+        describe(name)
+        lines.append(f"{METRICS_PREFIX}_{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for namespace, counts in sorted(CACHE_STATS["namespaces"].items()):
+        describe("cache_requests_total")
+        for result, field in (("hit", "hits"), ("miss", "misses")):
+            labels = _format_labels(_labels(namespace=namespace, result=result))
+            lines.append(f"{METRICS_PREFIX}_cache_requests_total{labels} {counts[field]}")
+    for namespace, counts in sorted(CACHE_STATS["namespaces"].items()):
+        describe("cache_invalidations_total")
+        lines.append(f"{METRICS_PREFIX}_cache_invalidations_total{_format_labels(_labels(namespace=namespace))} {counts['invalidations']}")
+    describe("cache_evictions_total")
+    lines.append(f"{METRICS_PREFIX}_cache_evictions_total {CACHE_STATS['evictions']}")
+
+    for group, collect in stats_sources:
+        info = {}
+        for key, value in collect().items():
+            if isinstance(value, str):
+                info[key] = value
+                continue
+            if isinstance(value, dict):
+                name, _, label = key.partition("_by_")
+                describe(f"{group}_{name}")
+                for item, item_value in sorted(value.items()):
+                    lines.append(f"{METRICS_PREFIX}_{group}_{name}{_format_labels(_labels(**{label: item}))} {_format_value(item_value)}")
+                continue
+            describe(f"{group}_{key}")
+            lines.append(f"{METRICS_PREFIX}_{group}_{key} {_format_value(value)}")
+        if info:
+            describe(f"{group}_info")
+            lines.append(f"{METRICS_PREFIX}_{group}_info{_format_labels(_labels(**info))} 1")
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(app) -> None:
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,301 @@
+import sqlite3
+from . import analytics, rollups, search
+
+LEGACY_SPEND_SQL = f"""
+    INSERT INTO budget_spend (family_id, category, period, bucket, amount)
+    SELECT t.family_id, t.category, p.period, {rollups.period_bucket_sql("p.period", "t.date")} AS bucket, SUM(t.amount)
+    FROM transactions t, ({rollups.PERIODS_SQL}) p
+    WHERE t.type = 'expense' AND t.category IS NOT NULL
+    GROUP BY t.family_id, t.category, p.period, bucket
+"""
+
+LEGACY_ANALYTICS_SQL = f"""
+    INSERT INTO transaction_rollup (family_id, period, bucket, type, category, user_id, amount, count)
+    SELECT t.family_id, p.period, {rollups.period_bucket_sql("p.period", "t.date")} AS bucket,
+        CASE WHEN t.type = 'income' THEN 'income' ELSE 'expense' END AS kind,
+        COALESCE(t.category, 'Others') AS category, t.user_id, SUM(t.amount), COUNT(*)
+    FROM transactions t, ({analytics.ANALYTICS_PERIODS_SQL}) p
+    GROUP BY t.family_id, p.period, bucket, kind, category, t.user_id
+"""
+
+
+# Migrations 2 and 5 run before migration 8 moves categories to ids, so they
+# keep rebuilding from the text category column they were written against.
+def rebuild_all_spend(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM budget_spend")
+    conn.execute(LEGACY_SPEND_SQL)
+
+
+def rebuild_all_analytics(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM transaction_rollup")
+    conn.execute(LEGACY_ANALYTICS_SQL)
+
+
+# Migration 9 indexes into the first transactions_fts, which has no family column.
+def index_transactions(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM transactions_fts")
+    conn.execute(
+        """INSERT INTO transactions_fts (rowid, description, category)
+        SELECT t.id, t.description, c.name FROM transactions t LEFT JOIN categories c ON c.id = t.category_id"""
+    )
+
+
+MIGRATIONS = [
+    (
+        1,
+        "family-scoped secondary indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_transactions_family_date ON transactions(family_id, date, id)",
+            "CREATE INDEX IF NOT EXISTS idx_transactions_family_category ON transactions(family_id, category, type)",
+            "CREATE INDEX IF NOT EXISTS idx_users_family ON users(family_id)",
+            "CREATE INDEX IF NOT EXISTS idx_categories_family_name ON categories(family_id, name COLLATE NOCASE)",
+            "CREATE INDEX IF NOT EXISTS idx_budgets_family_category ON budgets(family_id, category)",
+            "CREATE INDEX IF NOT EXISTS idx_goals_family ON goals(family_id)",
+            "CREATE INDEX IF NOT EXISTS idx_families_created_by ON families(created_by)",
+        ],
+    ),
+    (
+        2,
+        "budget spend rollup",
+        [
+            """CREATE TABLE IF NOT EXISTS budget_spend
+                 (family_id INTEGER NOT NULL,
+                  category TEXT NOT NULL,
+                  period TEXT NOT NULL,
+                  bucket TEXT NOT NULL,
+                  amount REAL NOT NULL DEFAULT 0,
+                  PRIMARY KEY (family_id, category, period, bucket)) WITHOUT ROWID""",
+            rebuild_all_spend,
+        ],
+    ),
+    (
+        3,
+        "per-family resource revisions",
+        [
+            """CREATE TABLE IF NOT EXISTS resource_revisions
+                 (family_id INTEGER NOT NULL,
+                  resource TEXT NOT NULL,
+                  revision INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (family_id, resource)) WITHOUT ROWID""",
+        ],
+    ),
+    (
+        4,
+        "persistent activity log",
+        [
+            """CREATE TABLE IF NOT EXISTS activity_log
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  family_id INTEGER NOT NULL,
+                  ts INTEGER NOT NULL,
+                  title TEXT NOT NULL,
+                  detail TEXT,
+                  category TEXT,
+                  user_name TEXT,
+                  user_role TEXT)""",
+            "CREATE INDEX IF NOT EXISTS idx_activity_log_family_ts ON activity_log(family_id, ts, id)",
+        ],
+    ),
+    (
+        5,
+        "analytics time-series rollup",
+        [
+            """CREATE TABLE IF NOT EXISTS transaction_rollup
+                 (family_id INTEGER NOT NULL,
+                  period TEXT NOT NULL,
+                  bucket TEXT NOT NULL,
+                  type TEXT NOT NULL,
+                  category TEXT NOT NULL,
+                  user_id INTEGER NOT NULL,
+                  amount REAL NOT NULL DEFAULT 0,
+                  count INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (family_id, period, bucket, type, category, user_id)) WITHOUT ROWID""",
+            rebuild_all_analytics,
+        ],
+    ),
+    (
+        6,
+        "recurring transaction scheduler",
+        [
+            "ALTER TABLE transactions ADD COLUMN recurring_parent_id INTEGER",
+            "CREATE INDEX IF NOT EXISTS idx_transactions_due ON transactions(next_due_date) WHERE is_recurring = 1",
+            """CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_occurrence
+                 ON transactions(recurring_parent_id, date) WHERE recurring_parent_id IS NOT NULL""",
+            """CREATE TABLE IF NOT EXISTS scheduler_leases
+                 (name TEXT PRIMARY KEY,
+                  owner TEXT NOT NULL,
+                  expires_at REAL NOT NULL) WITHOUT ROWID""",
+        ],
+    ),
+    (
+        7,
+        "shared read-through cache",
+        [
+            """CREATE TABLE IF NOT EXISTS cache_entries
+                 (key TEXT PRIMARY KEY,
+                  value TEXT NOT NULL,
+                  expires_at REAL NOT NULL) WITHOUT ROWID""",
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at)",
+        ],
+    ),
+    (
+        8,
+        "category foreign keys",
+        [
+            "UPDATE transactions SET category = 'Others' WHERE category IS NULL OR TRIM(category) = ''",
+            """DELETE FROM categories WHERE id NOT IN
+                 (SELECT MIN(id) FROM categories GROUP BY family_id, name COLLATE NOCASE)""",
+            """INSERT INTO categories (family_id, name, type, is_default, color)
+                 SELECT t.family_id, MIN(t.category), MIN(t.type), 0,
+                        CASE MIN(t.type) WHEN 'income' THEN '#4CAF50' ELSE '#FF5722' END
+                 FROM transactions t
+                 WHERE NOT EXISTS (SELECT 1 FROM categories c WHERE c.family_id = t.family_id AND c.name = t.category COLLATE NOCASE)
+                 GROUP BY t.family_id, t.category COLLATE NOCASE""",
+            """INSERT INTO categories (family_id, name, type, is_default, color)
+                 SELECT b.family_id, MIN(b.category), 'expense', 0, '#FF5722'
+                 FROM budgets b
+                 WHERE NOT EXISTS (SELECT 1 FROM categories c WHERE c.family_id = b.family_id AND c.name = b.category COLLATE NOCASE)
+                 GROUP BY b.family_id, b.category COLLATE NOCASE""",
+            "DROP INDEX IF EXISTS idx_categories_family_name",
+            "CREATE UNIQUE INDEX idx_categories_family_name ON categories(family_id, name COLLATE NOCASE)",
+            "ALTER TABLE transactions ADD COLUMN category_id INTEGER REFERENCES categories(id)",
+            "ALTER TABLE budgets ADD COLUMN category_id INTEGER REFERENCES categories(id)",
+            """UPDATE transactions SET category_id =
+                 (SELECT c.id FROM categories c WHERE c.family_id = transactions.family_id AND c.name = transactions.category COLLATE NOCASE)""",
+            """UPDATE budgets SET category_id =
+                 (SELECT c.id FROM categories c WHERE c.family_id = budgets.family_id AND c.name = budgets.category COLLATE NOCASE)""",
+            "DROP INDEX IF EXISTS idx_transactions_family_category",
+            "DROP INDEX IF EXISTS idx_budgets_family_category",
+            "ALTER TABLE transactions DROP COLUMN category",
+            "ALTER TABLE budgets DROP COLUMN category",
+            "CREATE INDEX idx_transactions_family_category ON transactions(family_id, category_id, type)",
+            "CREATE INDEX idx_budgets_family_category ON budgets(family_id, category_id)",
+            "DROP TABLE budget_spend",
+            """CREATE TABLE budget_spend
+                 (family_id INTEGER NOT NULL,
+                  category_id INTEGER NOT NULL,
+                  period TEXT NOT NULL,
+                  bucket TEXT NOT NULL,
+                  amount REAL NOT NULL DEFAULT 0,
+                  PRIMARY KEY (family_id, category_id, period, bucket)) WITHOUT ROWID""",
+            "DROP TABLE transaction_rollup",
+            """CREATE TABLE transaction_rollup
+                 (family_id INTEGER NOT NULL,
+                  period TEXT NOT NULL,
+                  bucket TEXT NOT NULL,
+                  type TEXT NOT NULL,
+                  category_id INTEGER NOT NULL,
+                  user_id INTEGER NOT NULL,
+                  amount REAL NOT NULL DEFAULT 0,
+                  count INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (family_id, period, bucket, type, category_id, user_id)) WITHOUT ROWID""",
+            rollups.rebuild_all_spend,
+            analytics.rebuild_all_analytics,
+        ],
+    ),
+    (
+        9,
+        "transaction full-text search",
+        [
+            """CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts
+                 USING fts5(description, category, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')""",
+            """CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+                 INSERT INTO transactions_fts (rowid, description, category)
+                 VALUES (new.id, new.description, (SELECT name FROM categories WHERE id = new.category_id));
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+                 DELETE FROM transactions_fts WHERE rowid = old.id;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description, category_id ON transactions BEGIN
+                 UPDATE transactions_fts
+                 SET description = new.description, category = (SELECT name FROM categories WHERE id = new.category_id)
+                 WHERE rowid = new.id;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS categories_fts_rename AFTER UPDATE OF name ON categories
+               WHEN new.name IS NOT old.name BEGIN
+                 UPDATE transactions_fts SET category = new.name
+                 WHERE rowid IN (SELECT id FROM transactions WHERE family_id = new.family_id AND category_id = new.id);
+               END""",
+            index_transactions,
+        ],
+    ),
+    (
+        10,
+        "goal contribution ledger",
+        [
+            """CREATE TABLE IF NOT EXISTS goal_contributions
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  goal_id INTEGER NOT NULL,
+                  family_id INTEGER NOT NULL,
+                  user_id INTEGER,
+                  requested REAL NOT NULL,
+                  applied REAL NOT NULL,
+                  balance REAL NOT NULL,
+                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""",
+            "CREATE INDEX IF NOT EXISTS idx_goal_contributions_goal ON goal_contributions(goal_id, id)",
+            "CREATE INDEX IF NOT EXISTS idx_goal_contributions_member ON goal_contributions(family_id, user_id)",
+            """INSERT INTO goal_contributions (goal_id, family_id, user_id, requested, applied, balance)
+                 SELECT id, family_id, NULL, current_amount, current_amount, current_amount
+                 FROM goals WHERE COALESCE(current_amount, 0) > 0""",
+        ],
+    ),
+    (
+        11,
+        "family-scoped full-text search",
+        [
+            "DROP TRIGGER IF EXISTS transactions_fts_insert",
+            "DROP TRIGGER IF EXISTS transactions_fts_delete",
+            "DROP TRIGGER IF EXISTS transactions_fts_update",
+            "DROP TRIGGER IF EXISTS categories_fts_rename",
+            "DROP TABLE IF EXISTS transactions_fts",
+            """CREATE VIRTUAL TABLE transactions_fts
+                 USING fts5(family, description, category, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')""",
+            """CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN
+                 INSERT INTO transactions_fts (rowid, family, description, category)
+                 VALUES (new.id, new.family_id, new.description, (SELECT name FROM categories WHERE id = new.category_id));
+               END""",
+            """CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN
+                 DELETE FROM transactions_fts WHERE rowid = old.id;
+               END""",
+            """CREATE TRIGGER transactions_fts_update AFTER UPDATE OF family_id, description, category_id ON transactions BEGIN
+                 UPDATE transactions_fts
+                 SET family = new.family_id, description = new.description,
+                     category = (SELECT name FROM categories WHERE id = new.category_id)
+                 WHERE rowid = new.id;
+               END""",
+            """CREATE TRIGGER categories_fts_rename AFTER UPDATE OF name ON categories
+               WHEN new.name IS NOT old.name BEGIN
+                 UPDATE transactions_fts SET category = new.name
+                 WHERE rowid IN (SELECT id FROM transactions WHERE family_id = new.family_id AND category_id = new.id);
+               END""",
+            search.index_transactions,
+        ],
+    ),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    version = get_schema_version(conn)
+    for target, description, steps in MIGRATIONS:
+        if target <= version:
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Migration {target} ({description}) failed: {e}")
+            raise
+        version = target
+    return version
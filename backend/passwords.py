@@ -0,0 +1,52 @@
+import os
+import time
+from eventlet import tpool
+from eventlet.semaphore import Semaphore
+from werkzeug.security import generate_password_hash, check_password_hash
+from .extensions import socketio, PASSWORD_HASH_STATS
+
+PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", "4"))
+
+_slots = Semaphore(PASSWORD_HASH_CONCURRENCY)
+_current_prefix = None
+
+
+def _offload(func, *args):
+    if not _slots.acquire(blocking=False):
+        PASSWORD_HASH_STATS["waiting"] += 1
+        PASSWORD_HASH_STATS["max_waiting"] = max(PASSWORD_HASH_STATS["max_waiting"], PASSWORD_HASH_STATS["waiting"])
+        try:
+            _slots.acquire()
+        finally:
+            PASSWORD_HASH_STATS["waiting"] -= 1
+    PASSWORD_HASH_STATS["active"] += 1
+    started = time.perf_counter()
+    try:
+        if socketio.async_mode == "eventlet":
+            return tpool.execute(func, *args)
+        return func(*args)
+    finally:
+        _slots.release()
+        PASSWORD_HASH_STATS["active"] -= 1
+        PASSWORD_HASH_STATS["completed"] += 1
+        PASSWORD_HASH_STATS["seconds"] += time.perf_counter() - started
+
+
+def hash_password(password: str) -> str:
+    return _offload(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def verify_password(pwhash: str, password: str) -> bool:
+    return _offload(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash: str) -> bool:
+    global _current_prefix
+    if _current_prefix is None:
+        _current_prefix = hash_password("").split("$", 1)[0]
+    return pwhash.split("$", 1)[0] != _current_prefix
+
+
+def password_hash_stats() -> dict:
+    return {**PASSWORD_HASH_STATS, "concurrency": PASSWORD_HASH_CONCURRENCY, "method": PASSWORD_HASH_METHOD}
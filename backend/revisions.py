@@ -0,0 +1,60 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+from flask import request, current_app, make_response
+from .database import query_db
+
+IGNORED_QUERY_ARGS = ("t",)
+
+
+def bump_revision(conn: sqlite3.Connection, family_id: int, *resources: str) -> None:
+    for resource in resources:
+        conn.execute(
+            """INSERT INTO resource_revisions (family_id, resource, revision) VALUES (?, ?, 1)
+            ON CONFLICT(family_id, resource) DO UPDATE SET revision = revision + 1""",
+            (family_id, resource),
+        )
+
+
+def get_revision(family_id: int, resource: str) -> int:
+    row = query_db(
+        "SELECT revision FROM resource_revisions WHERE family_id = ? AND resource = ?",
+        (family_id, resource),
+        one=True,
+    )
+    return row["revision"] if row else 0
+
+
+def family_revisions(conn: sqlite3.Connection, family_id: int) -> dict:
+    return {
+        row["resource"]: row["revision"]
+        for row in conn.execute("SELECT resource, revision FROM resource_revisions WHERE family_id = ?", (family_id,))
+    }
+
+
+def format_etag(family_id: int, resource: str, revision: int, args=()) -> str:
+    etag = f"{resource}-{family_id}-{revision}"
+    if resource == "budgets":
+        etag += "-" + datetime.now(timezone.utc).strftime("%Y%m%d")
+    args = sorted(args)
+    if args:
+        etag += "-" + hashlib.sha1(repr(args).encode()).hexdigest()[:12]
+    return etag
+
+
+def resource_etag(family_id: int, resource: str) -> str:
+    args = [(k, v) for k, v in request.args.items(multi=True) if k not in IGNORED_QUERY_ARGS]
+    return format_etag(family_id, resource, get_revision(family_id, resource), args)
+
+
+def conditional_response(family_id: int, resource: str, build):
+    etag = resource_etag(family_id, resource)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
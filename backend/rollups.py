@@ -0,0 +1,81 @@
+import sqlite3
+
+BUDGET_PERIODS = ("daily", "weekly", "monthly", "yearly")
+
+
+def period_bucket_sql(period: str, moment: str) -> str:
+    return f"""CASE {period}
+        WHEN 'daily' THEN date({moment})
+        WHEN 'weekly' THEN date({moment}, '-6 days', 'weekday 1')
+        WHEN 'yearly' THEN strftime('%Y', {moment})
+        ELSE strftime('%Y-%m', {moment})
+    END"""
+
+
+PERIODS_SQL = " UNION ALL ".join(f"SELECT '{p}' AS period" for p in BUDGET_PERIODS)
+
+RECORD_SPEND_SQL = f"""
+    INSERT INTO budget_spend (family_id, category_id, period, bucket, amount)
+    SELECT t.family_id, t.category_id, p.period, {period_bucket_sql("p.period", "t.date")}, t.amount * ?
+    FROM transactions t, ({PERIODS_SQL}) p
+    WHERE t.id = ? AND t.type = 'expense' AND t.category_id IS NOT NULL
+    ON CONFLICT(family_id, category_id, period, bucket) DO UPDATE SET amount = amount + excluded.amount
+"""
+
+RECORD_SPEND_RANGE_SQL = f"""
+    INSERT INTO budget_spend (family_id, category_id, period, bucket, amount)
+    SELECT t.family_id, t.category_id, p.period, {period_bucket_sql("p.period", "t.date")} AS bucket, SUM(t.amount)
+    FROM transactions t, ({PERIODS_SQL}) p
+    WHERE t.family_id = ? AND t.id > ? AND t.type = 'expense' AND t.category_id IS NOT NULL
+    GROUP BY t.family_id, t.category_id, p.period, bucket
+    ON CONFLICT(family_id, category_id, period, bucket) DO UPDATE SET amount = amount + excluded.amount
+"""
+
+REBUILD_SPEND_SQL = f"""
+    INSERT INTO budget_spend (family_id, category_id, period, bucket, amount)
+    SELECT t.family_id, t.category_id, p.period, {period_bucket_sql("p.period", "t.date")} AS bucket, SUM(t.amount)
+    FROM transactions t, ({PERIODS_SQL}) p
+    WHERE t.type = 'expense' AND t.category_id IS NOT NULL {{scope}}
+    GROUP BY t.family_id, t.category_id, p.period, bucket
+"""
+
+
+BUDGET_STATUS_SQL = f"""
+    SELECT b.id, c.name AS category, b.category_id, b.amount as "limit", b.period, COALESCE(s.amount, 0) as spent
+    FROM budgets b
+    LEFT JOIN categories c ON c.id = b.category_id
+    LEFT JOIN budget_spend s ON s.family_id = b.family_id AND s.category_id = b.category_id
+        AND s.period = COALESCE(b.period, 'monthly')
+        AND s.bucket = {period_bucket_sql("COALESCE(b.period, 'monthly')", "'now'")}
+    WHERE b.family_id = ? {{scope}}
+"""
+
+
+def budget_status(conn: sqlite3.Connection, family_id: int, category_id: int = None) -> list:
+    if category_id is None:
+        rows = conn.execute(BUDGET_STATUS_SQL.format(scope=""), (family_id,))
+    else:
+        rows = conn.execute(BUDGET_STATUS_SQL.format(scope="AND b.category_id = ?"), (family_id, category_id))
+    return [dict(row) for row in rows]
+
+
+def record_spend(conn: sqlite3.Connection, transaction_id: int, sign: int = 1) -> None:
+    conn.execute(RECORD_SPEND_SQL, (sign, transaction_id))
+
+
+def record_spend_since(conn: sqlite3.Connection, family_id: int, after_id: int) -> None:
+    conn.execute(RECORD_SPEND_RANGE_SQL, (family_id, after_id))
+
+
+def rebuild_spend(conn: sqlite3.Connection, family_id: int, category_ids) -> None:
+    for category_id in set(category_ids):
+        conn.execute("DELETE FROM budget_spend WHERE family_id = ? AND category_id = ?", (family_id, category_id))
+        conn.execute(
+            REBUILD_SPEND_SQL.format(scope="AND t.family_id = ? AND t.category_id = ?"),
+            (family_id, category_id),
+        )
+
+
+def rebuild_all_spend(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM budget_spend")
+    conn.execute(REBUILD_SPEND_SQL.format(scope=""))
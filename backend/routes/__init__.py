@@ -6,6 +6,9 @@ from .goals import goals_bp
 from .budgets import budgets_bp
 from .common import common_bp
 from .categories import categories_bp
+from .analytics import analytics_bp
+from .metrics import metrics_bp
+from .bootstrap import bootstrap_bp
 
 
 def register_routes(app):
@@ -17,3 +20,6 @@ def register_routes(app):
     app.register_blueprint(budgets_bp)
     app.register_blueprint(common_bp)
     app.register_blueprint(categories_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(bootstrap_bp)
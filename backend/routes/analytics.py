@@ -0,0 +1,74 @@
+from datetime import date
+from flask import Blueprint, request, jsonify
+from backend.database import get_db
+from backend.analytics import ANALYTICS_PERIODS, analytics_summary, analytics_timeseries
+from backend.revisions import conditional_response
+from backend.utils import login_required, get_user_family_id
+
+analytics_bp = Blueprint("analytics", __name__)
+
+
+def parse_window(params):
+    window = []
+    for key in ("from", "to"):
+        value = params.get(key)
+        try:
+            window.append(date.fromisoformat(value) if value else None)
+        except ValueError:
+            return None, f"Invalid '{key}' date, expected YYYY-MM-DD"
+    start, end = window
+    if start and end and start > end:
+        return None, "'from' must not be after 'to'"
+    return window, None
+
+
+@analytics_bp.route("/api/analytics/summary", methods=["GET"])
+@login_required
+def summary():
+    family_id = get_user_family_id()
+    if not family_id:
+        return jsonify({"error": "No family found"}), 404
+
+    window, error = parse_window(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    return conditional_response(
+        family_id,
+        "transactions",
+        lambda: jsonify(analytics_summary(get_db(), family_id, *window)),
+    )
+
+
+@analytics_bp.route("/api/analytics/timeseries", methods=["GET"])
+@login_required
+def timeseries():
+    family_id = get_user_family_id()
+    if not family_id:
+        return jsonify({"error": "No family found"}), 404
+
+    window, error = parse_window(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    period = request.args.get("period", "monthly")
+    if period not in ANALYTICS_PERIODS:
+        return jsonify({"error": f"Period must be one of {', '.join(ANALYTICS_PERIODS)}"}), 400
+
+    tx_type = request.args.get("type") or None
+    if tx_type and tx_type not in ["income", "expense"]:
+        return jsonify({"error": "Type must be 'income' or 'expense'"}), 400
+
+    user_id = request.args.get("userId")
+    try:
+        user_id = int(user_id) if user_id else None
+    except ValueError:
+        return jsonify({"error": "Invalid userId"}), 400
+
+    category = (request.args.get("category") or "").strip() or None
+
+    def build():
+        points = analytics_timeseries(get_db(), family_id, period, *window, tx_type=tx_type, category=category, user_id=user_id)
+        return jsonify({"period": period, "from": request.args.get("from"), "to": request.args.get("to"), "points": points})
+
+    return conditional_response(family_id, "transactions", build)
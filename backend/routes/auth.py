@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, session
-from werkzeug.security import generate_password_hash, check_password_hash
 from backend.database import execute_db, query_db
+from backend.extensions import PASSWORD_HASH_STATS
+from backend.passwords import hash_password, verify_password, needs_rehash
 from backend.utils import validate_fields
 import sqlite3
 
@@ -30,7 +31,7 @@ def register():
         if len(password) < 6 or len(password) > 128:
                 return jsonify({"error": "Password must be 6-128 characters"}), 400
 
-        hashed_password = generate_password_hash(password)
+        hashed_password = hash_password(password)
 
         try:
                 user_id = execute_db(
@@ -58,7 +59,13 @@ def login():
 
         user = query_db("SELECT id, password FROM users WHERE email = ?", (email,), one=True)
 
-        if user and check_password_hash(user["password"], password):
+        if user and verify_password(user["password"], password):
+                if needs_rehash(user["password"]):
+                        execute_db(
+                                "UPDATE users SET password = ? WHERE id = ? AND password = ?",
+                                (hash_password(password), user["id"], user["password"]),
+                        )
+                        PASSWORD_HASH_STATS["rehashed"] += 1
                 session["user_id"] = user["id"]
                 session["email"] = email
                 return jsonify({"message": "Login successful"}), 200
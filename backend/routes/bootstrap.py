@@ -0,0 +1,101 @@
+import hashlib
+import json
+from flask import Blueprint, request, jsonify, session
+from backend.database import read_snapshot
+from backend.rollups import budget_status
+from backend.revisions import family_revisions, format_etag
+from backend.state import get_state_store
+from backend.utils import login_required, get_current_user
+from backend.routes.user import load_profile
+from backend.routes.family import load_family_members
+from backend.routes.transactions import LISTING_PARAMS, parse_listing, transaction_page
+
+bootstrap_bp = Blueprint("bootstrap", __name__)
+
+BOOTSTRAP_SECTIONS = ("me", "transactions", "budgets", "goals", "categories", "members", "activity")
+
+
+@bootstrap_bp.route("/api/bootstrap", methods=["GET"])
+@login_required
+def bootstrap():
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    sections = request.args.get("sections")
+    wanted = [s.strip() for s in sections.split(",") if s.strip()] if sections else list(BOOTSTRAP_SECTIONS)
+    unknown = [s for s in wanted if s not in BOOTSTRAP_SECTIONS]
+    if unknown:
+        return jsonify({"error": f"Unknown sections: {', '.join(unknown)}"}), 400
+
+    family_id = user["family_id"]
+    page = None
+    if family_id and "transactions" in wanted:
+        page, error = parse_listing(family_id, request.args)
+        if error:
+            return jsonify({"error": error}), 400
+    listing_args = [(k, v) for k, v in request.args.items(multi=True) if k in LISTING_PARAMS]
+    known = parse_etags(request.args.get("etags"))
+
+    data, etags, unchanged = read_snapshot(load_sections, session["user_id"], family_id, wanted, known, page, listing_args)
+
+    if family_id and "activity" in wanted:
+        events = get_state_store().recent_activity(family_id)
+        activity = {
+            "familyId": family_id,
+            "events": events,
+            "next_before": min((e["ts"] for e in events), default=None),
+        }
+        etags["activity"] = content_etag("activity", activity)
+        if known.get("activity") == etags["activity"]:
+            unchanged.append("activity")
+        else:
+            data["activity"] = activity
+
+    response = jsonify({**data, "etags": etags, "unchanged": unchanged})
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def load_sections(conn, user_id, family_id, wanted, known, page, listing_args):
+    data, etags, unchanged = {}, {}, []
+
+    def add(section, etag, build):
+        etags[section] = etag
+        if known.get(section) == etag:
+            unchanged.append(section)
+        else:
+            data[section] = build()
+
+    if "me" in wanted:
+        profile = load_profile(conn, user_id)
+        add("me", content_etag("me", profile), lambda: profile)
+    if not family_id:
+        return data, etags, unchanged
+
+    revisions = family_revisions(conn, family_id)
+    loaders = {
+        "transactions": (listing_args, lambda: transaction_page(conn, *page)),
+        "budgets": ((), lambda: budget_status(conn, family_id)),
+        "goals": ((), lambda: [dict(row) for row in conn.execute("SELECT * FROM goals WHERE family_id = ?", (family_id,))]),
+        "categories": ((), lambda: [dict(row) for row in conn.execute("SELECT * FROM categories WHERE family_id = ?", (family_id,))]),
+        "members": ((), lambda: load_family_members(conn, family_id)),
+    }
+    for section, (args, build) in loaders.items():
+        if section in wanted:
+            add(section, format_etag(family_id, section, revisions.get(section, 0), args), build)
+    return data, etags, unchanged
+
+
+def parse_etags(raw):
+    known = {}
+    for pair in (raw or "").split(","):
+        section, _, etag = pair.partition(":")
+        if etag:
+            known[section.strip()] = etag.strip().strip('"')
+    return known
+
+
+def content_etag(section, value):
+    digest = hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{section}-{digest[:16]}"
@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify, session
-from backend.database import get_db, query_db, execute_db
-from backend.utils import login_required, get_user_family_id
-from backend.socket_events import emit_activity, emit_family_event
+from flask import Blueprint, request, jsonify
+from backend.database import get_db, query_db, unit_of_work
+from backend.categories import ensure_category
+from backend.rollups import budget_status
+from backend.revisions import bump_revision, conditional_response
+from backend.utils import login_required, get_user_family_id, get_current_user
+from backend.socket_events import emit_activity, emit_family_delta
 
 budgets_bp = Blueprint("budgets", __name__)
 
@@ -14,7 +17,7 @@ def handle_budgets():
         return jsonify({"error": "No family found"}), 404
 
     if request.method == "POST":
-        user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+        user = get_current_user()
         if user and user["role"] == "child":
              return jsonify({"error": "Children cannot create budgets"}), 403
 
@@ -40,28 +43,14 @@ def handle_budgets():
         if period not in ["daily", "weekly", "monthly", "yearly"]:
             return jsonify({"error": "Period must be daily, weekly, monthly, or yearly"}), 400
 
-        with get_db() as conn:
-            cat_row = conn.execute(
-                "SELECT id, name FROM categories WHERE family_id = ? AND LOWER(name) = LOWER(?)",
-                (family_id, category),
-            ).fetchone()
-            if not cat_row:
-                default_color = "#FF5722"
-                conn.execute(
-                    "INSERT INTO categories (family_id, name, type, is_default, color) VALUES (?, ?, 'expense', 0, ?)",
-                    (family_id, category, default_color),
-                )
-                conn.commit()
-                cat_row = conn.execute(
-                    "SELECT id, name FROM categories WHERE family_id = ? AND LOWER(name) = LOWER(?)",
-                    (family_id, category),
-                ).fetchone()
-
-            canonical_name = cat_row["name"] if cat_row else category
+        with unit_of_work() as conn:
+            cat_row, created_category = ensure_category(conn, family_id, category)
+            if created_category:
+                bump_revision(conn, family_id, "categories")
 
             existing = conn.execute(
-                "SELECT id FROM budgets WHERE family_id = ? AND category = ?",
-                (family_id, canonical_name),
+                "SELECT id FROM budgets WHERE family_id = ? AND category_id = ?",
+                (family_id, cat_row["id"]),
             ).fetchone()
             if existing:
                 conn.execute(
@@ -70,12 +59,13 @@ def handle_budgets():
                 )
             else:
                 conn.execute(
-                    "INSERT INTO budgets (family_id, category, amount, period) VALUES (?, ?, ?, ?)",
-                    (family_id, canonical_name, amount, period),
+                    "INSERT INTO budgets (family_id, category_id, amount, period) VALUES (?, ?, ?, ?)",
+                    (family_id, cat_row["id"], amount, period),
                 )
-            conn.commit()
+            bump_revision(conn, family_id, "budgets")
+            budgets = budget_status(conn, family_id, cat_row["id"])
 
-        emit_family_event(family_id, "update_budgets")
+        emit_family_delta(family_id, "update_budgets", "updated" if existing else "created", budgets)
         emit_activity(
             family_id,
             "Budget updated",
@@ -84,17 +74,7 @@ def handle_budgets():
         )
         return jsonify({"message": "Budget updated"}), 201
 
-    query = """
-    SELECT b.id, b.category, b.amount as "limit", b.period, COALESCE(SUM(t.amount), 0) as spent
-    FROM budgets b
-    LEFT JOIN transactions t ON t.family_id = b.family_id AND t.category = b.category AND t.type = 'expense'
-    WHERE b.family_id = ?
-    GROUP BY b.id
-    """
-    budgets = query_db(query, (family_id,))
-
-    result = [dict(row) for row in budgets]
-    return jsonify(result)
+    return conditional_response(family_id, "budgets", lambda: jsonify(budget_status(get_db(), family_id)))
 
 
 @budgets_bp.route("/api/budgets/<int:budget_id>", methods=["DELETE"])
@@ -104,17 +84,24 @@ def delete_budget(budget_id):
     if not family_id:
         return jsonify({"error": "No family found"}), 404
 
-    user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+    user = get_current_user()
     if user and user["role"] == "child":
         return jsonify({"error": "Children cannot delete budgets"}), 403
 
-    budget = query_db("SELECT category FROM budgets WHERE id = ? AND family_id = ?", (budget_id, family_id), one=True)
+    budget = query_db(
+        """SELECT c.name AS category FROM budgets b LEFT JOIN categories c ON c.id = b.category_id
+        WHERE b.id = ? AND b.family_id = ?""",
+        (budget_id, family_id),
+        one=True,
+    )
     if not budget:
         return jsonify({"error": "Budget not found"}), 404
 
-    execute_db("DELETE FROM budgets WHERE id = ?", (budget_id,))
+    with unit_of_work() as conn:
+        conn.execute("DELETE FROM budgets WHERE id = ?", (budget_id,))
+        bump_revision(conn, family_id, "budgets")
     
-    emit_family_event(family_id, "update_budgets")
+    emit_family_delta(family_id, "update_budgets", "deleted", [{"id": budget_id}])
     emit_activity(
         family_id,
         "Budget deleted",
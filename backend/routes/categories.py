@@ -1,6 +1,10 @@
-from flask import Blueprint, request, jsonify, session
-from backend.database import execute_db, query_db
-from backend.utils import login_required, get_user_family_id
+from flask import Blueprint, request, jsonify
+from backend.database import query_db, unit_of_work
+from backend.categories import FALLBACK_CATEGORY, ensure_category
+from backend.rollups import rebuild_spend
+from backend.analytics import rebuild_analytics
+from backend.revisions import bump_revision, conditional_response
+from backend.utils import login_required, get_user_family_id, get_current_user
 from backend.socket_events import emit_family_event, emit_activity
 
 categories_bp = Blueprint("categories", __name__)
@@ -14,7 +18,7 @@ def handle_categories():
         return jsonify({"error": "No family found"}), 404
 
     if request.method == "POST":
-        user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+        user = get_current_user()
         if user and user["role"] == "child":
              return jsonify({"error": "Children cannot create categories"}), 403
 
@@ -30,18 +34,23 @@ def handle_categories():
         if len(name) > 50:
             return jsonify({"error": "Name too long"}), 400
 
-        rows = query_db("SELECT id FROM categories WHERE family_id = ? AND name = ?", (family_id, name))
+        rows = query_db("SELECT id FROM categories WHERE family_id = ? AND name = ? COLLATE NOCASE", (family_id, name))
         if rows:
             return jsonify({"error": "Category already exists"}), 400
 
-        execute_db(
-            "INSERT INTO categories (family_id, name, type, color, is_default) VALUES (?, ?, ?, ?, 0)",
-            (family_id, name, type_val, color)
-        )
+        with unit_of_work() as conn:
+            conn.execute(
+                "INSERT INTO categories (family_id, name, type, color, is_default) VALUES (?, ?, ?, ?, 0)",
+                (family_id, name, type_val, color)
+            )
+            bump_revision(conn, family_id, "categories")
         return jsonify({"success": True}), 201
 
-    cats = query_db("SELECT * FROM categories WHERE family_id = ?", (family_id,))
-    return jsonify([dict(row) for row in cats])
+    return conditional_response(
+        family_id,
+        "categories",
+        lambda: jsonify([dict(row) for row in query_db("SELECT * FROM categories WHERE family_id = ?", (family_id,))]),
+    )
 
 
 @categories_bp.route("/api/categories/<int:cat_id>", methods=["PUT", "DELETE"])
@@ -55,7 +64,7 @@ def modify_category(cat_id):
     if not cat:
         return jsonify({"error": "Category not found"}), 404
 
-    user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+    user = get_current_user()
     if user and user["role"] == "child":
          return jsonify({"error": "Children cannot modify categories"}), 403
 
@@ -70,18 +79,22 @@ def modify_category(cat_id):
         updated_type = data.get("type", cat["type"])
 
         if new_name and new_name != cat["name"]:
-            existing = query_db("SELECT id FROM categories WHERE family_id = ? AND name = ?", (family_id, new_name))
+            existing = query_db(
+                "SELECT id FROM categories WHERE family_id = ? AND name = ? COLLATE NOCASE AND id != ?",
+                (family_id, new_name, cat_id),
+            )
             if existing:
                 return jsonify({"error": "Category name already exists"}), 400
 
-            execute_db("UPDATE transactions SET category = ? WHERE family_id = ? AND category = ?", (updated_name, family_id, cat["name"]))
-            execute_db("UPDATE budgets SET category = ? WHERE family_id = ? AND category = ?", (updated_name, family_id, cat["name"]))
+        with unit_of_work() as conn:
+            conn.execute("UPDATE categories SET name = ?, color = ?, type = ? WHERE id = ?",
+                         (updated_name, updated_color, updated_type, cat_id))
 
-        if updated_type and updated_type != cat["type"]:
-            execute_db("UPDATE transactions SET type = ? WHERE family_id = ? AND category = ?", (updated_type, family_id, cat["name"]))
-
-        execute_db("UPDATE categories SET name = ?, color = ?, type = ? WHERE id = ?", 
-                   (updated_name, updated_color, updated_type, cat_id))
+            if updated_type and updated_type != cat["type"]:
+                conn.execute("UPDATE transactions SET type = ? WHERE family_id = ? AND category_id = ?", (updated_type, family_id, cat_id))
+                rebuild_spend(conn, family_id, [cat_id])
+                rebuild_analytics(conn, family_id)
+            bump_revision(conn, family_id, "categories", "transactions", "budgets")
 
         emit_family_event(family_id, "update_categories")
         emit_family_event(family_id, "update_transactions")
@@ -91,8 +104,16 @@ def modify_category(cat_id):
         return jsonify({"success": True})
 
     if request.method == "DELETE":
-        execute_db("UPDATE transactions SET category = 'Others' WHERE family_id = ? AND category = ?", (family_id, cat["name"]))
-        execute_db("UPDATE budgets SET category = 'Others' WHERE family_id = ? AND category = ?", (family_id, cat["name"]))
-        
-        execute_db("DELETE FROM categories WHERE id = ?", (cat_id,))
+        if cat["name"].lower() == FALLBACK_CATEGORY.lower():
+            return jsonify({"error": f"The {FALLBACK_CATEGORY} category cannot be deleted"}), 400
+
+        with unit_of_work() as conn:
+            others, _ = ensure_category(conn, family_id, FALLBACK_CATEGORY)
+            conn.execute("UPDATE transactions SET category_id = ? WHERE family_id = ? AND category_id = ?", (others["id"], family_id, cat_id))
+            conn.execute("UPDATE budgets SET category_id = ? WHERE family_id = ? AND category_id = ?", (others["id"], family_id, cat_id))
+
+            conn.execute("DELETE FROM categories WHERE id = ?", (cat_id,))
+            rebuild_spend(conn, family_id, [cat_id, others["id"]])
+            rebuild_analytics(conn, family_id)
+            bump_revision(conn, family_id, "categories", "transactions", "budgets")
         return jsonify({"success": True})
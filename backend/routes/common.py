@@ -1,15 +1,62 @@
+import hashlib
+import json
 import os
-from flask import Blueprint, send_from_directory, current_app
+from flask import Blueprint, request, jsonify
+from backend.static_assets import get_static_manifest, asset_response, encoded_response, compress_variants
 
 common_bp = Blueprint("common", __name__)
 
+COMPONENT_DIR = "components/"
+BUNDLE_CACHE_SIZE = 32
+
+_bundles = {}
+
+
+def spa_index():
+    asset = get_static_manifest().get("index.html")
+    if asset is None:
+        return jsonify({"error": "Not found"}), 404
+    return asset_response(asset)
+
+
 @common_bp.route("/")
 def index():
-    return send_from_directory(current_app.static_folder, "index.html")
+    return spa_index()
+
+
+@common_bp.route("/api/static/manifest", methods=["GET"])
+def static_manifest():
+    return jsonify(get_static_manifest().fingerprints())
+
+
+@common_bp.route("/api/components", methods=["GET"])
+def component_bundle():
+    manifest = get_static_manifest()
+    names = [name.strip() for name in request.args.get("names", "").split(",") if name.strip()]
+    if not names:
+        names = sorted(path[len(COMPONENT_DIR):-len(".html")] for path in manifest.assets
+                       if path.startswith(COMPONENT_DIR) and path.endswith(".html"))
+    assets = {name: manifest.get(f"{COMPONENT_DIR}{name}.html") for name in names}
+    missing = [name for name, asset in assets.items() if asset is None]
+    if missing:
+        return jsonify({"error": f"Unknown components: {', '.join(missing)}"}), 404
+
+    digest = hashlib.sha256("".join(f"{name}:{asset.digest};" for name, asset in assets.items()).encode()).hexdigest()[:16]
+    variants = _bundles.get(digest)
+    if variants is None:
+        payload = json.dumps({name: asset.data.decode("utf-8") for name, asset in assets.items()}).encode()
+        variants = compress_variants(payload, level=6)
+        if len(_bundles) >= BUNDLE_CACHE_SIZE:
+            _bundles.pop(next(iter(_bundles)))
+        _bundles[digest] = variants
+    return encoded_response(variants, digest, "application/json", "no-cache")
+
 
 @common_bp.route("/<path:path>")
 def serve_static(path):
-    file_path = os.path.join(current_app.static_folder, path)
-    if os.path.exists(file_path):
-        return send_from_directory(current_app.static_folder, path)
-    return send_from_directory(current_app.static_folder, "index.html")
+    asset = get_static_manifest().get(path)
+    if asset is not None:
+        return asset_response(asset)
+    if os.path.splitext(path)[1]:
+        return jsonify({"error": "Not found"}), 404
+    return spa_index()
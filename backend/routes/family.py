@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify, session
-from werkzeug.security import check_password_hash
-from backend.database import query_db, execute_db, get_db
-from backend.utils import login_required, get_user_family_id, generate_invite_code
+from backend.database import query_db, get_db, unit_of_work
+from backend.passwords import verify_password
+from backend.utils import login_required, get_user_family_id, generate_invite_code, get_current_user, get_user_display, invalidate_user, invalidate_family
 from backend.socket_events import emit_family_event, emit_activity
-from backend.extensions import ACTIVITY_BUFFER
+from backend.revisions import bump_revision, conditional_response
+from backend.activity import ACTIVITY_BUFFER_SIZE, flush_activity, load_activity
+from backend.state import get_state_store
+from backend.cache import cached, invalidate
 
 family_bp = Blueprint("family", __name__)
 
@@ -23,9 +26,13 @@ def handle_families():
             return jsonify({"error": "Family name must be 1-200 characters"}), 400
 
         invite_code = generate_invite_code()
+        previous_family_id = get_user_family_id()
         
-        with get_db() as conn:
-            family_id = execute_db("INSERT INTO families (name, created_by, invite_code) VALUES (?, ?, ?)", (name, session["user_id"], invite_code))
+        with unit_of_work() as conn:
+            family_id = conn.execute(
+                "INSERT INTO families (name, created_by, invite_code) VALUES (?, ?, ?)",
+                (name, session["user_id"], invite_code),
+            ).lastrowid
             conn.execute("UPDATE users SET family_id = ?, role = 'admin' WHERE id = ?", (family_id, session["user_id"]))
             
             default_categories = [
@@ -40,11 +47,16 @@ def handle_families():
                 ("Investment", "income", "#009688")
             ]
             
-            for name, cat_type, color in default_categories:
-                 conn.execute("INSERT INTO categories (family_id, name, type, color, is_default) VALUES (?, ?, ?, ?, 1)", 
-                              (family_id, name, cat_type, color))
-
-            conn.commit()
+            conn.executemany(
+                "INSERT INTO categories (family_id, name, type, color, is_default) VALUES (?, ?, ?, ?, 1)",
+                [(family_id, cat_name, cat_type, color) for cat_name, cat_type, color in default_categories],
+            )
+            if previous_family_id:
+                bump_revision(conn, previous_family_id, "members", "transactions")
+        invalidate_user(session["user_id"])
+        if previous_family_id:
+            invalidate("members", previous_family_id)
+            emit_family_event(previous_family_id, "update_members")
 
         emit_activity(family_id, "Family created", f"{name} created", category="family")
         return jsonify({"message": "Family created", "familyId": family_id, "inviteCode": invite_code}), 201
@@ -60,7 +72,7 @@ def update_family():
     if not family_id:
         return jsonify({"error": "No family found"}), 404
 
-    user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+    user = get_current_user()
     if not user or user["role"] != "admin":
         return jsonify({"error": "Unauthorized"}), 403
 
@@ -73,7 +85,10 @@ def update_family():
     if not name or len(name) > 200:
         return jsonify({"error": "Family name must be 1-200 characters"}), 400
 
-    execute_db("UPDATE families SET name = ? WHERE id = ?", (name, family_id))
+    with unit_of_work() as conn:
+        conn.execute("UPDATE families SET name = ? WHERE id = ?", (name, family_id))
+        bump_revision(conn, family_id, "members")
+    invalidate_family(family_id)
     
     emit_family_event(family_id, "update_family")
     emit_activity(family_id, "Family updated", f"Family name changed to {name}", category="family")
@@ -92,18 +107,23 @@ def join_family():
     if len(code) != 6 or not code.isalnum():
         return jsonify({"error": "Invalid invite code format"}), 400
 
-    with get_db() as conn:
+    previous_family_id = get_user_family_id()
+    with unit_of_work() as conn:
         fam = conn.execute("SELECT id, color FROM families WHERE invite_code = ?", (code,)).fetchone()
         if not fam:
             return jsonify({"error": "Invalid invite code"}), 404
         conn.execute("UPDATE users SET family_id = ? WHERE id = ?", (fam["id"], session["user_id"]))
-        conn.commit()
+        bump_revision(conn, fam["id"], "members")
+        if previous_family_id and previous_family_id != fam["id"]:
+            bump_revision(conn, previous_family_id, "members", "transactions")
+    invalidate_user(session["user_id"])
+    invalidate("members", *{fam["id"], previous_family_id} - {None})
 
     emit_family_event(fam["id"], "update_members")
+    if previous_family_id and previous_family_id != fam["id"]:
+        emit_family_event(previous_family_id, "update_members")
     
-    user_info = query_db("SELECT first_name, last_name, role FROM users WHERE id = ?", (session["user_id"],), one=True)
-    user_name = f"{user_info['first_name'] or ''} {user_info['last_name'] or ''}".strip() if user_info else "Member"
-    user_role = user_info["role"] if user_info else ""
+    user_name, user_role = get_user_display()
     
     emit_activity(fam["id"], "Member joined", f"Joined the family", category="members", user_name=user_name, user_role=user_role)
     return jsonify({"message": "Joined family"}), 200
@@ -116,22 +136,28 @@ def get_family_members():
     if not family_id:
         return jsonify({"error": "No family found"}), 404
 
-    family = query_db("SELECT invite_code, color FROM families WHERE id = ?", (family_id,), one=True)
+    return conditional_response(family_id, "members", lambda: jsonify(list_family_members(family_id)))
+
+
+def list_family_members(family_id):
+    return cached("members", family_id, lambda: load_family_members(get_db(), family_id))
+
+
+def load_family_members(conn, family_id):
+    family = conn.execute("SELECT invite_code, color FROM families WHERE id = ?", (family_id,)).fetchone()
     members = [
         dict(row)
-        for row in query_db(
+        for row in conn.execute(
             "SELECT id, first_name, last_name, email, role FROM users WHERE family_id = ?",
             (family_id,),
         )
     ]
 
-    return jsonify(
-        {
-            "invite_code": family["invite_code"] if family else None,
-            "family_color": family["color"] if family else None,
-            "members": members,
-        }
-    )
+    return {
+        "invite_code": family["invite_code"] if family else None,
+        "family_color": family["color"] if family else None,
+        "members": members,
+    }
 
 
 @family_bp.route("/api/activity", methods=["GET"])
@@ -142,8 +168,20 @@ def get_activity_history():
     if not family_id:
         return jsonify({"error": "No family found"}), 404
 
-    events = ACTIVITY_BUFFER.get(family_id, [])
-    return jsonify({"familyId": family_id, "events": events})
+    before = request.args.get("before")
+    if before is None:
+        events = get_state_store().recent_activity(family_id)
+    else:
+        try:
+            before = int(before)
+            limit = min(max(int(request.args.get("limit", ACTIVITY_BUFFER_SIZE)), 1), 200)
+        except ValueError:
+            return jsonify({"error": "Invalid pagination parameters"}), 400
+        flush_activity()
+        events = load_activity(family_id, before=before, limit=limit)
+
+    next_before = min((e["ts"] for e in events), default=None)
+    return jsonify({"familyId": family_id, "events": events, "next_before": next_before})
 
 
 @family_bp.route("/api/family/members/<int:member_id>", methods=["DELETE"])
@@ -152,7 +190,7 @@ def remove_member(member_id):
     if member_id == session["user_id"]:
         return jsonify({"error": "Cannot remove yourself"}), 400
 
-    requester = query_db("SELECT family_id, role FROM users WHERE id = ?", (session["user_id"],), one=True)
+    requester = get_current_user()
     if not requester or requester["role"] != "admin":
         return jsonify({"error": "Unauthorized"}), 403
 
@@ -168,7 +206,11 @@ def remove_member(member_id):
     if target["role"] == "admin":
         return jsonify({"error": "Cannot remove an admin"}), 403
 
-    execute_db("UPDATE users SET family_id = NULL, role = 'child' WHERE id = ?", (member_id,))
+    with unit_of_work() as conn:
+        conn.execute("UPDATE users SET family_id = NULL, role = 'child' WHERE id = ?", (member_id,))
+        bump_revision(conn, family_id, "members", "transactions")
+    invalidate_user(member_id)
+    invalidate("members", family_id)
 
     emit_family_event(family_id, "update_members")
     removed_label = target["email"] or ((target["first_name"] or "") + " " + (target["last_name"] or ""))
@@ -189,7 +231,7 @@ def assign_role():
     if str(target_user_id) == str(session["user_id"]) and new_role != "admin":
         return jsonify({"error": "Cannot remove your own admin role"}), 400
 
-    requester = query_db("SELECT family_id, role FROM users WHERE id = ?", (session["user_id"],), one=True)
+    requester = get_current_user()
     if not requester or requester["role"] != "admin":
         return jsonify({"error": "Unauthorized - Admin only"}), 403
 
@@ -203,7 +245,11 @@ def assign_role():
     if not target or target["family_id"] != family_id:
         return jsonify({"error": "User not in family"}), 404
 
-    execute_db("UPDATE users SET role = ? WHERE id = ?", (new_role, target_user_id))
+    with unit_of_work() as conn:
+        conn.execute("UPDATE users SET role = ? WHERE id = ?", (new_role, target_user_id))
+        bump_revision(conn, family_id, "members", "transactions")
+    invalidate_user(target_user_id)
+    invalidate("members", family_id)
     target_label = target["email"] or ((target["first_name"] or "") + " " + (target["last_name"] or ""))
     emit_family_event(family_id, "update_roles")
     emit_activity(family_id, "Role updated", f"{target_label} is now {new_role}", category="roles")
@@ -226,12 +272,13 @@ def delete_family_route():
     if not password:
          return jsonify({"error": "Password required"}), 400
     
-    if not check_password_hash(requester["password"], password):
+    if not verify_password(requester["password"], password):
          return jsonify({"error": "Invalid password"}), 403
 
-    with get_db() as conn:
+    member_ids = [row["id"] for row in query_db("SELECT id FROM users WHERE family_id = ?", (family_id,))]
+    with unit_of_work() as conn:
         conn.execute("UPDATE users SET family_id = NULL, role = 'child' WHERE family_id = ?", (family_id,))
         conn.execute("DELETE FROM families WHERE id = ?", (family_id,))
-        conn.commit()
+    invalidate_family(family_id, member_ids)
 
     return jsonify({"message": "Family deleted"}), 200
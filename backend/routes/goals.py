@@ -1,10 +1,15 @@
 from flask import Blueprint, request, jsonify, session
-from backend.database import get_db, execute_db, query_db
-from backend.utils import login_required, get_user_family_id
-from backend.socket_events import emit_activity, emit_family_event
+from backend.database import query_db, get_db, unit_of_work
+from backend.goals import GOAL_PERIODS, adjust_goal_amount, record_opening_balance, goal_contributions, goal_progress
+from backend.revisions import bump_revision, conditional_response
+from backend.utils import login_required, get_user_family_id, get_current_user
+from backend.socket_events import emit_activity, emit_family_delta
 
 goals_bp = Blueprint("goals", __name__)
 
+DEFAULT_CONTRIBUTIONS_PAGE = 50
+MAX_CONTRIBUTIONS_PAGE = 500
+
 
 @goals_bp.route("/api/goals", methods=["GET", "POST"])
 @login_required
@@ -14,7 +19,7 @@ def handle_goals():
                 return jsonify({"error": "No family found"}), 404
 
         if request.method == "POST":
-                user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+                user = get_current_user()
                 if user and user["role"] == "child":
                         return jsonify({"error": "Children cannot create goals"}), 403
 
@@ -45,12 +50,16 @@ def handle_goals():
                 except (ValueError, TypeError):
                         current_amount = 0
 
-                execute_db(
-                        "INSERT INTO goals (family_id, name, target_amount, current_amount, deadline) VALUES (?, ?, ?, ?, ?)",
-                        (family_id, name, target_amount, current_amount, deadline),
-                )
+                with unit_of_work() as conn:
+                        cur = conn.execute(
+                                "INSERT INTO goals (family_id, name, target_amount, current_amount, deadline) VALUES (?, ?, ?, ?, ?)",
+                                (family_id, name, target_amount, current_amount, deadline),
+                        )
+                        goal = conn.execute("SELECT * FROM goals WHERE id = ?", (cur.lastrowid,)).fetchone()
+                        record_opening_balance(conn, goal, session.get("user_id"))
+                        bump_revision(conn, family_id, "goals")
 
-                emit_family_event(family_id, "update_goals")
+                emit_family_delta(family_id, "update_goals", "created", [goal])
                 emit_activity(
                         family_id,
                         "Goal created",
@@ -59,8 +68,11 @@ def handle_goals():
                 )
                 return jsonify({"message": "Goal added"}), 201
 
-        goals = query_db("SELECT * FROM goals WHERE family_id = ?", (family_id,))
-        return jsonify([dict(row) for row in goals])
+        return conditional_response(
+                family_id,
+                "goals",
+                lambda: jsonify([dict(row) for row in query_db("SELECT * FROM goals WHERE family_id = ?", (family_id,))]),
+        )
 
 
 @goals_bp.route("/api/goals/<int:goal_id>/adjust", methods=["POST"])
@@ -86,37 +98,81 @@ def adjust_goal(goal_id):
         except (ValueError, TypeError):
                 return jsonify({"error": "Invalid amount format"}), 400
 
-        user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+        user = get_current_user()
         if user and user["role"] == "child":
                 return jsonify({"error": "Children cannot modify goals"}), 403
 
-        with get_db() as conn:
-                family_id = get_user_family_id()
-                if not family_id:
-                        return jsonify({"error": "No family found"}), 404
+        family_id = get_user_family_id()
+        if not family_id:
+                return jsonify({"error": "No family found"}), 404
 
-                goal = conn.execute(
-                        "SELECT * FROM goals WHERE id = ? AND family_id = ?", (goal_id, family_id)
-                ).fetchone()
+        delta = amount if action == "add" else -amount
+        with unit_of_work() as conn:
+                goal, applied = adjust_goal_amount(conn, goal_id, family_id, session.get("user_id"), delta)
                 if not goal:
                         return jsonify({"error": "Goal not found"}), 404
+                bump_revision(conn, family_id, "goals")
 
-                current_amount = goal["current_amount"] or 0
-                target_amount = goal["target_amount"] or 0
-                delta = amount if action == "add" else -amount
-                new_amount = max(0, min(current_amount + delta, target_amount))
-
-                conn.execute("UPDATE goals SET current_amount = ? WHERE id = ?", (new_amount, goal_id))
-                conn.commit()
-
-        emit_family_event(family_id, "update_goals")
+        emit_family_delta(family_id, "update_goals", "updated", [goal])
         emit_activity(
                 family_id,
                 "Goal updated",
                 f"{goal['name']} adjusted by {amount} ({action})",
                 category="goals",
         )
-        return jsonify({"message": "Goal updated", "goalId": goal_id, "currentAmount": new_amount}), 200
+        return jsonify({
+                "message": "Goal updated",
+                "goalId": goal_id,
+                "currentAmount": goal["current_amount"],
+                "applied": applied,
+        }), 200
+
+
+@goals_bp.route("/api/goals/<int:goal_id>/contributions", methods=["GET"])
+@login_required
+def list_goal_contributions(goal_id):
+        family_id = get_user_family_id()
+        if not family_id:
+                return jsonify({"error": "No family found"}), 404
+
+        try:
+                limit = min(max(int(request.args.get("limit", DEFAULT_CONTRIBUTIONS_PAGE)), 1), MAX_CONTRIBUTIONS_PAGE)
+                before = int(request.args["cursor"]) if request.args.get("cursor") else None
+                member_id = int(request.args["userId"]) if request.args.get("userId") else None
+        except ValueError:
+                return jsonify({"error": "Invalid limit, cursor or userId"}), 400
+
+        def build():
+                conn = get_db()
+                if not conn.execute("SELECT 1 FROM goals WHERE id = ? AND family_id = ?", (goal_id, family_id)).fetchone():
+                        return jsonify({"error": "Goal not found"}), 404
+                rows = goal_contributions(conn, goal_id, limit + 1, before, member_id)
+                items = rows[:limit]
+                next_cursor = str(items[-1]["id"]) if len(rows) > limit else None
+                return jsonify({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+        return conditional_response(family_id, "goals", build)
+
+
+@goals_bp.route("/api/goals/<int:goal_id>/progress", methods=["GET"])
+@login_required
+def get_goal_progress(goal_id):
+        family_id = get_user_family_id()
+        if not family_id:
+                return jsonify({"error": "No family found"}), 404
+
+        period = request.args.get("period", "monthly")
+        if period not in GOAL_PERIODS:
+                return jsonify({"error": f"Period must be one of {', '.join(GOAL_PERIODS)}"}), 400
+
+        def build():
+                conn = get_db()
+                goal = conn.execute("SELECT * FROM goals WHERE id = ? AND family_id = ?", (goal_id, family_id)).fetchone()
+                if not goal:
+                        return jsonify({"error": "Goal not found"}), 404
+                return jsonify({"goal": dict(goal), **goal_progress(conn, goal_id, period)})
+
+        return conditional_response(family_id, "goals", build)
 
 
 @goals_bp.route("/api/goals/<int:goal_id>", methods=["DELETE"])
@@ -126,7 +182,7 @@ def delete_goal(goal_id):
     if not family_id:
         return jsonify({"error": "No family found"}), 404
 
-    user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
+    user = get_current_user()
     if user and user["role"] == "child":
         return jsonify({"error": "Children cannot delete goals"}), 403
 
@@ -134,9 +190,12 @@ def delete_goal(goal_id):
     if not goal:
         return jsonify({"error": "Goal not found"}), 404
 
-    execute_db("DELETE FROM goals WHERE id = ?", (goal_id,))
+    with unit_of_work() as conn:
+        conn.execute("DELETE FROM goal_contributions WHERE goal_id = ?", (goal_id,))
+        conn.execute("DELETE FROM goals WHERE id = ?", (goal_id,))
+        bump_revision(conn, family_id, "goals")
     
-    emit_family_event(family_id, "update_goals")
+    emit_family_delta(family_id, "update_goals", "deleted", [{"id": goal_id}])
     emit_activity(
         family_id,
         "Goal deleted",
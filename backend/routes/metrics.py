@@ -0,0 +1,25 @@
+import hmac
+from flask import Blueprint, request, jsonify, current_app
+from backend.cache import cache_stats
+from backend.database import executor
+from backend.metrics import METRICS_TOKEN, render_metrics
+from backend.passwords import password_hash_stats
+from backend.socket_events import family_sync_stats
+
+metrics_bp = Blueprint("metrics", __name__)
+
+STATS_SOURCES = (
+    ("db_executor", executor.stats),
+    ("family_sync", family_sync_stats),
+    ("password_hash", password_hash_stats),
+    ("cache", cache_stats),
+)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    if METRICS_TOKEN:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, METRICS_TOKEN):
+            return jsonify({"error": "Not authenticated"}), 401
+    return current_app.response_class(render_metrics(STATS_SOURCES), mimetype="text/plain; version=0.0.4")
@@ -1,10 +1,46 @@
-from flask import Blueprint, request, jsonify, session
-from backend.database import execute_db, query_db, get_db
-from backend.utils import login_required, get_user_family_id
-from backend.socket_events import emit_activity, emit_family_event
+import base64
+import csv
+import json
+import sqlite3
+from datetime import date
+from flask import Blueprint, Response, request, jsonify, session
+from backend.database import query_db, get_db, stream_db, unit_of_work
+from backend.categories import FALLBACK_CATEGORY, CATEGORY_COLORS, find_category, ensure_category, category_ids
+from backend.rollups import record_spend, record_spend_since, budget_status
+from backend.analytics import record_analytics, record_analytics_since
+from backend.search import AFTER_CURSOR_SQL, fts_query, search_transactions
+from backend.scheduler import RECURRENCES, next_occurrence, parse_due_date, utc_now
+from backend.exporters import EXPORT_FORMATS, EXPORT_MIMETYPES, export_chunks
+from backend.importers import IMPORT_FORMATS, ImportRowError, detect_format, iter_import_rows
+from backend.revisions import bump_revision, conditional_response
+from backend.utils import login_required, get_user_family_id, get_current_user, get_user_display
+from backend.socket_events import emit_activity, emit_family_delta, emit_family_event
 
 transactions_bp = Blueprint("transactions", __name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+LISTING_PARAMS = ("limit", "cursor", "type", "category", "userId", "from", "to", "minAmount", "maxAmount")
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ERRORS = 20
+EXPORT_BATCH_SIZE = 500
+TRANSACTION_ROW_SQL = """
+        SELECT t.*, c.name AS category, u.first_name, u.role
+        FROM transactions t
+        JOIN users u ON t.user_id = u.id
+        LEFT JOIN categories c ON c.id = t.category_id
+        WHERE t.id = ?
+"""
+EXPORT_SQL = """
+        SELECT t.id, t.date, t.type, t.amount, c.name AS category, t.description,
+                u.first_name AS member, u.role, t.recurrence
+        FROM transactions t
+        JOIN users u ON t.user_id = u.id
+        LEFT JOIN categories c ON c.id = t.category_id
+        WHERE {where}
+        ORDER BY t.date DESC, t.id DESC
+"""
+
 
 @transactions_bp.route("/api/transactions", methods=["GET", "POST"])
 @login_required
@@ -40,62 +76,58 @@ def handle_transactions():
                 if tx_type not in ["income", "expense"]:
                         return jsonify({"error": "Type must be 'income' or 'expense'"}), 400
 
+                if is_recurring:
+                        recurrence = recurrence if recurrence in RECURRENCES else "monthly"
+                        due = parse_due_date(next_due_date) if next_due_date else None
+                        next_due_date = (due or next_occurrence(utc_now().date(), recurrence)).isoformat()
+
                 category = str(category).strip() if category else "Others"
                 if len(category) > 100:
                         category = category[:100]
 
-                with get_db() as conn:
-                        cat_row = conn.execute(
-                                "SELECT id, name FROM categories WHERE family_id = ? AND LOWER(name) = LOWER(?)",
-                                (family_id, category),
-                        ).fetchone()
+                with unit_of_work() as conn:
+                        cat_row = find_category(conn, family_id, category)
+                        created_category = False
                         if not cat_row:
-                                user = query_db("SELECT role FROM users WHERE id = ?", (session["user_id"],), one=True)
-                                if user and user.get("role") == "child":
-                                        others = conn.execute(
-                                                "SELECT name FROM categories WHERE family_id = ? AND LOWER(name) = LOWER(?)",
-                                                (family_id, "Others"),
-                                        ).fetchone()
-                                        category = others["name"] if others else "Others"
+                                user = get_current_user()
+                                if user and user["role"] == "child":
+                                        cat_row, created_category = ensure_category(conn, family_id, FALLBACK_CATEGORY)
                                 else:
                                         cat_type = "income" if tx_type == "income" else "expense"
-                                        default_color = "#4CAF50" if cat_type == "income" else "#FF5722"
-                                        conn.execute(
-                                                "INSERT INTO categories (family_id, name, type, is_default, color) VALUES (?, ?, ?, 0, ?)",
-                                                (family_id, category, cat_type, default_color),
-                                        )
-                                        conn.commit()
-                                        cat_row = conn.execute(
-                                                "SELECT id, name FROM categories WHERE family_id = ? AND LOWER(name) = LOWER(?)",
-                                                (family_id, category),
-                                        ).fetchone()
-                        category = cat_row["name"] if cat_row else category
-
-                execute_db(
-                        """
-                        INSERT INTO transactions
-                        (user_id, family_id, amount, description, type, category, is_recurring, recurrence, next_due_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                                session["user_id"],
-                                family_id,
-                                amount,
-                                description,
-                                tx_type,
-                                category,
-                                is_recurring,
-                                recurrence,
-                                next_due_date,
-                        ),
-                )
+                                        cat_row, created_category = ensure_category(conn, family_id, category, cat_type)
 
-                emit_family_event(family_id, "update_transactions")
-                emit_family_event(family_id, "update_budgets")
+                        cur = conn.execute(
+                                """
+                                INSERT INTO transactions
+                                (user_id, family_id, amount, description, type, category_id, is_recurring, recurrence, next_due_date)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                """,
+                                (
+                                        session["user_id"],
+                                        family_id,
+                                        amount,
+                                        description,
+                                        tx_type,
+                                        cat_row["id"],
+                                        is_recurring,
+                                        recurrence,
+                                        next_due_date,
+                                ),
+                        )
+                        record_spend(conn, cur.lastrowid)
+                        record_analytics(conn, cur.lastrowid)
+                        bump_revision(conn, family_id, "transactions", "budgets")
+                        if created_category:
+                                bump_revision(conn, family_id, "categories")
 
-                user_info = query_db("SELECT first_name, last_name, role FROM users WHERE id = ?", (session["user_id"],), one=True)
-                user_name = f"{user_info['first_name'] or ''} {user_info['last_name'] or ''}".strip() if user_info else "Member"
-                user_role = user_info["role"] if user_info else ""
+                        created = conn.execute(TRANSACTION_ROW_SQL, (cur.lastrowid,)).fetchone()
+                        budgets = budget_status(conn, family_id, cat_row["id"])
+
+                emit_family_delta(family_id, "update_transactions", "created", [created])
+                if budgets:
+                        emit_family_delta(family_id, "update_budgets", "updated", budgets)
+
+                user_name, user_role = get_user_display()
 
                 emit_activity(
                         family_id,
@@ -107,17 +139,204 @@ def handle_transactions():
                 )
                 return jsonify({"message": "Transaction added"}), 201
 
-        transactions = query_db(
-                """
-                SELECT t.*, u.first_name, u.role
+        return conditional_response(family_id, "transactions", lambda: list_transactions(family_id))
+
+
+def list_transactions(family_id):
+        if not any(key in request.args for key in LISTING_PARAMS):
+                transactions = query_db(
+                        """
+                        SELECT t.*, c.name AS category, u.first_name, u.role
+                        FROM transactions t
+                        JOIN users u ON t.user_id = u.id
+                        LEFT JOIN categories c ON c.id = t.category_id
+                        WHERE t.family_id = ?
+                        ORDER BY t.date DESC, t.id DESC
+                        """,
+                        (family_id,),
+                )
+                return jsonify([dict(row) for row in transactions])
+
+        page, error = parse_listing(family_id, request.args)
+        if error:
+                return jsonify({"error": error}), 400
+        return jsonify(transaction_page(get_db(), *page))
+
+
+def parse_listing(family_id, params):
+        try:
+                limit = min(max(int(params.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+                return None, "Invalid limit"
+
+        where, args = build_transaction_filters(family_id, params)
+        if where is None:
+                return None, args
+
+        cursor = params.get("cursor")
+        if cursor:
+                position = decode_cursor(cursor)
+                if not position:
+                        return None, "Invalid cursor"
+                where.append("(t.date, t.id) < (?, ?)")
+                args.extend(position)
+        return (where, args, limit), None
+
+
+def transaction_page(conn, where, args, limit):
+        rows = conn.execute(
+                f"""
+                SELECT t.*, c.name AS category, u.first_name, u.role
                 FROM transactions t
                 JOIN users u ON t.user_id = u.id
-                WHERE t.family_id = ?
-                ORDER BY t.date DESC
+                LEFT JOIN categories c ON c.id = t.category_id
+                WHERE {" AND ".join(where)}
+                ORDER BY t.date DESC, t.id DESC
+                LIMIT ?
                 """,
-                (family_id,),
+                (*args, limit + 1),
+        ).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+def encode_cursor(row):
+        raw = json.dumps([row["date"], row["id"]]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+        try:
+                padded = cursor + "=" * (-len(cursor) % 4)
+                tx_date, tx_id = json.loads(base64.urlsafe_b64decode(padded))
+                return [str(tx_date), int(tx_id)]
+        except (ValueError, TypeError):
+                return None
+
+
+def build_transaction_filters(family_id, params):
+        where, args = ["t.family_id = ?"], [family_id]
+
+        tx_type = params.get("type")
+        if tx_type:
+                if tx_type not in ["income", "expense"]:
+                        return None, "Type must be 'income' or 'expense'"
+                where.append("t.type = ?")
+                args.append(tx_type)
+
+        category = params.get("category")
+        if category:
+                where.append("t.category_id = (SELECT id FROM categories WHERE family_id = ? AND name = ? COLLATE NOCASE)")
+                args.extend((family_id, category.strip()))
+
+        user_id = params.get("userId")
+        if user_id:
+                try:
+                        args.append(int(user_id))
+                except ValueError:
+                        return None, "Invalid userId"
+                where.append("t.user_id = ?")
+
+        for key, clause in (("from", "t.date >= ?"), ("to", "t.date < date(?, '+1 day')")):
+                value = params.get(key)
+                if not value:
+                        continue
+                try:
+                        args.append(date.fromisoformat(value).isoformat())
+                except ValueError:
+                        return None, f"Invalid '{key}' date, expected YYYY-MM-DD"
+                where.append(clause)
+
+        for key, clause in (("minAmount", "t.amount >= ?"), ("maxAmount", "t.amount <= ?")):
+                value = params.get(key)
+                if not value:
+                        continue
+                try:
+                        args.append(float(value))
+                except ValueError:
+                        return None, f"Invalid '{key}', expected a number"
+                where.append(clause)
+
+        return where, args
+
+
+@transactions_bp.route("/api/transactions/search", methods=["GET"])
+@login_required
+def search_transactions_route():
+        family_id = get_user_family_id()
+        if not family_id:
+                return jsonify({"error": "No family found"}), 404
+
+        match = fts_query(request.args.get("q"), family_id)
+        if match is None:
+                return jsonify({"error": "Search query is required"}), 400
+
+        try:
+                limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+                return jsonify({"error": "Invalid limit"}), 400
+
+        where, args = build_transaction_filters(family_id, request.args)
+        if where is None:
+                return jsonify({"error": args}), 400
+
+        cursor = request.args.get("cursor")
+        if cursor:
+                position = decode_search_cursor(cursor)
+                if not position:
+                        return jsonify({"error": "Invalid cursor"}), 400
+                score, tx_id = position
+                where.append(AFTER_CURSOR_SQL)
+                args.extend((match, tx_id, score, tx_id))
+
+        def build():
+                rows = search_transactions(get_db(), match, where, args, limit + 1)
+                items = [dict(row) for row in rows[:limit]]
+                next_cursor = encode_search_cursor(items[-1]) if len(rows) > limit else None
+                for item in items:
+                        item.pop("score")
+                return jsonify({"items": items, "next_cursor": next_cursor, "limit": limit})
+
+        return conditional_response(family_id, "transactions", build)
+
+
+def encode_search_cursor(row):
+        raw = json.dumps([row["score"], row["id"]]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor):
+        try:
+                padded = cursor + "=" * (-len(cursor) % 4)
+                score, tx_id = json.loads(base64.urlsafe_b64decode(padded))
+                return [float(score), int(tx_id)]
+        except (ValueError, TypeError):
+                return None
+
+
+@transactions_bp.route("/api/transactions/export", methods=["GET"])
+@login_required
+def export_transactions():
+        family_id = get_user_family_id()
+        if not family_id:
+                return jsonify({"error": "No family found"}), 404
+
+        fmt = (request.args.get("format") or "csv").lower()
+        if fmt not in EXPORT_FORMATS:
+                return jsonify({"error": f"Format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+        where, args = build_transaction_filters(family_id, request.args)
+        if where is None:
+                return jsonify({"error": args}), 400
+
+        batches = stream_db(EXPORT_SQL.format(where=" AND ".join(where)), tuple(args), EXPORT_BATCH_SIZE)
+        filename = f"transactions-{utc_now().date().isoformat()}.{fmt}"
+        return Response(
+                export_chunks(batches, fmt),
+                mimetype=EXPORT_MIMETYPES[fmt],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Accel-Buffering": "no"},
         )
-        return jsonify([dict(row) for row in transactions])
 
 
 @transactions_bp.route("/api/transactions/<int:transaction_id>", methods=["DELETE"])
@@ -135,8 +354,109 @@ def delete_transaction(transaction_id):
         if not tx:
                 return jsonify({"error": "Transaction not found"}), 404
 
-        execute_db("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+        with unit_of_work() as conn:
+                record_spend(conn, transaction_id, sign=-1)
+                record_analytics(conn, transaction_id, sign=-1)
+                conn.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+                bump_revision(conn, family_id, "transactions", "budgets")
+                budgets = budget_status(conn, family_id, tx["category_id"])
 
-        emit_family_event(family_id, "update_transactions")
-        emit_family_event(family_id, "update_budgets")
+        emit_family_delta(family_id, "update_transactions", "deleted", [{"id": transaction_id}])
+        if budgets:
+                emit_family_delta(family_id, "update_budgets", "updated", budgets)
         return jsonify({"message": "Transaction deleted"}), 200
+
+
+@transactions_bp.route("/api/transactions/import", methods=["POST"])
+@login_required
+def import_transactions():
+        family_id = get_user_family_id()
+        if not family_id:
+                return jsonify({"error": "No family found"}), 404
+
+        upload = request.files.get("file")
+        if upload is None:
+                return jsonify({"error": "File is required"}), 400
+        fmt = detect_format(upload.filename, request.form.get("format"))
+        if fmt not in IMPORT_FORMATS:
+                return jsonify({"error": f"Format must be one of {', '.join(IMPORT_FORMATS)}"}), 400
+
+        user = get_current_user()
+        can_create_categories = not (user and user["role"] == "child")
+        categories = category_ids(get_db(), family_id)
+
+        summary = {"imported": 0, "skipped": 0, "categoriesCreated": 0, "errors": []}
+        rows, new_categories = [], []
+
+        def flush_chunk():
+                if not rows:
+                        return
+                with unit_of_work() as conn:
+                        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+                        conn.executemany(
+                                "INSERT OR IGNORE INTO categories (family_id, name, type, is_default, color, import_source) VALUES (?, ?, ?, 0, ?, ?)",
+                                [(family_id, name, cat_type, CATEGORY_COLORS[cat_type], fmt) for name, cat_type in new_categories],
+                        )
+                        if new_categories:
+                                categories.update(category_ids(conn, family_id))
+                        conn.executemany(
+                                "INSERT INTO transactions (user_id, family_id, amount, description, type, date, category_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                [(*row[:-1], categories[row[-1]]) for row in rows],
+                        )
+                        record_spend_since(conn, family_id, last_id)
+                        record_analytics_since(conn, family_id, last_id)
+                        bump_revision(conn, family_id, "transactions", "budgets")
+                        if new_categories:
+                                bump_revision(conn, family_id, "categories")
+                summary["imported"] += len(rows)
+                summary["categoriesCreated"] += len(new_categories)
+                rows.clear()
+                new_categories.clear()
+
+        failure = None
+        try:
+                for row_no, tx, error in iter_import_rows(upload.stream, fmt):
+                        if error:
+                                summary["skipped"] += 1
+                                if len(summary["errors"]) < IMPORT_MAX_ERRORS:
+                                        summary["errors"].append({"row": row_no, "error": error})
+                                continue
+
+                        category = tx["category"]
+                        if category.lower() not in categories and not can_create_categories:
+                                category = FALLBACK_CATEGORY
+                        if category.lower() not in categories:
+                                categories[category.lower()] = None
+                                new_categories.append((category, tx["type"]))
+
+                        rows.append((session["user_id"], family_id, tx["amount"], tx["description"], tx["type"], tx["date"], category.lower()))
+                        if len(rows) >= IMPORT_CHUNK_SIZE:
+                                flush_chunk()
+                flush_chunk()
+        except (ImportRowError, csv.Error) as e:
+                failure = (str(e), 400)
+        except sqlite3.Error as e:
+                print(f"Import stopped after {summary['imported']} rows: {e}")
+                failure = (str(e), 500)
+
+        if not summary["imported"]:
+                error, status = failure or ("No valid rows found", 400)
+                return jsonify({"error": error, **summary}), status
+
+        emit_family_event(family_id, "update_transactions", {"imported": summary["imported"]})
+        emit_family_event(family_id, "update_budgets")
+        if summary["categoriesCreated"]:
+                emit_family_event(family_id, "update_categories")
+
+        user_name, user_role = get_user_display()
+        emit_activity(
+                family_id,
+                "Transactions imported",
+                f"{summary['imported']} rows from {upload.filename or fmt.upper()}",
+                category="transactions",
+                user_name=user_name,
+                user_role=user_role,
+        )
+        if failure:
+                return jsonify({"error": failure[0], "partial": True, **summary}), failure[1]
+        return jsonify(summary), 201
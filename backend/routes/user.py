@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify, session
-from backend.database import query_db, execute_db
-from backend.utils import login_required, validate_fields, get_user_family_id
+from backend.database import query_db, get_db, execute_db, unit_of_work
+from backend.revisions import bump_revision
+from backend.utils import login_required, validate_fields, get_user_family_id, invalidate_user
+from backend.cache import cached, invalidate
 from backend.socket_events import emit_family_event, emit_activity
-from werkzeug.security import generate_password_hash, check_password_hash
+from backend.passwords import hash_password, verify_password
 
 user_bp = Blueprint("user", __name__)
 
@@ -10,7 +12,14 @@ user_bp = Blueprint("user", __name__)
 @user_bp.route("/api/me", methods=["GET"])
 @login_required
 def me():
-        user = query_db(
+        user = cached("me", session["user_id"], lambda: load_profile(get_db(), session["user_id"]))
+        if user:
+                return jsonify(user)
+        return jsonify({"error": "User not found"}), 404
+
+
+def load_profile(conn, user_id):
+        user = conn.execute(
                 """
                 SELECT u.first_name, u.last_name, u.email, u.family_id, u.role,
                            f.name as family_name, f.color as family_color, f.invite_code
@@ -18,25 +27,21 @@ def me():
                 LEFT JOIN families f ON u.family_id = f.id
                 WHERE u.id = ?
                 """,
-                (session["user_id"],),
-                one=True,
-        )
-
-        if user:
-                return jsonify(
-                        {
-                                "id": session["user_id"],
-                                "firstName": user["first_name"],
-                                "lastName": user["last_name"],
-                                "email": user["email"],
-                                "role": user["role"],
-                                "familyId": user["family_id"],
-                                "familyName": user["family_name"],
-                                "familyColor": user["family_color"],
-                                "inviteCode": user["invite_code"],
-                        }
-                )
-        return jsonify({"error": "User not found"}), 404
+                (user_id,),
+        ).fetchone()
+        if not user:
+                return None
+        return {
+                "id": user_id,
+                "firstName": user["first_name"],
+                "lastName": user["last_name"],
+                "email": user["email"],
+                "role": user["role"],
+                "familyId": user["family_id"],
+                "familyName": user["family_name"],
+                "familyColor": user["family_color"],
+                "inviteCode": user["invite_code"],
+        }
 
 
 @user_bp.route("/api/me", methods=["PUT"])
@@ -66,13 +71,19 @@ def update_profile():
         ):
                 return jsonify({"error": "Email already in use"}), 409
 
-        execute_db(
-                "UPDATE users SET first_name = ?, last_name = ?, email = ? WHERE id = ?",
-                (first_name, last_name, email, session["user_id"]),
-        )
+        family_id = get_user_family_id()
+        with unit_of_work() as conn:
+                conn.execute(
+                        "UPDATE users SET first_name = ?, last_name = ?, email = ? WHERE id = ?",
+                        (first_name, last_name, email, session["user_id"]),
+                )
+                if family_id:
+                        bump_revision(conn, family_id, "members", "transactions")
+        invalidate_user(session["user_id"])
+        if family_id:
+                invalidate("members", family_id)
         session["email"] = email
 
-        family_id = get_user_family_id()
         if family_id:
                 emit_family_event(family_id, "update_members")
         emit_activity(
@@ -94,10 +105,10 @@ def update_password():
                 return jsonify({"error": "Missing fields"}), 400
 
         user = query_db("SELECT password FROM users WHERE id = ?", (session["user_id"],), one=True)
-        if not user or not check_password_hash(user["password"], current_password):
+        if not user or not verify_password(user["password"], current_password):
                 return jsonify({"error": "Current password is incorrect"}), 400
 
-        hashed_password = generate_password_hash(new_password)
+        hashed_password = hash_password(new_password)
         execute_db("UPDATE users SET password = ? WHERE id = ?", (hashed_password, session["user_id"]))
         return jsonify({"message": "Password updated"}), 200
 
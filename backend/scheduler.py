@@ -0,0 +1,173 @@
+import calendar
+import os
+import socket
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from .extensions import socketio
+from .database import unit_of_work
+from .rollups import record_spend_since
+from .analytics import record_analytics_since
+from .revisions import bump_revision
+from .socket_events import emit_family_event, emit_activity
+
+RECURRENCES = ("daily", "weekly", "monthly", "yearly")
+SCHEDULER_BATCH_SIZE = 200
+SCHEDULER_MAX_CATCHUP = 400
+
+DUE_TEMPLATES_SQL = """
+    SELECT id, user_id, family_id, amount, description, type, category_id, recurrence, next_due_date
+    FROM transactions
+    WHERE is_recurring = 1 AND next_due_date <= ?
+    ORDER BY next_due_date, id
+    LIMIT ?
+"""
+
+ACQUIRE_LEASE_SQL = """
+    INSERT INTO scheduler_leases (name, owner, expires_at) VALUES (?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+    WHERE scheduler_leases.owner = excluded.owner OR scheduler_leases.expires_at < ?
+"""
+
+
+def next_occurrence(day: date, recurrence: str, anchor_day: int = None) -> date:
+    if recurrence == "daily":
+        return day + timedelta(days=1)
+    if recurrence == "weekly":
+        return day + timedelta(days=7)
+    year, month = (day.year + 1, day.month) if recurrence == "yearly" else (day.year + day.month // 12, day.month % 12 + 1)
+    return date(year, month, min(anchor_day or day.day, calendar.monthrange(year, month)[1]))
+
+
+def parse_due_date(value):
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RecurringScheduler:
+    lease_name = "recurring_transactions"
+
+    def __init__(self, app, interval: float = 60, clock=utc_now, lease_ttl: float = None, owner: str = None):
+        self.app = app
+        self.interval = interval
+        self.clock = clock
+        self.lease_ttl = lease_ttl if lease_ttl is not None else interval * 3
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.running = False
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            socketio.start_background_task(self._loop)
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def _loop(self):
+        while self.running:
+            try:
+                self.run_once()
+            except Exception:
+                self.app.logger.exception("Recurring scheduler run failed")
+            socketio.sleep(self.interval)
+
+    def acquire_lease(self, now: datetime) -> bool:
+        stamp = now.timestamp()
+        with unit_of_work() as conn:
+            conn.execute(ACQUIRE_LEASE_SQL, (self.lease_name, self.owner, stamp + self.lease_ttl, stamp))
+            row = conn.execute("SELECT owner FROM scheduler_leases WHERE name = ?", (self.lease_name,)).fetchone()
+        return row is not None and row["owner"] == self.owner
+
+    def run_once(self, now: datetime = None) -> dict:
+        now = now or self.clock()
+        with self.app.app_context():
+            if not self.acquire_lease(now):
+                return {}
+            generated = {}
+            while True:
+                processed, batch = self._materialise_batch(now.date())
+                for family_id, count in batch.items():
+                    generated[family_id] = generated.get(family_id, 0) + count
+                if not processed:
+                    break
+            for family_id, count in generated.items():
+                self._notify(family_id, count)
+        return generated
+
+    def _materialise_batch(self, today: date):
+        with unit_of_work() as conn:
+            templates = conn.execute(DUE_TEMPLATES_SQL, (today.isoformat(), SCHEDULER_BATCH_SIZE)).fetchall()
+            if not templates:
+                return 0, {}
+
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+            placeholders = ", ".join("?" for _ in templates)
+            anchors = {
+                row[0]: parse_due_date(row[1])
+                for row in conn.execute(
+                    f"""SELECT recurring_parent_id, MIN(date) FROM transactions
+                    WHERE recurring_parent_id IN ({placeholders}) GROUP BY recurring_parent_id""",
+                    tuple(template["id"] for template in templates),
+                )
+            }
+            occurrences, advances, families = [], [], set()
+            for template in templates:
+                due = parse_due_date(template["next_due_date"])
+                recurrence = template["recurrence"] if template["recurrence"] in RECURRENCES else "monthly"
+                if due is None:
+                    advances.append((None, template["id"], template["next_due_date"]))
+                    continue
+                anchor_day = (anchors.get(template["id"]) or due).day
+                for _ in range(SCHEDULER_MAX_CATCHUP):
+                    if due > today:
+                        break
+                    occurrences.append((
+                        template["user_id"], template["family_id"], template["amount"], template["description"],
+                        template["type"], f"{due.isoformat()} 00:00:00", template["category_id"], template["id"],
+                    ))
+                    due = next_occurrence(due, recurrence, anchor_day)
+                advances.append((due.isoformat(), template["id"], template["next_due_date"]))
+                families.add(template["family_id"])
+
+            conn.executemany(
+                """INSERT OR IGNORE INTO transactions
+                (user_id, family_id, amount, description, type, date, category_id, recurring_parent_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                occurrences,
+            )
+            conn.executemany(
+                "UPDATE transactions SET next_due_date = ? WHERE id = ? AND next_due_date = ?",
+                advances,
+            )
+
+            generated = {}
+            for family_id in families:
+                record_spend_since(conn, family_id, last_id)
+                record_analytics_since(conn, family_id, last_id)
+                count = conn.execute(
+                    "SELECT COUNT(*) FROM transactions WHERE family_id = ? AND id > ?", (family_id, last_id)
+                ).fetchone()[0]
+                if count:
+                    bump_revision(conn, family_id, "transactions", "budgets")
+                    generated[family_id] = count
+            return len(templates), generated
+
+    def _notify(self, family_id: int, count: int):
+        emit_family_event(family_id, "update_transactions", {"generated": count})
+        emit_family_event(family_id, "update_budgets")
+        noun = "transaction" if count == 1 else "transactions"
+        emit_activity(family_id, "Recurring transactions added", f"{count} scheduled {noun} recorded", category="transactions")
+
+
+def start_scheduler(app) -> RecurringScheduler:
+    scheduler = RecurringScheduler(app, interval=app.config["SCHEDULER_INTERVAL"])
+    app.extensions["recurring_scheduler"] = scheduler
+    if app.config["SCHEDULER_ENABLED"]:
+        scheduler.start()
+    return scheduler
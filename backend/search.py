@@ -0,0 +1,52 @@
+import re
+import sqlite3
+
+SEARCH_TERM_RE = re.compile(r"\w+", re.UNICODE)
+MAX_SEARCH_TERMS = 8
+DESCRIPTION_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+
+SCORE_SQL = f"bm25(transactions_fts, 0.0, {DESCRIPTION_WEIGHT}, {CATEGORY_WEIGHT})"
+
+SEARCH_SQL = f"""
+    SELECT t.*, c.name AS category, u.first_name, u.role, page.score
+    FROM (
+        SELECT t.id, s.score
+        FROM (
+            SELECT rowid AS id, {SCORE_SQL} AS score
+            FROM transactions_fts WHERE transactions_fts MATCH ?
+        ) s
+        JOIN transactions t ON t.id = s.id
+        WHERE {{where}}
+        ORDER BY s.score, t.id
+        LIMIT ?
+    ) page
+    JOIN transactions t ON t.id = page.id
+    JOIN users u ON t.user_id = u.id
+    LEFT JOIN categories c ON c.id = t.category_id
+    ORDER BY page.score, page.id
+"""
+
+
+AFTER_CURSOR_SQL = f"""(s.score, t.id) > (
+    COALESCE((SELECT {SCORE_SQL} FROM transactions_fts WHERE transactions_fts MATCH ? AND rowid = ?), ?), ?
+)"""
+
+
+def fts_query(text: str, family_id: int):
+    terms = SEARCH_TERM_RE.findall(text or "")[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return f'family : "{int(family_id)}" AND {{description category}} : (' + " ".join(f'"{term}"*' for term in terms) + ")"
+
+
+def search_transactions(conn: sqlite3.Connection, match: str, where: list, args: list, limit: int) -> list:
+    return conn.execute(SEARCH_SQL.format(where=" AND ".join(where)), (match, *args, limit)).fetchall()
+
+
+def index_transactions(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM transactions_fts")
+    conn.execute(
+        """INSERT INTO transactions_fts (rowid, family, description, category)
+        SELECT t.id, t.family_id, t.description, c.name FROM transactions t LEFT JOIN categories c ON c.id = t.category_id"""
+    )
@@ -1,19 +1,98 @@
-from flask import request, session
+from flask import request, session, g, current_app, has_app_context, has_request_context
 from flask_socketio import join_room
+import os
 import time
-from .extensions import socketio, ACTIVITY_BUFFER
-from .database import query_db
+from .extensions import socketio, FAMILY_SYNC_STATS
+from .state import get_state_store
+from .utils import get_current_user
+from .metrics import record_emit
 
 
 def get_family_room(family_id):
     return f"family_{family_id}"
 
 
+def next_family_revision(family_id):
+    return get_state_store().next_revision(family_id)
+
+
+def _emit(event, payload, room):
+    record_emit(event, room)
+    socketio.emit(event, payload, room=room)
+
+
+FAMILY_SYNC_WINDOW = float(os.environ.get("FAMILY_SYNC_WINDOW", "0.05"))
+
+_pending_sync = {}
+
+
 def emit_family_event(family_id, event_name, data=None):
-    if data is None:
-        data = {}
-    data["family_id"] = family_id
-    socketio.emit(event_name, data, room=get_family_room(family_id))
+    data = dict(data or {})
+    FAMILY_SYNC_STATS["emits"] += 1
+    pending = queue_family_sync(family_id)
+    delta = {"op": data.pop("op"), "rows": data.pop("rows", [])} if "op" in data else None
+    entry = pending["events"].get(event_name)
+    if entry is None:
+        pending["events"][event_name] = {**data, "deltas": [delta]} if delta else data
+        return
+    FAMILY_SYNC_STATS["deduplicated"] += 1
+    entry.update(data)
+    if delta and "deltas" in entry:
+        entry["deltas"].append(delta)
+    else:
+        entry.pop("deltas", None)
+
+
+def emit_family_delta(family_id, event_name, op, rows):
+    emit_family_event(family_id, event_name, {"op": op, "rows": [dict(row) for row in rows]})
+
+
+def queue_family_sync(family_id):
+    pending = _pending_sync.get(family_id)
+    if pending is not None:
+        return pending
+    pending = _pending_sync[family_id] = {"events": {}, "activity": []}
+    if FAMILY_SYNC_WINDOW <= 0 and has_request_context():
+        g.setdefault("family_sync", set()).add(family_id)
+    else:
+        app = current_app._get_current_object() if has_app_context() else None
+        socketio.start_background_task(_flush_family_sync_later, app, family_id)
+    return pending
+
+
+def _flush_family_sync_later(app, family_id):
+    socketio.sleep(FAMILY_SYNC_WINDOW)
+    if app is None:
+        flush_family_sync(family_id)
+        return
+    with app.app_context():
+        flush_family_sync(family_id)
+
+
+def flush_family_sync(family_id):
+    pending = _pending_sync.pop(family_id, None)
+    if not pending or not (pending["events"] or pending["activity"]):
+        return
+    FAMILY_SYNC_STATS["messages"] += 1
+    payload = {
+        "family_id": family_id,
+        "revision": next_family_revision(family_id),
+        "events": pending["events"],
+        "activity": pending["activity"],
+    }
+    _emit("family_sync", payload, get_family_room(family_id))
+
+
+def flush_request_family_sync(exc=None):
+    for family_id in g.pop("family_sync", ()):
+        flush_family_sync(family_id)
+
+
+def family_sync_stats():
+    stats = dict(FAMILY_SYNC_STATS)
+    stats["collapsed"] = stats["emits"] - stats["messages"]
+    stats["pending"] = len(_pending_sync)
+    return stats
 
 
 def emit_activity(family_id, title, detail="", category="info", user_name="", user_role=""):
@@ -26,37 +105,43 @@ def emit_activity(family_id, title, detail="", category="info", user_name="", us
         "user_role": user_role,
         "ts": int(time.time() * 1000),
     }
-    buf = ACTIVITY_BUFFER.setdefault(family_id, [])
-    buf.append(event)
-    ACTIVITY_BUFFER[family_id] = buf[-50:]
-    socketio.emit("activity_event", event, room=get_family_room(family_id))
+    if not family_id:
+        _emit("activity_event", event, get_family_room(family_id))
+        return
+    get_state_store().record_activity(event)
+    FAMILY_SYNC_STATS["emits"] += 1
+    queue_family_sync(family_id)["activity"].append(event)
 
 
 @socketio.on("connect")
 def handle_connect():
     if "user_id" in session:
-        user = query_db("SELECT family_id FROM users WHERE id = ?", (session["user_id"],), one=True)
+        user = get_current_user()
         if user and user["family_id"]:
             family_id = user["family_id"]
             join_room(get_family_room(family_id))
-            socketio.emit(
+            _emit(
                 "activity_sync",
-                {"family_id": family_id, "events": ACTIVITY_BUFFER.get(family_id, [])},
-                room=request.sid,
+                {"family_id": family_id, "events": get_state_store().recent_activity(family_id)},
+                request.sid,
             )
 
 
+def session_family_id():
+    if "user_id" not in session:
+        return None
+    user = get_current_user()
+    return user["family_id"] if user else None
+
+
 @socketio.on("join_family_room")
 def handle_join_family_room(data):
-    family_id = data.get("family_id")
-    if family_id:
-        join_room(get_family_room(family_id))
-    try:
-        fid = int(family_id)
-    except (TypeError, ValueError):
-        fid = family_id
-    socketio.emit(
+    family_id = session_family_id()
+    if not family_id or str((data or {}).get("family_id")) != str(family_id):
+        return
+    join_room(get_family_room(family_id))
+    _emit(
         "activity_sync",
-        {"family_id": fid, "events": ACTIVITY_BUFFER.get(fid, [])},
-        room=request.sid,
+        {"family_id": family_id, "events": get_state_store().recent_activity(family_id)},
+        request.sid,
     )
@@ -0,0 +1,59 @@
+from .extensions import FAMILY_REVISIONS
+from .database import unit_of_work
+from .activity import family_activity, record_activity, load_activity, ACTIVITY_COLUMNS
+
+
+class LocalStateStore:
+    name = "local"
+
+    def next_revision(self, family_id):
+        revision = FAMILY_REVISIONS.get(family_id, 0) + 1
+        FAMILY_REVISIONS[family_id] = revision
+        return revision
+
+    def record_activity(self, event):
+        record_activity(event)
+
+    def recent_activity(self, family_id):
+        return list(reversed(family_activity(family_id)))
+
+
+class SQLiteStateStore:
+    name = "sqlite"
+
+    def next_revision(self, family_id):
+        with unit_of_work() as conn:
+            row = conn.execute(
+                """INSERT INTO resource_revisions (family_id, resource, revision) VALUES (?, 'events', 1)
+                ON CONFLICT(family_id, resource) DO UPDATE SET revision = revision + 1
+                RETURNING revision""",
+                (family_id,),
+            ).fetchone()
+        return row["revision"]
+
+    def record_activity(self, event):
+        placeholders = ", ".join("?" for _ in ACTIVITY_COLUMNS)
+        with unit_of_work() as conn:
+            conn.execute(
+                f"INSERT INTO activity_log ({', '.join(ACTIVITY_COLUMNS)}) VALUES ({placeholders})",
+                tuple(event.get(col) for col in ACTIVITY_COLUMNS),
+            )
+
+    def recent_activity(self, family_id):
+        return load_activity(family_id)
+
+
+STATE_STORES = {"local": LocalStateStore, "sqlite": SQLiteStateStore}
+store = LocalStateStore()
+
+
+def configure_state_store(name):
+    global store
+    if name not in STATE_STORES:
+        raise ValueError(f"Unknown state store '{name}'")
+    store = STATE_STORES[name]()
+    return store
+
+
+def get_state_store():
+    return store
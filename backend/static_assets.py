@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_EXTENSIONS = {
+    ".html", ".css", ".js", ".mjs", ".map", ".json", ".txt", ".svg", ".png", ".jpg", ".jpeg",
+    ".gif", ".webp", ".ico", ".woff", ".woff2", ".webmanifest",
+}
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".mjs", ".map", ".json", ".txt", ".svg", ".webmanifest"}
+EXCLUDED_DIRS = {"backend", "bench", "tests", "node_modules", "dist", "data", "venv", ".venv", "__pycache__"}
+EXCLUDED_FILES = {"package.json", "package-lock.json", "requirements.txt", "vite.config.js", "eslint.config.js"}
+COMPRESS_MIN_BYTES = 256
+FINGERPRINTED_DIRS = ("assets/",)
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+def compress_variants(data: bytes, level: int = 9) -> dict:
+    variants = {"identity": data}
+    if len(data) >= COMPRESS_MIN_BYTES:
+        if brotli:
+            variants["br"] = brotli.compress(data, quality=min(level + 2, 11))
+        variants["gzip"] = gzip.compress(data, level, mtime=0)
+    return {encoding: packed for encoding, packed in variants.items() if len(packed) <= len(data)}
+
+
+class StaticAsset:
+    def __init__(self, path: str, data: bytes, mtime: float):
+        self.path = path
+        self.mtime = mtime
+        self.mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.digest = hashlib.sha256(data).hexdigest()[:16]
+        if os.path.splitext(path)[1] in COMPRESSIBLE_EXTENSIONS:
+            self.variants = compress_variants(data)
+        else:
+            self.variants = {"identity": data}
+
+    @property
+    def data(self) -> bytes:
+        return self.variants["identity"]
+
+
+class StaticManifest:
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.assets = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS and not d.startswith(".")]
+            for filename in filenames:
+                path = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                self._load(path)
+
+    def _load(self, path: str):
+        parts = path.split("/")
+        if os.path.splitext(path)[1] not in STATIC_EXTENSIONS or parts[0] in EXCLUDED_DIRS or parts[-1] in EXCLUDED_FILES:
+            return None
+        if any(part.startswith(".") or part in ("", "..") for part in parts):
+            return None
+        full_path = os.path.join(self.root, path)
+        try:
+            mtime = os.path.getmtime(full_path)
+            with open(full_path, "rb") as f:
+                asset = StaticAsset(path, f.read(), mtime)
+        except OSError:
+            self.assets.pop(path, None)
+            return None
+        self.assets[path] = asset
+        return asset
+
+    def get(self, path: str):
+        asset = self.assets.get(path)
+        if current_app.debug and "\x00" not in path:
+            full_path = os.path.join(self.root, path)
+            if asset is None or not os.path.exists(full_path) or os.path.getmtime(full_path) != asset.mtime:
+                asset = self._load(path)
+        return asset
+
+    def fingerprints(self) -> dict:
+        return {path: asset.digest for path, asset in self.assets.items()}
+
+
+manifest = None
+
+
+def load_static_manifest(root: str) -> StaticManifest:
+    global manifest
+    manifest = StaticManifest(root)
+    return manifest
+
+
+def get_static_manifest() -> StaticManifest:
+    return manifest
+
+
+def choose_encoding(variants) -> str:
+    for encoding in ("br", "gzip"):
+        if encoding in variants and request.accept_encodings[encoding]:
+            return encoding
+    return "identity"
+
+
+def encoded_response(variants: dict, digest: str, mimetype: str, cache_control: str):
+    encoding = choose_encoding(variants)
+    etag = digest if encoding == "identity" else f"{digest}-{encoding}"
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(variants[encoding], mimetype=mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def asset_response(asset: StaticAsset):
+    immutable = asset.path.startswith(FINGERPRINTED_DIRS) or request.args.get("v") == asset.digest
+    return encoded_response(asset.variants, asset.digest, asset.mimetype, IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE)
+
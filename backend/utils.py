@@ -1,8 +1,9 @@
 import random
 import string
 from functools import wraps
-from flask import session, jsonify
+from flask import session, jsonify, g, has_app_context
 from backend.database import query_db
+from backend.cache import cached, invalidate
 
 
 def generate_invite_code(length: int = 6) -> str:
@@ -16,16 +17,62 @@ def validate_fields(data: dict, fields: list) -> bool:
     return all(data.get(f) is not None for f in fields)
 
 
+def load_user(user_id):
+    def load():
+        row = query_db(
+            "SELECT id, first_name, last_name, email, family_id, role FROM users WHERE id = ?",
+            (user_id,),
+            one=True,
+        )
+        return dict(row) if row else None
+
+    return cached("user", user_id, load) if user_id is not None else None
+
+
+def invalidate_user(*user_ids):
+    stale = []
+    for user_id in user_ids:
+        try:
+            stale.append(int(user_id))
+        except (TypeError, ValueError):
+            continue
+    invalidate("user", *stale)
+    invalidate("me", *stale)
+    if has_app_context() and g.get("user") and g.user["id"] in stale:
+        g.pop("user")
+
+
+def invalidate_family(family_id, member_ids=None):
+    if member_ids is None:
+        member_ids = [row["id"] for row in query_db("SELECT id FROM users WHERE family_id = ?", (family_id,))]
+    invalidate_user(*member_ids)
+    invalidate("members", family_id)
+
+
+def get_current_user():
+    if "user" not in g:
+        g.user = load_user(session.get("user_id"))
+    return g.user
+
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if "user_id" not in session:
             return jsonify({"error": "Not authenticated"}), 401
+        get_current_user()
         return f(*args, **kwargs)
 
     return decorated_function
 
 
 def get_user_family_id():
-    user = query_db("SELECT family_id FROM users WHERE id = ?", (session.get("user_id"),), one=True)
+    user = get_current_user()
     return user["family_id"] if user else None
+
+
+def get_user_display():
+    user = get_current_user()
+    if not user:
+        return "Member", ""
+    return f"{user['first_name'] or ''} {user['last_name'] or ''}".strip(), user["role"]
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from loadtest import seed_database, summarise
+
+MODES = ("per-query", "pooled", "executor")
+
+
+class PerQueryConnection:
+    def __init__(self, path):
+        self.path = path
+
+    def execute(self, sql, args=()):
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            cur = conn.execute(sql, args)
+            rows = cur.fetchall()
+        finally:
+            conn.close()
+        return FetchedRows(rows)
+
+
+class FetchedRows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def dashboard_reads(conn, user_id, family_id):
+    from backend.rollups import budget_status
+    from backend.routes.family import load_family_members
+    from backend.routes.transactions import parse_listing, transaction_page
+    from backend.routes.user import load_profile
+
+    load_profile(conn, user_id)
+    page, _ = parse_listing(family_id, {"limit": "50"})
+    transaction_page(conn, *page)
+    budget_status(conn, family_id)
+    conn.execute("SELECT * FROM goals WHERE family_id = ?", (family_id,)).fetchall()
+    conn.execute("SELECT * FROM categories WHERE family_id = ?", (family_id,)).fetchall()
+    load_family_members(conn, family_id)
+
+
+def run_threads(args, users, connection_for):
+    latencies, lock = [], threading.Lock()
+
+    def worker(index):
+        conn = connection_for()
+        user_id, family_id = users[index % len(users)]
+        timings = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            dashboard_reads(conn, user_id, family_id)
+            timings.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(timings)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+def run_greenlets(args, users):
+    import eventlet
+    from backend.database import get_db
+
+    latencies = []
+
+    def worker(index):
+        user_id, family_id = users[index % len(users)]
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            dashboard_reads(get_db(), user_id, family_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    pool = eventlet.GreenPool(args.concurrency)
+    started = time.perf_counter()
+    for i in range(args.concurrency):
+        pool.spawn(worker, i)
+    pool.waitall()
+    return latencies, time.perf_counter() - started
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="lumora-connections-")
+    db_path = os.path.join(workdir, "connections.db")
+    seed_database(db_path, args.families, 4, args.transactions, args.seed)
+    from backend.database import open_db
+
+    conn = sqlite3.connect(db_path)
+    users = conn.execute("SELECT id, family_id FROM users WHERE family_id IS NOT NULL ORDER BY id").fetchall()
+    conn.close()
+
+    results = {}
+    for mode in args.modes:
+        if mode == "per-query":
+            latencies, elapsed = run_threads(args, users, lambda: PerQueryConnection(db_path))
+        elif mode == "pooled":
+            latencies, elapsed = run_threads(args, users, open_db)
+        else:
+            latencies, elapsed = run_greenlets(args, users)
+        results[mode] = {**summarise(latencies), "requests_per_second": round(len(latencies) / elapsed, 2)}
+        print(f"{mode:<10} {results[mode]['requests_per_second']:>9} req/s   p50 {results[mode]['p50']:>8} ms   "
+              f"p95 {results[mode]['p95']:>8} ms")
+    return {"config": {key: value for key, value in vars(args).items() if key != "json"}, "modes": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare dashboard read throughput with a connection per query, pooled connections and the DB executor."
+    )
+    parser.add_argument("--families", type=int, default=10)
+    parser.add_argument("--transactions", type=int, default=2000, help="seeded transactions per family")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="dashboard loads per worker")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
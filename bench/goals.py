@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from loadtest import PASSWORD, boot_server, free_port, member_email, seed_database, summarise
+
+GOAL_TARGET = 1000000
+
+
+def adjuster(base, member, args, barrier, results, lock, rng):
+    session = requests.Session()
+    session.post(base + "/api/login", json={"email": member_email(0, member), "password": PASSWORD}, timeout=30)
+    latencies, errors, requested, applied = [], 0, 0, 0
+    barrier.wait()
+    for _ in range(args.adjustments):
+        action = "subtract" if rng.random() < args.withdraw_ratio else "add"
+        amount = rng.randint(1, 5000) / 100
+        started = time.perf_counter()
+        try:
+            response = session.post(f"{base}/api/goals/{args.goal_id}/adjust", json={"amount": amount, "action": action}, timeout=30)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            response, ok = None, False
+        latencies.append((time.perf_counter() - started) * 1000)
+        if ok:
+            requested += amount if action == "add" else -amount
+            applied += response.json()["applied"]
+        else:
+            errors += 1
+    with lock:
+        results["latencies"].extend(latencies)
+        results["errors"] += errors
+        results["requested"] += requested
+        results["applied"] += applied
+
+
+def verify(db_path, goal_id):
+    conn = sqlite3.connect(db_path)
+    current = conn.execute("SELECT current_amount FROM goals WHERE id = ?", (goal_id,)).fetchone()[0]
+    total, count = conn.execute("SELECT SUM(applied), COUNT(*) FROM goal_contributions WHERE goal_id = ?", (goal_id,)).fetchone()
+    last = conn.execute("SELECT balance FROM goal_contributions WHERE goal_id = ? ORDER BY id DESC LIMIT 1", (goal_id,)).fetchone()
+    broken = conn.execute(
+        """SELECT COUNT(*) FROM goal_contributions c
+        JOIN goal_contributions p ON p.id = (SELECT MAX(id) FROM goal_contributions WHERE goal_id = c.goal_id AND id < c.id)
+        WHERE c.goal_id = ? AND ABS(p.balance + c.applied - c.balance) > 0.005""",
+        (goal_id,),
+    ).fetchone()[0]
+    conn.close()
+    return {
+        "current_amount": round(current, 2),
+        "ledger_rows": count,
+        "ledger_sum": round(total or 0, 2),
+        "ledger_balance": round(last[0], 2) if last else 0,
+        "broken_links": broken,
+    }
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="lumora-goals-")
+    db_path = os.path.join(workdir, "goals.db")
+    seed_database(db_path, 1, args.members, 0, args.seed)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        args.goal_id = conn.execute("UPDATE goals SET target_amount = ? RETURNING id", (GOAL_TARGET,)).fetchone()[0]
+    conn.close()
+
+    os.environ["SOCKETIO_MESSAGE_QUEUE"] = "sqlite://" + os.path.join(workdir, "queue.db")
+    results = {"latencies": [], "errors": 0, "requested": 0, "applied": 0}
+    lock = threading.Lock()
+    servers = []
+    with open(os.path.join(workdir, "server.log"), "w") as log:
+        try:
+            for _ in range(args.workers):
+                servers.append(boot_server(db_path, free_port(), log))
+            barrier = threading.Barrier(args.threads)
+            rng = random.Random(args.seed)
+            threads = [
+                threading.Thread(
+                    target=adjuster,
+                    args=(servers[i % len(servers)][1], i % args.members, args, barrier, results, lock, random.Random(rng.random())),
+                )
+                for i in range(args.threads)
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            for server, _ in servers:
+                server.terminate()
+                server.wait(timeout=10)
+
+    ledger = verify(db_path, args.goal_id)
+    applied = round(results["applied"], 2)
+    consistent = (
+        ledger["current_amount"] == ledger["ledger_sum"] == ledger["ledger_balance"] == applied
+        and ledger["ledger_rows"] == len(results["latencies"]) - results["errors"]
+        and not ledger["broken_links"]
+    )
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "goal_id")},
+        "duration": round(elapsed, 2),
+        "throughput": round(len(results["latencies"]) / elapsed, 2),
+        "adjust": summarise(results["latencies"], results["errors"]),
+        "requested": round(results["requested"], 2),
+        "applied": applied,
+        "ledger": ledger,
+        "consistent": consistent,
+    }
+
+
+def print_report(report):
+    adjust, ledger = report["adjust"], report["ledger"]
+    print(f"{adjust['count']} adjustments in {report['duration']} s, {report['throughput']} req/s, {adjust['errors']} errors")
+    print(f"latency p50 {adjust['p50']} ms  p95 {adjust['p95']} ms  p99 {adjust['p99']} ms  max {adjust['max']} ms")
+    print(f"requested {report['requested']}  applied {report['applied']}  goal {ledger['current_amount']}  "
+          f"ledger sum {ledger['ledger_sum']}  ledger balance {ledger['ledger_balance']}  rows {ledger['ledger_rows']}")
+    print("consistent" if report["consistent"] else "INCONSISTENT: lost or duplicated updates")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hammer one savings goal with parallel adjusters and check the ledger.")
+    parser.add_argument("--workers", type=int, default=2, help="server processes sharing the database")
+    parser.add_argument("--threads", type=int, default=32, help="parallel adjusters")
+    parser.add_argument("--members", type=int, default=6)
+    parser.add_argument("--adjustments", type=int, default=50, help="adjustments per thread")
+    parser.add_argument("--withdraw-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["consistent"] and not report["adjust"]["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
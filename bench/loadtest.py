@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+import socketio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "benchpass"
+DASHBOARD_REFRESH = (
+    "/api/me",
+    "/api/transactions",
+    "/api/budgets",
+    "/api/goals",
+    "/api/categories",
+    "/api/activity",
+)
+BOOTSTRAP_REFRESH = ("/api/bootstrap?sections=me,budgets,goals,categories,members,activity", "/api/transactions")
+DEFAULT_CATEGORIES = (
+    ("Food", "expense"), ("Transport", "expense"), ("Housing", "expense"), ("Utilities", "expense"),
+    ("Entertainment", "expense"), ("Health", "expense"), ("Others", "expense"),
+    ("Salary", "income"), ("Investment", "income"),
+)
+REGRESSION_FLOOR_MS = 5.0
+
+
+def member_email(family, member):
+    return f"f{family}m{member}@bench.local"
+
+
+def seed_database(path, families, members, transactions, seed):
+    os.environ["DATABASE_PATH"] = path
+    os.environ["SCHEDULER_ENABLED"] = "0"
+    sys.path.insert(0, ROOT)
+    from backend import create_app
+    from backend.passwords import hash_password
+    from backend.rollups import rebuild_all_spend
+    from backend.analytics import rebuild_all_analytics
+
+    create_app()
+    rng = random.Random(seed)
+    password = hash_password(PASSWORD)
+    conn = sqlite3.connect(path)
+    with conn:
+        for f in range(families):
+            user_ids = []
+            for m in range(members):
+                user_ids.append(conn.execute(
+                    "INSERT INTO users (first_name, last_name, email, password, role) VALUES (?, ?, ?, ?, ?)",
+                    (f"Member{m}", f"Family{f}", member_email(f, m), password, "admin" if m == 0 else "parent"),
+                ).lastrowid)
+            family_id = conn.execute(
+                "INSERT INTO families (name, created_by, invite_code) VALUES (?, ?, ?)",
+                (f"Bench family {f}", user_ids[0], f"B{f:05d}"),
+            ).lastrowid
+            conn.execute(f"UPDATE users SET family_id = ? WHERE id IN ({', '.join('?' for _ in user_ids)})", (family_id, *user_ids))
+            conn.executemany(
+                "INSERT INTO categories (family_id, name, type, is_default) VALUES (?, ?, ?, 1)",
+                [(family_id, name, cat_type) for name, cat_type in DEFAULT_CATEGORIES],
+            )
+            category_ids = dict(conn.execute("SELECT name, id FROM categories WHERE family_id = ?", (family_id,)))
+            conn.executemany(
+                "INSERT INTO budgets (family_id, category_id, amount, period) VALUES (?, ?, ?, 'monthly')",
+                [(family_id, category_ids[name], 500) for name, cat_type in DEFAULT_CATEGORIES[:4]],
+            )
+            conn.execute("INSERT INTO goals (family_id, name, target_amount) VALUES (?, 'Holiday', 2000)", (family_id,))
+            rows = []
+            for i in range(transactions):
+                name, cat_type = rng.choice(DEFAULT_CATEGORIES)
+                rows.append((
+                    rng.choice(user_ids), family_id, round(rng.uniform(1, 300), 2), f"Seeded {i}", cat_type,
+                    f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d} 12:00:00", category_ids[name],
+                ))
+            conn.executemany(
+                "INSERT INTO transactions (user_id, family_id, amount, description, type, date, category_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        rebuild_all_spend(conn)
+        rebuild_all_analytics(conn)
+    conn.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def boot_server(db_path, port, log):
+    env = dict(os.environ, DATABASE_PATH=db_path, PORT=str(port), WORKERS="1", LUMORA_WORKER="1", SCHEDULER_ENABLED="0")
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "app.py")], cwd=ROOT, env=env, stdout=log, stderr=log)
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            requests.get(base + "/api/me", timeout=1)
+            return server, base
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.fanout = []
+        self.sent = {}
+
+    def timed(self, session, method, base, path, label=None, **kwargs):
+        label = label or f"{method} {path}"
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base + path, timeout=30, **kwargs)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            response, ok = None, False
+        elapsed = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.latencies[label].append(elapsed)
+            if not ok:
+                self.errors[label] += 1
+        return response
+
+    def mark_sent(self, token, family):
+        with self.lock:
+            self.sent[token] = (time.perf_counter(), family)
+
+    def mark_received(self, token):
+        now = time.perf_counter()
+        with self.lock:
+            sent = self.sent.get(token)
+            if sent:
+                self.fanout.append((now - sent[0]) * 1000)
+
+
+def listen(recorder, base, family, stop, ready):
+    session = requests.Session()
+    session.post(base + "/api/login", json={"email": member_email(family, 0), "password": PASSWORD})
+    client = socketio.Client(reconnection=False)
+
+    @client.on("family_sync")
+    def on_sync(payload):
+        for event in payload.get("events", {}).values():
+            for delta in event.get("deltas", []):
+                for row in delta.get("rows", []):
+                    token = str(row.get("description", ""))
+                    if token.startswith("bench-"):
+                        recorder.mark_received(token)
+
+    cookie = "; ".join(f"{c.name}={c.value}" for c in session.cookies)
+    client.connect(base, headers={"Cookie": cookie}, transports=["websocket"])
+    ready.release()
+    stop.wait()
+    client.disconnect()
+
+
+def virtual_user(recorder, base, family, member, args, stop, rng):
+    session = requests.Session()
+    credentials = {"email": member_email(family, member), "password": PASSWORD}
+    recorder.timed(session, "POST", base, "/api/login", json=credentials)
+    while not stop.is_set():
+        roll = rng.random()
+        if roll < args.login_ratio:
+            session = requests.Session()
+            recorder.timed(session, "POST", base, "/api/login", json=credentials)
+        elif roll < args.login_ratio + args.burst_ratio:
+            for _ in range(args.burst_size):
+                token = f"bench-{uuid.uuid4().hex[:12]}"
+                recorder.mark_sent(token, family)
+                recorder.timed(session, "POST", base, "/api/transactions", json={
+                    "amount": round(rng.uniform(1, 200), 2), "description": token,
+                    "type": "expense", "category": rng.choice(DEFAULT_CATEGORIES[:7])[0],
+                })
+        else:
+            for path in BOOTSTRAP_REFRESH if args.bootstrap else DASHBOARD_REFRESH:
+                recorder.timed(session, "GET", base, path)
+        if args.think_time:
+            stop.wait(rng.uniform(0, 2 * args.think_time))
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+
+def summarise(values, errors=0):
+    return {
+        "count": len(values),
+        "errors": errors,
+        "mean": round(sum(values) / len(values), 2) if values else None,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": round(max(values), 2) if values else None,
+    }
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="lumora-bench-")
+    db_path = os.path.join(workdir, "bench.db")
+    print(f"Seeding {args.families} families x {args.members} members x {args.transactions} transactions into {db_path}")
+    seed_database(db_path, args.families, args.members, args.transactions, args.seed)
+
+    recorder = Recorder()
+    with open(os.path.join(workdir, "server.log"), "w") as log:
+        server, base = boot_server(db_path, args.port or free_port(), log)
+        try:
+            stop = threading.Event()
+            ready = threading.Semaphore(0)
+            listeners = [
+                threading.Thread(target=listen, args=(recorder, base, f, stop, ready), daemon=True)
+                for f in range(args.families) for _ in range(args.listeners)
+            ]
+            for thread in listeners:
+                thread.start()
+            for _ in listeners:
+                ready.acquire(timeout=10)
+
+            rng = random.Random(args.seed)
+            users = [
+                threading.Thread(target=virtual_user, args=(recorder, base, i % args.families, (i // args.families) % args.members,
+                                                            args, stop, random.Random(rng.random())), daemon=True)
+                for i in range(args.users)
+            ]
+            started = time.perf_counter()
+            for thread in users:
+                thread.start()
+            time.sleep(args.duration)
+            stop.set()
+            for thread in users:
+                thread.join(timeout=30)
+            elapsed = time.perf_counter() - started
+            time.sleep(0.5)
+            for thread in listeners:
+                thread.join(timeout=5)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    total = sum(len(values) for values in recorder.latencies.values())
+    fanout = summarise(recorder.fanout)
+    fanout["expected"] = len(recorder.sent) * args.listeners
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+        "duration": round(elapsed, 2),
+        "requests": {"total": total, "errors": sum(recorder.errors.values()), "throughput": round(total / elapsed, 2)},
+        "endpoints": {
+            label: summarise(values, recorder.errors[label]) for label, values in sorted(recorder.latencies.items())
+        },
+        "fanout": fanout,
+    }
+
+
+def print_report(report):
+    requests_ = report["requests"]
+    print(f"\n{requests_['total']} requests in {report['duration']} s, {requests_['throughput']} req/s, {requests_['errors']} errors")
+    print(f"{'endpoint':<28}{'count':>8}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, stats in report["endpoints"].items():
+        print(f"{label:<28}{stats['count']:>8}{stats['errors']:>8}{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}")
+    fanout = report["fanout"]
+    print(f"{'family_sync fan-out':<28}{fanout['count']:>8}{fanout['expected'] - fanout['count']:>8}"
+          f"{str(fanout['p50']):>10}{str(fanout['p95']):>10}{str(fanout['p99']):>10}")
+    print("(latencies in ms; for fan-out the errors column counts deliveries that never arrived)")
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for label, stats in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if not before or before["p95"] is None or stats["p95"] is None:
+            continue
+        if stats["p95"] > before["p95"] * (1 + threshold) and stats["p95"] - before["p95"] > REGRESSION_FLOOR_MS:
+            regressions.append(f"{label} p95 {before['p95']} -> {stats['p95']} ms")
+    before, after = baseline["requests"]["throughput"], report["requests"]["throughput"]
+    if after < before * (1 - threshold):
+        regressions.append(f"throughput {before} -> {after} req/s")
+    before, after = baseline.get("fanout", {}).get("p95"), report["fanout"]["p95"]
+    if before is not None and after is not None and after > before * (1 + threshold) and after - before > REGRESSION_FLOOR_MS:
+        regressions.append(f"fan-out p95 {before} -> {after} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Lumora API and Socket.IO fan-out.")
+    parser.add_argument("--families", type=int, default=10)
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=2000, help="seeded transactions per family")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--listeners", type=int, default=2, help="Socket.IO clients per family")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--think-time", type=float, default=0.1, help="mean pause between actions, seconds")
+    parser.add_argument("--login-ratio", type=float, default=0.05)
+    parser.add_argument("--burst-ratio", type=float, default=0.25)
+    parser.add_argument("--burst-size", type=int, default=5)
+    parser.add_argument("--bootstrap", action="store_true", help="refresh the dashboard through /api/bootstrap")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown before failing")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
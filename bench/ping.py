@@ -0,0 +1,144 @@
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+import websocket
+
+from loadtest import PASSWORD, boot_server, free_port, member_email, seed_database, summarise
+
+HEAVY_READ = "/api/transactions?type=income&limit=500"
+PROBE_NAMESPACE = "/probe"
+
+
+class PingProbe:
+    def __init__(self, base):
+        self.ws = websocket.create_connection(base.replace("http", "ws", 1) + "/socket.io/?EIO=4&transport=websocket", timeout=30)
+        self.ws.recv()
+
+    def ping(self):
+        started = time.perf_counter()
+        self.ws.send(f"40{PROBE_NAMESPACE},")
+        while True:
+            packet = self.ws.recv()
+            if packet == "2":
+                self.ws.send("3")
+            elif packet.startswith(("40" + PROBE_NAMESPACE, "44" + PROBE_NAMESPACE)):
+                break
+        elapsed = (time.perf_counter() - started) * 1000
+        if packet.startswith("40"):
+            self.ws.send(f"41{PROBE_NAMESPACE},")
+        return elapsed
+
+    def close(self):
+        self.ws.close()
+
+
+def probe(base, stop, interval, latencies):
+    pinger = PingProbe(base)
+    try:
+        while not stop.is_set():
+            latencies.append(pinger.ping())
+            stop.wait(interval)
+    finally:
+        pinger.close()
+
+
+def login(base, member):
+    session = requests.Session()
+    session.post(base + "/api/login", json={"email": member_email(0, member), "password": PASSWORD}, timeout=30)
+    return session
+
+
+def heavy_reader(base, member, stop, completed):
+    session = login(base, member)
+    while not stop.is_set():
+        session.get(base + HEAVY_READ, timeout=120)
+        completed["reads"] += 1
+
+
+def importer(base, member, rows, stop, completed):
+    session = login(base, member)
+    rng = random.Random(member)
+    while not stop.is_set():
+        body = "date,description,amount,category\n" + "".join(
+            f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d},ping bench {rng.random():.8f},-{rng.uniform(1, 300):.2f},Food\n"
+            for _ in range(rows)
+        )
+        session.post(base + "/api/transactions/import", files={"file": ("bench.csv", io.BytesIO(body.encode()))}, timeout=300)
+        completed["imports"] += 1
+
+
+def measure(base, args, readers, importers):
+    stop, latencies = threading.Event(), []
+    completed = {"reads": 0, "imports": 0}
+    threads = [threading.Thread(target=heavy_reader, args=(base, 1 + i % (args.members - 1), stop, completed)) for i in range(readers)]
+    threads += [threading.Thread(target=importer, args=(base, 0, args.import_rows, stop, completed)) for _ in range(importers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.warmup if threads else 0)
+    prober = threading.Thread(target=probe, args=(base, stop, args.interval, latencies))
+    prober.start()
+    time.sleep(args.duration)
+    stop.set()
+    prober.join()
+    for thread in threads:
+        thread.join()
+    return {**summarise(latencies), **completed}
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="lumora-ping-")
+    db_path = os.path.join(workdir, "ping.db")
+    print(f"Seeding {args.transactions} transactions into {db_path}")
+    seed_database(db_path, 1, args.members, args.transactions, args.seed)
+
+    scenarios = {
+        "idle": (0, 0),
+        "heavy reads": (args.readers, 0),
+        "reads + import": (args.readers, 1),
+    }
+    results = {}
+    with open(os.path.join(workdir, "server.log"), "w") as log:
+        server, base = boot_server(db_path, args.port or free_port(), log)
+        try:
+            for label, (readers, importers) in scenarios.items():
+                results[label] = measure(base, args, readers, importers)
+                stats = results[label]
+                print(f"{label:<16} ping p50 {stats['p50']:>8} ms  p99 {stats['p99']:>8} ms  max {stats['max']:>8} ms  "
+                      f"{stats['count']} probes, {stats['reads']} reads, {stats['imports']} imports")
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+    return {"config": {key: value for key, value in vars(args).items() if key != "json"}, "scenarios": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Socket.IO round-trip time while heavy queries run.")
+    parser.add_argument("--transactions", type=int, default=400000)
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--readers", type=int, default=4, help="clients repeating a 500-row listing")
+    parser.add_argument("--import-rows", type=int, default=3000)
+    parser.add_argument("--duration", type=float, default=8, help="seconds of probing per scenario")
+    parser.add_argument("--warmup", type=float, default=1)
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between probes, seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
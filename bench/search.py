@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MERCHANTS = (
+    "Tesco", "Sainsbury", "Lidl", "Aldi", "Shell", "Uber", "Netflix", "Spotify", "Amazon", "Ikea",
+    "Boots", "Pret", "Starbucks", "Costa", "Trainline", "Vodafone", "Octopus", "Thames Water", "Deliveroo", "Airbnb",
+)
+WORDS = (
+    "groceries", "weekly", "shop", "fuel", "ride", "subscription", "coffee", "lunch", "dinner", "rent",
+    "refund", "gift", "birthday", "school", "uniform", "books", "holiday", "deposit", "repair", "insurance",
+)
+CATEGORIES = ("Food", "Transport", "Housing", "Utilities", "Entertainment", "Health", "Others", "Salary", "Investment")
+QUERIES = (
+    ("single term", {"q": "coffee"}),
+    ("prefix", {"q": "sub"}),
+    ("two terms", {"q": "tesco groceries"}),
+    ("category", {"q": "transport"}),
+    ("rare term", {"q": "uniform repair"}),
+    ("term + amount", {"q": "fuel", "minAmount": "50", "maxAmount": "150"}),
+    ("term + dates", {"q": "holiday", "from": "2025-06-01", "to": "2025-08-31"}),
+    ("second page", {"q": "coffee", "page": 2}),
+)
+
+
+def seed(path, families, rows, seed_value):
+    os.environ["DATABASE_PATH"] = path
+    os.environ["SCHEDULER_ENABLED"] = "0"
+    sys.path.insert(0, ROOT)
+    from backend import create_app
+
+    app = create_app()
+    rng = random.Random(seed_value)
+    conn = sqlite3.connect(path)
+    members = []
+    with conn:
+        for index in range(families):
+            user_id = conn.execute(
+                "INSERT INTO users (first_name, email, password, role) VALUES ('Bench', ?, 'x', 'admin')",
+                (f"search{index}@bench.local",),
+            ).lastrowid
+            family_id = conn.execute(
+                "INSERT INTO families (name, created_by, invite_code) VALUES (?, ?, ?)",
+                (f"Search bench {index}", user_id, f"SEARCH{index}"),
+            ).lastrowid
+            conn.execute("UPDATE users SET family_id = ? WHERE id = ?", (family_id, user_id))
+            category_ids = [
+                conn.execute(
+                    "INSERT INTO categories (family_id, name, type, is_default) VALUES (?, ?, ?, 1)",
+                    (family_id, name, "income" if name in ("Salary", "Investment") else "expense"),
+                ).lastrowid
+                for name in CATEGORIES
+            ]
+            members.append((user_id, family_id, category_ids))
+    started = time.perf_counter()
+    total = rows * families
+    for offset in range(0, total, 50000):
+        batch = []
+        for _ in range(min(50000, total - offset)):
+            user_id, family_id, category_ids = rng.choice(members)
+            batch.append((
+                user_id, family_id, round(rng.uniform(1, 400), 2),
+                f"{rng.choice(MERCHANTS)} {' '.join(rng.sample(WORDS, rng.randint(1, 3)))}",
+                "expense", f"{rng.randint(2020, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00",
+                rng.choice(category_ids),
+            ))
+        with conn:
+            conn.executemany(
+                "INSERT INTO transactions (user_id, family_id, amount, description, type, date, category_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+    conn.close()
+    print(f"Seeded {total} transactions across {families} families in {time.perf_counter() - started:.1f} s")
+    return app, members[0][0]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+
+def run(args):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="lumora-search-"), "search.db")
+    app, user_id = seed(db_path, args.families, args.rows, args.seed)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = user_id
+
+    results = {}
+    for label, params in QUERIES:
+        params = dict(params, limit=args.limit)
+        page = params.pop("page", 1)
+        timings, hits = [], 0
+        for _ in range(args.repeat):
+            query = dict(params)
+            for _ in range(page - 1):
+                query["cursor"] = client.get("/api/transactions/search", query_string=query).json["next_cursor"]
+            started = time.perf_counter()
+            response = client.get("/api/transactions/search", query_string=query)
+            timings.append((time.perf_counter() - started) * 1000)
+            hits = len(response.json["items"])
+        results[label] = {"p50": percentile(timings, 0.5), "p95": percentile(timings, 0.95), "items": hits}
+        print(f"{label:<18} p50 {results[label]['p50']:>8} ms   p95 {results[label]['p95']:>8} ms   {hits} items")
+    return {"families": args.families, "rows": args.rows, "limit": args.limit, "queries": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark transaction full-text search across several large families.")
+    parser.add_argument("--families", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=250000, help="seeded transactions per family")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,10 @@ export const state = {
   roleChartInstance: null,
   incomeChartInstance: null,
   categoriesCache: [],
+  goalsCache: [],
+  budgetsCache: [],
+  analyticsSummary: null,
+  familyRevision: null,
 };
 
 export const CATEGORY_COLORS = [
@@ -56,11 +60,22 @@ export async function apiCall(endpoint, method = "GET", body = null) {
   }
 }
 
+export function setUserContext(data) {
+  state.currentUser = { ...data, familyColor: "blue" };
+  return state.currentUser;
+}
+
 export async function refreshUserContext() {
   try {
-    const data = await apiCall("/api/me");
-    state.currentUser = { ...data, familyColor: "blue" };
-    return state.currentUser;
+    return setUserContext(await apiCall("/api/me"));
+  } catch {
+    return null;
+  }
+}
+
+export async function fetchBootstrap(sections) {
+  try {
+    return await apiCall(`/api/bootstrap?sections=${sections.join(",")}`);
   } catch {
     return null;
   }
@@ -68,7 +83,7 @@ export async function refreshUserContext() {
 
 export async function fetchFamilySnapshot() {
   try {
-    return await apiCall(`/api/family/members?t=${Date.now()}`);
+    return await apiCall("/api/family/members");
   } catch {
     return null;
   }
@@ -81,6 +96,25 @@ export async function loadComponent(name, targetId) {
   target.innerHTML = await res.text();
 }
 
+export async function loadComponents(targets) {
+  const names = Object.keys(targets);
+  let fragments = null;
+  try {
+    const res = await fetch(`/api/components?names=${encodeURIComponent(names.join(","))}`);
+    if (res.ok) fragments = await res.json();
+  } catch {
+    fragments = null;
+  }
+  if (!fragments) {
+    await Promise.all(names.map((name) => loadComponent(name, targets[name])));
+    return;
+  }
+  names.forEach((name) => {
+    const target = document.getElementById(targets[name]);
+    if (target) target.innerHTML = fragments[name];
+  });
+}
+
 export function setupForm(formId, handler) {
   const form = document.getElementById(formId);
   if (!form) return;
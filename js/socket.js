@@ -2,6 +2,7 @@ import { SOCKET_URL, state, refreshUserContext } from "./core.js";
 import { pushActivityEvent, renderLiveEvents } from "./ui/activity.js";
 import { loadFamilyMembers, loadRoles } from "./ui/family.js";
 import { loadTransactions } from "./ui/transactions.js";
+import { loadAnalytics } from "./ui/analytics.js";
 import { loadGoals } from "./ui/goals.js";
 import { loadBudgets } from "./ui/budgets.js";
 import { loadCategories } from "./ui/categories.js";
@@ -37,47 +38,73 @@ export function joinSocketRoom(familyId) {
   }
 }
 
+function isNextRevision(payload) {
+  const expected =
+    state.familyRevision !== null && payload.revision === state.familyRevision + 1;
+  if (typeof payload.revision === "number") state.familyRevision = payload.revision;
+  return expected;
+}
+
+function applyDelta(rows, delta) {
+  const changed = new Map((delta.rows || []).map((r) => [r.id, r]));
+  if (delta.op === "deleted") return rows.filter((r) => !changed.has(r.id));
+  const merged = rows.map((r) => (changed.has(r.id) ? { ...r, ...changed.get(r.id) } : r));
+  const known = new Set(rows.map((r) => r.id));
+  const added = [...changed.values()].filter((r) => !known.has(r.id));
+  return delta.op === "created" ? [...added, ...merged] : [...merged, ...added];
+}
+
+function handleDelta(event, inOrder, cache, load) {
+  if (inOrder && Array.isArray(event.deltas)) load(event.deltas.reduce(applyDelta, cache()));
+  else load();
+}
+
+function resetRevision() {
+  state.familyRevision = null;
+}
+
 export function setupSocketListeners() {
   if (!state.socket || !state.currentUser?.familyId) return;
   const familyRoomId = state.currentUser.familyId;
 
-  state.socket.off("update_members");
-  state.socket.off("update_transactions");
-  state.socket.off("update_goals");
-  state.socket.off("update_budgets");
-  state.socket.off("update_roles");
-  state.socket.off("update_family");
-  state.socket.off("update_categories");
+  state.socket.off("family_sync");
   state.socket.off("activity_event");
   state.socket.off("activity_sync");
 
-  state.socket.on("update_members", (payload) => {
-    if (payload.family_id === familyRoomId) {
+  state.socket.off("connect", resetRevision);
+  state.socket.on("connect", resetRevision);
+
+  const syncHandlers = {
+    update_members: () => {
       loadFamilyMembers();
       loadRoles();
-    }
-  });
-  state.socket.on("update_transactions", (payload) => {
-    if (payload.family_id === familyRoomId) loadTransactions();
-  });
-  state.socket.on("update_goals", (payload) => {
-    if (payload.family_id === familyRoomId) loadGoals();
-  });
-  state.socket.on("update_budgets", (payload) => {
-    if (payload.family_id === familyRoomId) loadBudgets();
-  });
-  state.socket.on("update_roles", (payload) => {
-    if (payload.family_id === familyRoomId) loadRoles();
-  });
-  state.socket.on("update_categories", (payload) => {
-    if (payload.family_id === familyRoomId) loadCategories();
-  });
-  state.socket.on("update_family", async (payload) => {
-    if (payload.family_id === familyRoomId) {
+    },
+    update_transactions: (event, inOrder) => {
+      handleDelta(event, inOrder, () => state.transactionsCache, loadTransactions);
+      loadAnalytics();
+    },
+    update_goals: (event, inOrder) =>
+      handleDelta(event, inOrder, () => state.goalsCache, loadGoals),
+    update_budgets: (event, inOrder) =>
+      handleDelta(event, inOrder, () => state.budgetsCache, loadBudgets),
+    update_roles: () => loadRoles(),
+    update_categories: () => loadCategories(),
+    update_family: async () => {
       await refreshUserContext();
       window.dispatchEvent(new CustomEvent("family_updated"));
       loadFamilyMembers();
-    }
+    },
+  };
+
+  state.socket.on("family_sync", (payload) => {
+    if (payload.family_id !== familyRoomId) return;
+    const inOrder = isNextRevision(payload);
+    Object.entries(payload.events || {}).forEach(([name, event]) =>
+      syncHandlers[name]?.(event, inOrder),
+    );
+    (payload.activity || []).forEach((event) =>
+      pushActivityEvent({ ...event, ts: event.ts || Date.now() }),
+    );
   });
   state.socket.on("activity_event", (payload) => {
     if (payload.family_id === familyRoomId) {
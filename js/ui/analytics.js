@@ -0,0 +1,57 @@
+import { apiCall, state } from "../core.js";
+import { renderSpendingChart, renderRoleSpendingChart, renderChildSpendingStats, renderIncomeChart, renderPersonSpendingChart, renderPersonIncomeChart, renderRoleIncomeChart } from "./chart.js";
+
+function isoDate(d) {
+  return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}-${String(d.getDate()).padStart(2, "0")}`;
+}
+
+function totalsBy(groups = [], type, keyOf) {
+  return groups
+    .filter((g) => g.type === type)
+    .reduce((acc, g) => {
+      const key = keyOf(g);
+      acc[key] = (acc[key] || 0) + (Number(g.amount) || 0);
+      return acc;
+    }, {});
+}
+
+const memberName = (m) =>
+  `${(m.first_name || "").trim()} ${(m.last_name || "").trim()}`.trim() || "Unknown";
+
+export async function loadAnalytics() {
+  try {
+    const now = new Date();
+    const monthStart = isoDate(new Date(now.getFullYear(), now.getMonth(), 1));
+    const monthEnd = isoDate(new Date(now.getFullYear(), now.getMonth() + 1, 0));
+    const [summary, month] = await Promise.all([
+      apiCall("/api/analytics/summary"),
+      apiCall(`/api/analytics/summary?from=${monthStart}&to=${monthEnd}`),
+    ]);
+    state.analyticsSummary = summary;
+
+    updateTransactionStats(summary.totals);
+    renderSpendingChart(totalsBy(summary.by_category, "expense", (g) => g.category || "Other"));
+    renderIncomeChart(totalsBy(summary.by_category, "income", (g) => g.category || "Other"));
+    renderRoleSpendingChart(totalsBy(summary.by_role, "expense", (g) => g.role));
+    renderRoleIncomeChart(totalsBy(summary.by_role, "income", (g) => g.role));
+    try { renderPersonSpendingChart(totalsBy(summary.by_member, "expense", memberName)); } catch {}
+    try { renderPersonIncomeChart(totalsBy(summary.by_member, "income", memberName)); } catch {}
+    renderChildSpendingStats(
+      totalsBy(
+        month.by_member.filter((m) => m.role === "child"),
+        "expense",
+        (m) => m.first_name || "Unknown Child",
+      ),
+    );
+  } catch {}
+}
+
+function updateTransactionStats(totals = {}) {
+  const balanceEl = document.getElementById("totalBalance");
+  const incomeEl = document.getElementById("monthlyIncome");
+  const expensesEl = document.getElementById("monthlyExpenses");
+
+  if (balanceEl) balanceEl.textContent = `$${(Number(totals.balance) || 0).toFixed(2)}`;
+  if (incomeEl) incomeEl.textContent = `$${(Number(totals.income) || 0).toFixed(2)}`;
+  if (expensesEl) expensesEl.textContent = `$${(Number(totals.expense) || 0).toFixed(2)}`;
+}
@@ -1,7 +1,7 @@
 import { apiCall, setupForm, validateAmount, validateString, state } from "../core.js";
 import { loadTransactions } from "./transactions.js";
 
-export async function loadBudgets() {
+export async function loadBudgets(prefetched = null) {
   try {
     const addBtn = document.getElementById("addBudgetBtn");
     if (addBtn) {
@@ -12,7 +12,9 @@ export async function loadBudgets() {
         }
     }
 
-    const budgets = await apiCall(`/api/budgets?t=${Date.now()}`);
+    const budgets =
+      prefetched ?? (await apiCall("/api/budgets"));
+    state.budgetsCache = budgets;
     const list = document.getElementById("budgetsList");
     const totalLimitEl = document.getElementById("budgetTotalLimit");
     const totalSpentEl = document.getElementById("budgetTotalSpent");
@@ -1,8 +1,8 @@
 import { apiCall, state, renderMoney } from "../core.js";
 
-export async function loadCategories() {
+export async function loadCategories(prefetched = null) {
   try {
-    const categories = await apiCall("/api/categories");
+    const categories = prefetched ?? (await apiCall("/api/categories"));
     state.categories = categories; // Store in global state for other modules
     renderCategories(categories);
     updateCategoryDropdowns(categories);
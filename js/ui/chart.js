@@ -1,18 +1,11 @@
 import { CATEGORY_COLORS, state } from "../core.js";
 
-export function renderSpendingChart(transactions = []) {
+export function renderSpendingChart(totals = {}) {
   const ctx = document.getElementById("spendingChart");
   const legend = document.getElementById("spendingLegend");
   const totalDisplay = document.getElementById("chartTotalAmount");
   if (!ctx || !legend) return;
 
-  const expenses = transactions.filter((t) => t.type !== "income");
-  const totals = expenses.reduce((acc, tx) => {
-    const key = tx.category || "Other";
-    acc[key] = (acc[key] || 0) + Math.abs(Number(tx.amount) || 0);
-    return acc;
-  }, {});
-
   const entries = Object.entries(totals).sort((a, b) => b[1] - a[1]);
   const totalAmount = entries.reduce((sum, [, value]) => sum + value, 0);
 
@@ -132,19 +125,12 @@ export function renderSpendingChart(transactions = []) {
   } catch {}
 }
 
-export function renderRoleSpendingChart(transactions = []) {
+export function renderRoleSpendingChart(totals = {}) {
   const ctx = document.getElementById("roleSpendingChart");
   const legend = document.getElementById("roleSpendingLegend");
   const totalDisplay = document.getElementById("roleChartTotal");
   if (!ctx || !legend) return;
 
-  const expenses = transactions.filter((t) => t.type !== "income");
-  const totals = expenses.reduce((acc, tx) => {
-    const key = (tx.role || "unknown").toLowerCase();
-    acc[key] = (acc[key] || 0) + Math.abs(Number(tx.amount) || 0);
-    return acc;
-  }, {});
-
   const entries = Object.entries(totals).sort((a, b) => b[1] - a[1]);
   const totalAmount = entries.reduce((sum, [, value]) => sum + value, 0);
 
@@ -237,19 +223,12 @@ export function renderRoleSpendingChart(transactions = []) {
     .join("");
 }
 
-export function renderRoleIncomeChart(transactions = []) {
+export function renderRoleIncomeChart(totals = {}) {
   const ctx = document.getElementById("roleIncomeChart");
   const legend = document.getElementById("roleIncomeLegend");
   const totalDisplay = document.getElementById("roleIncomeTotal");
   if (!ctx || !legend) return;
 
-  const income = transactions.filter((t) => t.type === "income");
-  const totals = income.reduce((acc, tx) => {
-    const key = (tx.role || "unknown").toLowerCase();
-    acc[key] = (acc[key] || 0) + Math.abs(Number(tx.amount) || 0);
-    return acc;
-  }, {});
-
   const entries = Object.entries(totals).sort((a, b) => b[1] - a[1]);
   const totalAmount = entries.reduce((sum, [, value]) => sum + value, 0);
 
@@ -342,34 +321,18 @@ export function renderRoleIncomeChart(transactions = []) {
     .join("");
 }
 
-export function renderChildSpendingStats(transactions = []) {
+export function renderChildSpendingStats(byChild = {}) {
   const list = document.getElementById("childSpendingList");
   if (!list) return;
 
   const now = new Date();
-  const currentMonth = now.getMonth();
   const currentYear = now.getFullYear();
 
-  const childExpenses = transactions.filter(t => {
-      const d = new Date(t.date);
-      const role = (t.role || "").toLowerCase();
-      return t.type !== 'income' && 
-             role === 'child' &&
-             d.getMonth() === currentMonth && 
-             d.getFullYear() === currentYear;
-  });
-
-  if (!childExpenses.length) {
+  if (!Object.keys(byChild).length) {
       list.innerHTML = '<p class="text-center text-slate-400 py-6">No spending for children this month.</p>';
       return;
   }
 
-  const byChild = childExpenses.reduce((acc, t) => {
-      const name = t.first_name || 'Unknown Child';
-      acc[name] = (acc[name] || 0) + Math.abs(Number(t.amount) || 0);
-      return acc;
-  }, {});
-
   const entries = Object.entries(byChild).sort((a,b) => b[1] - a[1]);
   
   const monthName = now.toLocaleString('default', { month: 'long' });
@@ -389,19 +352,12 @@ export function renderChildSpendingStats(transactions = []) {
   `).join('')}`;
 }
 
-export function renderPersonSpendingChart(transactions = []) {
+export function renderPersonSpendingChart(totals = {}) {
   const ctx = document.getElementById("personSpendingChart");
   const legend = document.getElementById("personSpendingLegend");
   const totalDisplay = document.getElementById("personSpendingTotal");
   if (!ctx || !legend) return;
 
-  const expenses = transactions.filter((t) => t.type !== "income");
-  const totals = expenses.reduce((acc, tx) => {
-    const name = `${(tx.first_name || "").trim()} ${(tx.last_name || "").trim()}`.trim() || "Unknown";
-    acc[name] = (acc[name] || 0) + Math.abs(Number(tx.amount) || 0);
-    return acc;
-  }, {});
-
   const entries = Object.entries(totals).sort((a, b) => b[1] - a[1]);
   const totalAmount = entries.reduce((sum, [, value]) => sum + value, 0);
   if (totalDisplay) totalDisplay.textContent = `$${totalAmount.toLocaleString(undefined, { maximumFractionDigits: 0 })}`;
@@ -451,19 +407,12 @@ export function renderPersonSpendingChart(transactions = []) {
   }).join("");
 }
 
-export function renderPersonIncomeChart(transactions = []) {
+export function renderPersonIncomeChart(totals = {}) {
   const ctx = document.getElementById("personIncomeChart");
   const legend = document.getElementById("personIncomeLegend");
   const totalDisplay = document.getElementById("personIncomeTotal");
   if (!ctx || !legend) return;
 
-  const incomes = transactions.filter((t) => t.type === "income");
-  const totals = incomes.reduce((acc, tx) => {
-    const name = `${(tx.first_name || "").trim()} ${(tx.last_name || "").trim()}`.trim() || "Unknown";
-    acc[name] = (acc[name] || 0) + Math.abs(Number(tx.amount) || 0);
-    return acc;
-  }, {});
-
   const entries = Object.entries(totals).sort((a, b) => b[1] - a[1]);
   const totalAmount = entries.reduce((sum, [, value]) => sum + value, 0);
   if (totalDisplay) totalDisplay.textContent = `$${totalAmount.toLocaleString(undefined, { maximumFractionDigits: 0 })}`;
@@ -513,19 +462,12 @@ export function renderPersonIncomeChart(transactions = []) {
   }).join("");
 }
 
-export function renderIncomeChart(transactions = []) {
+export function renderIncomeChart(totals = {}) {
   const ctx = document.getElementById("incomeChart");
   const legend = document.getElementById("incomeLegend");
   const totalDisplay = document.getElementById("incomeChartTotal");
   if (!ctx || !legend) return;
 
-  const income = transactions.filter((t) => t.type === "income");
-  const totals = income.reduce((acc, tx) => {
-    const key = tx.category || "Other";
-    acc[key] = (acc[key] || 0) + Math.abs(Number(tx.amount) || 0);
-    return acc;
-  }, {});
-
   const entries = Object.entries(totals).sort((a, b) => b[1] - a[1]);
   const totalAmount = entries.reduce((sum, [, value]) => sum + value, 0);
 
@@ -2,9 +2,11 @@ import {
   state,
   navigate,
   refreshUserContext,
+  setUserContext,
+  fetchBootstrap,
   apiCall,
   setupForm,
-  loadComponent,
+  loadComponents,
 } from "../core.js";
 import { loadFamilyMembers, loadRoles } from "./family.js";
 import {
@@ -15,29 +17,33 @@ import {
 import { loadGoals, initGoalForm, initGoalAdjustForm } from "./goals.js";
 import { loadBudgets, initBudgetForm } from "./budgets.js";
 import { loadCategories, initCategoryForm } from "./categories.js";
+import { loadAnalytics } from "./analytics.js";
 import { joinSocketRoom, setupSocketListeners } from "../socket.js";
 import { renderLiveEvents } from "./activity.js";
 import { initFamilyForms } from "./auth.js";
 
+const BOOTSTRAP_SECTIONS = ["me", "budgets", "goals", "categories", "members", "activity"];
+
 export async function initDashboardPage() {
-  await Promise.all([
-    loadComponent("dashboard/sidebar", "container-sidebar"),
-    loadComponent("dashboard/header", "container-header"),
-    loadComponent("dashboard/family-selection", "container-family-selection"),
-    loadComponent("dashboard/quick-actions", "comp-quick-actions"),
-    loadComponent("dashboard/stats", "comp-stats"),
-    loadComponent("dashboard/family", "comp-family"),
-    loadComponent("dashboard/goals", "comp-goals"),
-    loadComponent("dashboard/budgets", "comp-budgets"),
-    loadComponent("dashboard/live-events", "comp-live-events"),
-    loadComponent("dashboard/transactions", "comp-transactions"),
-    loadComponent("dashboard/roles", "comp-roles"),
-    loadComponent("dashboard/settings", "comp-settings"),
-    loadComponent("dashboard/analytics", "comp-analytics"),
-    loadComponent("dashboard/modals", "container-modals"),
-  ]);
+  await loadComponents({
+    "dashboard/sidebar": "container-sidebar",
+    "dashboard/header": "container-header",
+    "dashboard/family-selection": "container-family-selection",
+    "dashboard/quick-actions": "comp-quick-actions",
+    "dashboard/stats": "comp-stats",
+    "dashboard/family": "comp-family",
+    "dashboard/goals": "comp-goals",
+    "dashboard/budgets": "comp-budgets",
+    "dashboard/live-events": "comp-live-events",
+    "dashboard/transactions": "comp-transactions",
+    "dashboard/roles": "comp-roles",
+    "dashboard/settings": "comp-settings",
+    "dashboard/analytics": "comp-analytics",
+    "dashboard/modals": "container-modals",
+  });
 
-  const user = await refreshUserContext();
+  const boot = await fetchBootstrap(BOOTSTRAP_SECTIONS);
+  const user = boot?.me ? setUserContext(boot.me) : await refreshUserContext();
   if (!user) {
     navigate("/login");
     return;
@@ -55,7 +61,7 @@ export async function initDashboardPage() {
   joinSocketRoom(user.familyId);
   state.activityFeed = [];
   renderLiveEvents();
-  await loadActivityHistory();
+  await loadActivityHistory(boot?.activity);
   initSidebarNavigation();
   setupQuickActions();
   initTransactionForm();
@@ -67,14 +73,15 @@ export async function initDashboardPage() {
   initSettingsForms();
   populateSettingsForms();
 
-  await loadCategories();
+  await loadCategories(boot?.categories);
 
   await Promise.all([
-    loadFamilyMembers(),
+    loadFamilyMembers(boot?.members),
     loadTransactions(),
-    loadGoals(),
-    loadBudgets(),
-    loadRoles(),
+    loadAnalytics(),
+    loadGoals(boot?.goals),
+    loadBudgets(boot?.budgets),
+    loadRoles(boot?.members),
   ]);
 
   setupSocketListeners();
@@ -105,9 +112,9 @@ function toggleDashboardLayout(hasFamily) {
   if (dash) dash.classList.toggle("hidden", !hasFamily);
 }
 
-async function loadActivityHistory() {
+async function loadActivityHistory(prefetched = null) {
   try {
-    const data = await apiCall(`/api/activity?t=${Date.now()}`);
+    const data = prefetched ?? (await apiCall(`/api/activity?t=${Date.now()}`));
     if (Array.isArray(data?.events)) {
       state.activityFeed = [...data.events]
         .sort((a, b) => (b.ts || 0) - (a.ts || 0))
@@ -1,8 +1,8 @@
 import { fetchFamilySnapshot, apiCall, state, showToast } from "../core.js";
 
-export async function loadFamilyMembers() {
+export async function loadFamilyMembers(prefetched = null) {
   try {
-    const data = await fetchFamilySnapshot();
+    const data = prefetched ?? (await fetchFamilySnapshot());
     if (!data) return;
 
     const inviteEl = document.getElementById("familyInviteCode");
@@ -79,9 +79,9 @@ async function removeFamilyMember(memberId) {
   }
 }
 
-export async function loadRoles() {
+export async function loadRoles(prefetched = null) {
   try {
-    const data = await fetchFamilySnapshot();
+    const data = prefetched ?? (await fetchFamilySnapshot());
     const list = document.getElementById("memberRolesList");
     if (!data || !list) return;
 
@@ -1,6 +1,6 @@
 import { apiCall, setupForm, validateAmount, validateString, state } from "../core.js";
 
-export async function loadGoals() {
+export async function loadGoals(prefetched = null) {
   try {
     const addBtn = document.getElementById("addGoalBtn");
     const isChild = state.currentUser?.role === 'child';
@@ -12,7 +12,8 @@ export async function loadGoals() {
       }
     }
 
-    const goals = await apiCall(`/api/goals?t=${Date.now()}`);
+    const goals = prefetched ?? (await apiCall("/api/goals"));
+    state.goalsCache = goals;
     const list = document.getElementById("goalsList");
     if (!list) return;
     if (!goals.length) {
@@ -1,55 +1,21 @@
 import { apiCall, state, setupForm, validateAmount, validateString } from "../core.js";
-import { renderSpendingChart, renderRoleSpendingChart, renderChildSpendingStats, renderIncomeChart, renderPersonSpendingChart, renderPersonIncomeChart, renderRoleIncomeChart } from "./chart.js";
+import { loadAnalytics } from "./analytics.js";
 
 const TRANSACTION_PAGE_SIZE = 5;
 let transactionPage = 1;
 
-export async function loadTransactions() {
+export async function loadTransactions(prefetched = null) {
   try {
-    state.transactionsCache = await apiCall(
-      `/api/transactions?t=${Date.now()}`,
-    );
-    updateTransactionStats(state.transactionsCache);
+    state.transactionsCache =
+      prefetched ?? (await apiCall("/api/transactions"));
     transactionPage = 1; 
     renderTransactions();
     renderRecurringBills(state.transactionsCache);
-    renderSpendingChart(state.transactionsCache);
-    renderRoleSpendingChart(state.transactionsCache);
-    renderRoleIncomeChart(state.transactionsCache);
-    renderChildSpendingStats(state.transactionsCache);
-    try { renderPersonSpendingChart(state.transactionsCache); } catch {}
-    renderIncomeChart(state.transactionsCache);
-    try { renderPersonIncomeChart(state.transactionsCache); } catch {}
 
     if (typeof lucide !== "undefined") lucide.createIcons();
   } catch {}
 }
 
-function updateTransactionStats(transactions = []) {
-  const balanceEl = document.getElementById("totalBalance");
-  const incomeEl = document.getElementById("monthlyIncome");
-  const expensesEl = document.getElementById("monthlyExpenses");
-
-  let totalBalance = 0;
-  let income = 0;
-  let expenses = 0;
-
-  transactions.forEach((t) => {
-    const amount = Number(t.amount) || 0;
-    if (t.type === "income") {
-      income += amount;
-      totalBalance += amount;
-    } else {
-      expenses += amount;
-      totalBalance -= amount;
-    }
-  });
-
-  if (balanceEl) balanceEl.textContent = `$${totalBalance.toFixed(2)}`;
-  if (incomeEl) incomeEl.textContent = `$${income.toFixed(2)}`;
-  if (expensesEl) expensesEl.textContent = `$${expenses.toFixed(2)}`;
-}
-
 function renderTransactions() {
   const list = document.getElementById("recentTransactionsList");
   if (!list) return;
@@ -57,7 +23,6 @@ function renderTransactions() {
   if (!state.transactionsCache.length) {
     list.innerHTML =
       '<p class="text-center text-slate-400 py-8">No transactions yet.</p>';
-    renderSpendingChart([]);
     return;
   }
 
@@ -314,6 +279,7 @@ export function initTransactionForm() {
     form.reset();
     if (recurringFields) recurringFields.classList.add("hidden");
     loadTransactions();
+    loadAnalytics();
   });
 }
 
@@ -322,6 +288,7 @@ async function deleteTransaction(id) {
   try {
     await apiCall(`/api/transactions/${id}`, "DELETE");
     loadTransactions();
+    loadAnalytics();
   } catch (err) {
     console.error("Failed to delete transaction:", err);
   }
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="lumora-tests-"), "test.db")
+os.environ["SCHEDULER_ENABLED"] = "0"
+sys.path.insert(0, ROOT)
+
+from backend import create_app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def make_family(app):
+    from backend.database import unit_of_work
+
+    def make(members=2):
+        with unit_of_work() as conn:
+            user_ids = [
+                conn.execute(
+                    "INSERT INTO users (first_name, email, password, role) VALUES (?, ?, 'x', ?)",
+                    (f"Member{i}", f"{uuid.uuid4().hex}@test.local", "admin" if i == 0 else "parent"),
+                ).lastrowid
+                for i in range(members)
+            ]
+            family_id = conn.execute(
+                "INSERT INTO families (name, created_by, invite_code) VALUES ('Test family', ?, ?)",
+                (user_ids[0], uuid.uuid4().hex[:8]),
+            ).lastrowid
+            conn.executemany("UPDATE users SET family_id = ? WHERE id = ?", [(family_id, uid) for uid in user_ids])
+        return family_id, user_ids
+
+    return make
+
+
+@pytest.fixture
+def login(app):
+    def client_for(user_id):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = user_id
+        return client
+
+    return client_for
@@ -0,0 +1,34 @@
+from backend.extensions import socketio
+from backend.socket_events import emit_activity
+
+
+def test_activity_pages_are_newest_first(app, make_family, login):
+    family_id, (user_id, _) = make_family()
+    with app.app_context():
+        for i in range(5):
+            emit_activity(family_id, f"Event {i}")
+    client = login(user_id)
+
+    recent = client.get("/api/activity").json
+    titles = [event["title"] for event in recent["events"]]
+    assert titles == [f"Event {i}" for i in reversed(range(5))]
+    assert recent["next_before"] == recent["events"][-1]["ts"]
+
+    page = client.get("/api/activity", query_string={"before": recent["events"][0]["ts"] + 1, "limit": 3}).json
+    assert [event["title"] for event in page["events"]] == titles[:3]
+
+
+def test_join_family_room_does_not_leak_activity(app, make_family, login):
+    family_id, (user_id, _) = make_family()
+    with app.app_context():
+        emit_activity(family_id, "Private event")
+
+    anonymous = socketio.test_client(app)
+    anonymous.emit("join_family_room", {"family_id": family_id})
+    assert [event for event in anonymous.get_received() if event["name"] == "activity_sync"] == []
+
+    member = socketio.test_client(app, flask_test_client=login(user_id))
+    member.get_received()
+    member.emit("join_family_room", {"family_id": family_id})
+    syncs = [event["args"][0] for event in member.get_received() if event["name"] == "activity_sync"]
+    assert [event["title"] for event in syncs[0]["events"]] == ["Private event"]
@@ -0,0 +1,12 @@
+from backend.database import unit_of_work
+
+
+def test_budget_with_unmapped_category_is_listed(app, make_family, login):
+    family_id, (user_id, _) = make_family()
+    with unit_of_work() as conn:
+        budget_id = conn.execute(
+            "INSERT INTO budgets (family_id, category_id, amount, period) VALUES (?, -1, 50, 'monthly')", (family_id,)
+        ).lastrowid
+
+    budgets = login(user_id).get("/api/budgets").get_json()
+    assert [(b["id"], b["category"], b["spent"]) for b in budgets] == [(budget_id, None, 0)]
@@ -0,0 +1,23 @@
+import sqlite3
+import time
+import uuid
+
+from backend.cache import SQLiteCache
+from backend.database import DB_PATH
+
+
+def test_sqlite_fill_does_not_wait_for_a_running_write(app):
+    cache, key = SQLiteCache(), f"user:{uuid.uuid4().hex}"
+    other_worker = sqlite3.connect(DB_PATH, isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        cache.set(key, {"id": 1}, 30)
+        assert time.perf_counter() - started < 1
+    finally:
+        other_worker.execute("ROLLBACK")
+        other_worker.close()
+    assert cache.get(key) is None
+
+    cache.set(key, {"id": 1}, 30)
+    assert cache.get(key) == {"id": 1}
@@ -0,0 +1,28 @@
+from backend.metrics import COUNTERS
+
+
+def unhandled_total():
+    return sum(value for (name, _), value in COUNTERS.items() if name == "unhandled_exceptions_total")
+
+
+def test_http_errors_keep_their_status(app, make_family, login):
+    _, (user_id, _) = make_family()
+    before = unhandled_total()
+
+    response = login(user_id).post("/api/family")
+    assert response.status_code == 405
+    assert "PATCH" in response.headers["Allow"]
+    assert response.json["error"]
+    assert unhandled_total() == before
+
+
+def test_unexpected_errors_are_counted(app, make_family, login, monkeypatch):
+    from backend.routes import goals
+
+    _, (user_id, _) = make_family()
+    monkeypatch.setattr(goals, "query_db", lambda *args, **kwargs: 1 / 0)
+    before = unhandled_total()
+
+    response = login(user_id).delete("/api/goals/1")
+    assert response.status_code == 500
+    assert unhandled_total() == before + 1
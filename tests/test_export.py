@@ -0,0 +1,21 @@
+import sqlite3
+
+import pytest
+
+from backend import database
+
+
+def test_export_aborts_on_a_database_error_mid_stream(app, make_family, login, monkeypatch):
+    family_id, (user_id, _) = make_family()
+
+    def failing_stream(sql, args=(), size=500):
+        yield [{"id": 1, "date": "2026-03-01", "type": "expense", "amount": 5, "category": "Food",
+                "description": "coffee", "member": "Member0", "role": "admin", "recurrence": None}]
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(database.executor, "stream", failing_stream)
+    response = login(user_id).get("/api/transactions/export?format=ndjson", buffered=False)
+    chunks = response.iter_encoded()
+    assert b"coffee" in next(chunks)
+    with pytest.raises(sqlite3.OperationalError):
+        next(chunks)
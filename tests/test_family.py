@@ -0,0 +1,34 @@
+import uuid
+
+from backend.database import unit_of_work
+
+
+def members_etag(client):
+    response = client.get("/api/family/members")
+    return response.headers["ETag"], [member["id"] for member in response.get_json()["members"]]
+
+
+def test_join_refreshes_the_family_left_behind(app, make_family, login):
+    family_id, (admin, leaver) = make_family()
+    other_family, _ = make_family()
+    code = uuid.uuid4().hex[:6].upper()
+    with unit_of_work() as conn:
+        conn.execute("UPDATE families SET invite_code = ? WHERE id = ?", (code, other_family))
+    client = login(admin)
+    etag, _ = members_etag(client)
+
+    assert login(leaver).post("/api/families/join", json={"code": code}).status_code == 200
+
+    assert client.get("/api/family/members", headers={"If-None-Match": etag}).status_code == 200
+    assert members_etag(client)[1] == [admin]
+
+
+def test_creating_a_family_refreshes_the_family_left_behind(app, make_family, login):
+    family_id, (admin, leaver) = make_family()
+    client = login(admin)
+    etag, _ = members_etag(client)
+
+    assert login(leaver).post("/api/families", json={"name": "New home"}).status_code == 201
+
+    assert client.get("/api/family/members", headers={"If-None-Match": etag}).status_code == 200
+    assert members_etag(client)[1] == [admin]
@@ -0,0 +1,40 @@
+import io
+import sqlite3
+
+from backend.routes import transactions
+from backend.state import get_state_store
+
+
+def csv_upload(rows, tail=""):
+    body = "date,description,amount,category\n" + "".join(f"2026-03-01,import {i},-{i + 1}.50,Food\n" for i in range(rows)) + tail
+    return {"file": (io.BytesIO(body.encode()), "import.csv")}
+
+
+def test_non_finite_amounts_are_skipped(app, make_family, login):
+    family_id, (user_id, _) = make_family()
+    response = login(user_id).post("/api/transactions/import", data=csv_upload(600, "2026-03-02,broken,nan,Food\n2026-03-02,broken,inf,Food\n"))
+
+    assert response.status_code == 201
+    assert (response.get_json()["imported"], response.get_json()["skipped"]) == (600, 2)
+
+
+def test_failed_chunk_reports_committed_rows(app, make_family, login, monkeypatch):
+    family_id, (user_id, _) = make_family()
+    record_spend_since = transactions.record_spend_since
+    calls = []
+
+    def fail_second_chunk(conn, *args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("disk I/O error")
+        record_spend_since(conn, *args)
+
+    monkeypatch.setattr(transactions, "record_spend_since", fail_second_chunk)
+    response = login(user_id).post("/api/transactions/import", data=csv_upload(700))
+
+    body = response.get_json()
+    assert response.status_code == 500
+    assert (body["imported"], body["partial"], body["error"]) == (500, True, "disk I/O error")
+    assert get_state_store().recent_activity(family_id)[0]["title"] == "Transactions imported"
+    listing = login(user_id).get("/api/transactions?limit=500").get_json()
+    assert len(listing["items"]) == 500
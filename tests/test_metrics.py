@@ -0,0 +1,20 @@
+def metric_names(app):
+    body = app.test_client().get("/metrics").get_data(as_text=True)
+    return {line.split("{")[0].split(" ")[0] for line in body.splitlines() if not line.startswith("#")}
+
+
+def test_derived_stats_are_exported(app):
+    names = metric_names(app)
+    assert {"lumora_family_sync_collapsed", "lumora_family_sync_pending"} <= names
+    assert {"lumora_db_executor_queued_reads", "lumora_db_executor_queued_writes"} <= names
+    assert {"lumora_password_hash_concurrency", "lumora_password_hash_info"} <= names
+    assert {"lumora_cache_entries", "lumora_cache_ttl_seconds", "lumora_cache_info"} <= names
+
+
+def test_cache_hit_ratio_is_exported_per_namespace(app, make_family, login):
+    family_id, (user_id, _) = make_family()
+    client = login(user_id)
+    client.get("/api/family/members")
+    client.get("/api/family/members")
+    body = app.test_client().get("/metrics").get_data(as_text=True)
+    assert 'lumora_cache_hit_ratio{namespace="members"}' in body
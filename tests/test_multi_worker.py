@@ -0,0 +1,102 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+requests = pytest.importorskip("requests")
+socketio_client = pytest.importorskip("socketio")
+
+from conftest import ROOT  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def boot_worker(queue_url, log):
+    port = free_port()
+    env = dict(
+        os.environ, PORT=str(port), WORKERS="1", LUMORA_WORKER="1", SCHEDULER_ENABLED="0",
+        SOCKETIO_MESSAGE_QUEUE=queue_url,
+    )
+    worker = subprocess.Popen([sys.executable, os.path.join(ROOT, "app.py")], cwd=ROOT, env=env, stdout=log, stderr=log)
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        assert worker.poll() is None, f"worker exited with code {worker.returncode}"
+        try:
+            requests.get(base + "/api/me", timeout=1)
+            return worker, base
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    worker.terminate()
+    pytest.fail("worker did not start within 30 seconds")
+
+
+@pytest.fixture
+def workers(app, tmp_path):
+    queue_url = "sqlite://" + str(tmp_path / "queue.db")
+    started = []
+    with open(tmp_path / "workers.log", "w") as log:
+        try:
+            for _ in range(2):
+                started.append(boot_worker(queue_url, log))
+            yield [base for _, base in started]
+        finally:
+            for worker, _ in started:
+                worker.terminate()
+                worker.wait(timeout=10)
+
+
+def session_cookie(app, user_id):
+    return {app.config.get("SESSION_COOKIE_NAME", "session"): app.session_interface.get_signing_serializer(app).dumps({"user_id": user_id})}
+
+
+def test_emit_and_revision_cross_workers(app, make_family, workers):
+    family_id, (user_id, _) = make_family()
+    cookies = session_cookie(app, user_id)
+    first, second = workers
+
+    received, ready, synced = [], threading.Event(), threading.Event()
+    listener = socketio_client.Client()
+    listener.on("activity_sync", lambda payload: ready.set())
+
+    @listener.on("family_sync")
+    def on_family_sync(payload):
+        received.append(payload)
+        if len(received) == 2:
+            synced.set()
+
+    listener.connect(first, headers={"Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())}, transports=["websocket"])
+    try:
+        assert ready.wait(10), "listener never joined its family room"
+        for base, description in ((second, "written on the second worker"), (first, "written on the first worker")):
+            response = requests.post(
+                base + "/api/transactions", cookies=cookies, timeout=10,
+                json={"amount": 12.5, "description": description, "type": "expense", "category": "Food"},
+            )
+            assert response.status_code == 201
+            time.sleep(0.3)
+        assert synced.wait(10), f"only received {len(received)} family_sync messages"
+    finally:
+        listener.disconnect()
+
+    assert {payload["family_id"] for payload in received} == {family_id}
+    descriptions = [
+        row["description"]
+        for payload in received
+        for delta in payload["events"]["update_transactions"]["deltas"]
+        for row in delta["rows"]
+    ]
+    assert descriptions == ["written on the second worker", "written on the first worker"]
+    revisions = [payload["revision"] for payload in received]
+    assert revisions[1] == revisions[0] + 1
+
+    etags = {requests.get(base + "/api/transactions", cookies=cookies, timeout=10).headers["ETag"] for base in workers}
+    assert len(etags) == 1
@@ -0,0 +1,46 @@
+import pytest
+
+from backend.database import open_db
+from backend.routes.bootstrap import BOOTSTRAP_SECTIONS, load_sections
+from backend.routes.transactions import encode_cursor, parse_listing
+
+LISTINGS = (
+    {"limit": "50"},
+    {"limit": "50", "cursor": encode_cursor({"date": "2026-01-31 12:00:00", "id": 10})},
+    {"limit": "50", "type": "expense"},
+    {"limit": "50", "category": "Food"},
+    {"limit": "50", "userId": "1"},
+    {"limit": "50", "from": "2026-01-01", "to": "2026-01-31"},
+    {"limit": "50", "minAmount": "10", "maxAmount": "200"},
+    {"limit": "50", "type": "expense", "category": "Food", "userId": "1", "from": "2026-01-01", "to": "2026-01-31"},
+)
+
+
+class PlanRecorder:
+    def __init__(self, conn):
+        self.conn = conn
+        self.plans = []
+
+    def execute(self, sql, args=()):
+        rows = self.conn.execute("EXPLAIN QUERY PLAN " + sql, args).fetchall()
+        self.plans.append((" ".join(sql.split()), [row["detail"] for row in rows]))
+        return self.conn.execute("SELECT 1 WHERE 0")
+
+
+@pytest.fixture
+def recorder(app):
+    conn = open_db()
+    yield PlanRecorder(conn)
+    conn.close()
+
+
+@pytest.mark.parametrize("params", LISTINGS, ids=lambda params: ",".join(sorted(params)))
+def test_dashboard_queries_use_indexes(recorder, params):
+    page, error = parse_listing(1, params)
+    assert error is None
+    load_sections(recorder, 1, 1, BOOTSTRAP_SECTIONS, {}, page, [])
+
+    assert len(recorder.plans) == 8
+    for sql, details in recorder.plans:
+        scans = [detail for detail in details if detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW"]
+        assert not scans, f"{sql}\n  full scan: {scans}"
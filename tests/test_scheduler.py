@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.database import query_db, unit_of_work
+from backend.scheduler import RecurringScheduler
+
+NOW = datetime(2026, 4, 15, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def lease_name(monkeypatch):
+    name = f"test-{uuid.uuid4().hex[:8]}"
+    monkeypatch.setattr(RecurringScheduler, "lease_name", name)
+    return name
+
+
+@pytest.fixture
+def template(app, make_family):
+    family_id, (user_id, _) = make_family()
+    with app.app_context(), unit_of_work() as conn:
+        template_id = conn.execute(
+            """INSERT INTO transactions (user_id, family_id, amount, description, type, date, is_recurring, recurrence, next_due_date)
+            VALUES (?, ?, 950, 'Rent', 'expense', '2025-12-31 00:00:00', 1, 'monthly', '2026-01-31')""",
+            (user_id, family_id),
+        ).lastrowid
+    return family_id, template_id
+
+
+def occurrences(template_id):
+    return [row["date"][:10] for row in query_db(
+        "SELECT date FROM transactions WHERE recurring_parent_id = ? ORDER BY date", (template_id,)
+    )]
+
+
+def next_due(template_id):
+    return query_db("SELECT next_due_date FROM transactions WHERE id = ?", (template_id,), one=True)["next_due_date"]
+
+
+def test_catches_up_missed_occurrences_on_anchor_day(app, lease_name, template):
+    family_id, template_id = template
+    assert RecurringScheduler(app, owner="a").run_once(now=NOW).get(family_id) == 3
+    assert occurrences(template_id) == ["2026-01-31", "2026-02-28", "2026-03-31"]
+    assert next_due(template_id) == "2026-04-30"
+
+
+def test_rerun_is_idempotent(app, lease_name, template):
+    family_id, template_id = template
+    scheduler = RecurringScheduler(app, owner="a")
+    scheduler.run_once(now=NOW)
+    assert family_id not in scheduler.run_once(now=NOW)
+    assert family_id not in scheduler.run_once(now=NOW + timedelta(days=1))
+    assert len(occurrences(template_id)) == 3
+    assert scheduler.run_once(now=datetime(2026, 4, 30, tzinfo=timezone.utc)).get(family_id) == 1
+    assert occurrences(template_id)[-1] == "2026-04-30"
+
+
+def test_lease_blocks_other_owners_until_it_expires(app, lease_name, template):
+    family_id, template_id = template
+    first = RecurringScheduler(app, owner="first", lease_ttl=60)
+    second = RecurringScheduler(app, owner="second", lease_ttl=60)
+    with app.app_context():
+        assert first.acquire_lease(NOW)
+
+    assert second.run_once(now=NOW + timedelta(seconds=30)) == {}
+    assert occurrences(template_id) == []
+
+    assert second.run_once(now=NOW + timedelta(seconds=61)).get(family_id) == 3
+    assert first.run_once(now=NOW + timedelta(seconds=90)) == {}
+
+
+def test_loop_survives_unexpected_errors(app, caplog):
+    scheduler = RecurringScheduler(app, interval=0)
+    calls = []
+
+    def run_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("bad row")
+        scheduler.stop()
+
+    scheduler.run_once = run_once
+    scheduler.running = True
+    scheduler._loop()
+    assert len(calls) == 2
+    assert "Recurring scheduler run failed" in caplog.text
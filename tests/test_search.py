@@ -0,0 +1,34 @@
+from backend.database import unit_of_work
+
+DESCRIPTIONS = ["coffee", "coffee beans", "coffee and cake at the station", "coffee coffee", "iced coffee to go", "lunch"]
+
+
+def add_transactions(family_id, user_id, descriptions):
+    with unit_of_work() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (user_id, family_id, amount, description, type, date) VALUES (?, ?, 5, ?, 'expense', '2026-03-01')",
+            [(user_id, family_id, description) for description in descriptions],
+        )
+
+
+def test_search_pages_stay_in_family_while_others_write(app, make_family, login):
+    family_id, (user_id, _) = make_family()
+    other_family, (other_user, _) = make_family()
+    add_transactions(family_id, user_id, DESCRIPTIONS * 3)
+    client = login(user_id)
+
+    expected = [item["id"] for item in client.get("/api/transactions/search?q=coffee&limit=100").get_json()["items"]]
+    assert len(expected) == 15
+
+    seen, cursor, round_ = [], None, 0
+    while True:
+        query = "/api/transactions/search?q=coffee&limit=4" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(query).get_json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+        round_ += 1
+        add_transactions(other_family, other_user, ["coffee " + "x " * 20 * round_] * 50 + ["tea"] * 200)
+
+    assert seen == expected
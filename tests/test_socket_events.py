@@ -0,0 +1,26 @@
+from backend.extensions import socketio
+from backend.socket_events import emit_family_delta, flush_family_sync
+
+
+def family_syncs(client):
+    return [event["args"][0] for event in client.get_received() if event["name"] == "family_sync"]
+
+
+def test_join_family_room_requires_membership(app, make_family, login):
+    family_id, (member_id, _) = make_family()
+    _, (outsider_id, _) = make_family()
+
+    anonymous = socketio.test_client(app)
+    outsider = socketio.test_client(app, flask_test_client=login(outsider_id))
+    member = socketio.test_client(app, flask_test_client=login(member_id))
+    for client in (anonymous, outsider, member):
+        client.emit("join_family_room", {"family_id": family_id})
+        client.get_received()
+
+    with app.app_context():
+        emit_family_delta(family_id, "update_transactions", "created", [{"id": 1, "description": "secret rent"}])
+        flush_family_sync(family_id)
+
+    assert family_syncs(anonymous) == []
+    assert family_syncs(outsider) == []
+    assert [sync["family_id"] for sync in family_syncs(member)] == [family_id]
@@ -0,0 +1,11 @@
+from backend.static_assets import StaticManifest
+
+from conftest import ROOT
+
+
+def test_manifest_only_holds_frontend_files():
+    paths = set(StaticManifest(ROOT).assets)
+
+    assert "index.html" in paths
+    assert not [path for path in paths if path.split("/")[0] in ("backend", "bench", "tests")]
+    assert not [path for path in paths if path.rsplit("/", 1)[-1] in ("requirements.txt", "package.json")]